@@ -0,0 +1,160 @@
+"""Memory benchmark for PyDataTracker using tracemalloc snapshots.
+
+Reports, as JSON:
+
+- the bytes a `TrackedDict` with N keys costs compared with a plain `dict`,
+  split into the tracking attributes every container carries (uuid, observer
+  dict, child item dict, change list, ...);
+- the bytes each recorded change adds, for every combination of snapshot
+  capture, stack capture and nesting depth (every level of a tree keeps its own
+  copy of a propagated change, with a longer `tree`), with the source files the
+  memory was allocated in.
+
+Usage:
+    python scripts/bench_memory.py --keys 10000 --changes 2000 --output memory.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import itertools
+import json
+import sys
+import tracemalloc
+import types
+from pathlib import Path
+
+from pydatatracker import TrackedDict, __version__
+from pydatatracker.types._trackbase import TrackBase
+
+# objects shared with the rest of the process are not charged to a component
+_SHARED = (TrackBase, type, types.ModuleType, types.CodeType, types.FunctionType)
+
+
+def deep_size(obj: object, seen: set[int] | None = None) -> int:
+    """Return the size of `obj` and everything it references, once per object."""
+
+    seen = set() if seen is None else seen
+    size = 0
+    pending = [obj]
+    while pending:
+        item = pending.pop()
+        if id(item) in seen or isinstance(item, _SHARED):
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        pending.extend(gc.get_referents(item))
+    return size
+
+
+def _traced(build):
+    """Run `build` under tracemalloc, returning its result and the snapshots after and before."""
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = build()
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    return result, after, before
+
+
+def container_overhead(keys: int) -> dict[str, object]:
+    """Compare a `TrackedDict` with `keys` keys with a plain dict."""
+
+    # keys and values are created up front so only the containers are measured
+    items = [(f"key{i}", i) for i in range(keys)]
+    _, after, before = _traced(lambda: dict(items))
+    plain_bytes = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+    report: dict[str, object] = {"keys": keys, "dict_bytes": plain_bytes}
+    for history in (True, False):
+        tracked, after, before = _traced(
+            lambda history=history: TrackedDict(items, tracking_record_history=history)
+        )
+        total = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+        seen = {id(tracked)}
+        components = {
+            "dict_storage": sys.getsizeof(tracked),
+            "instance_dict": sys.getsizeof(tracked.__dict__),
+            "uuid": sys.getsizeof(tracked._tracking_uuid),
+            "observers": deep_size(tracked._tracking_observers, seen),
+            "child_tracked_items": deep_size(tracked._tracking_child_tracked_items, seen),
+            "changes": deep_size(tracked._tracking_changes, seen),
+            "undo_stack": deep_size(tracked._tracking_undo_stack, seen),
+        }
+        components["other"] = total - sum(components.values())
+        report["record_history" if history else "no_history"] = {
+            "total_bytes": total,
+            "overhead_bytes": total - plain_bytes,
+            "components": components,
+        }
+        del tracked
+    return report
+
+
+def _chain(depth: int, **options: object) -> tuple[TrackedDict, TrackedDict]:
+    root = TrackedDict({"seed": 0}, tracking_auto_convert=True, **options)
+    node = root
+    for level in range(depth):
+        node[f"level{level}"] = {"seed": 0}
+        node = node[f"level{level}"]
+    return root, node
+
+
+def entry_cost(changes: int, snapshots: bool, stack: bool, depth: int) -> dict[str, object]:
+    """Return the bytes retained per change recorded at the bottom of a tree."""
+
+    root, leaf = _chain(depth, tracking_capture_snapshots=snapshots, tracking_capture_stack=stack)
+    values = list(range(changes))
+
+    def mutate() -> None:
+        for value in values:
+            leaf["value"] = value
+
+    _, after, before = _traced(mutate)
+    stats = after.compare_to(before, "filename")
+    total = sum(stat.size_diff for stat in stats)
+    by_file = {
+        Path(stat.traceback[0].filename).name: stat.size_diff
+        for stat in sorted(stats, key=lambda stat: -stat.size_diff)[:5]
+        if stat.size_diff > 0
+    }
+    del root, leaf
+    return {
+        "snapshots": snapshots,
+        "stack": stack,
+        "depth": depth,
+        "bytes_per_change": total / changes,
+        "by_file": by_file,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keys", type=int, default=1000, help="keys in the measured containers")
+    parser.add_argument("--changes", type=int, default=1000, help="changes per entry measurement")
+    parser.add_argument("--output", type=Path, help="write the JSON results to this file")
+    args = parser.parse_args(argv)
+
+    results = {
+        "pydatatracker": __version__,
+        "python": sys.version.split()[0],
+        "containers": [container_overhead(keys) for keys in (0, args.keys)],
+        "entries": [
+            entry_cost(args.changes, snapshots, stack, depth)
+            for snapshots, stack, depth in itertools.product((False, True), (False, True), (0, 3))
+        ],
+    }
+    text = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,307 @@
+"""Benchmark suite for PyDataTracker reporting machine-readable JSON.
+
+Every benchmark reports operations per second over several timed runs, plus the
+peak traced memory and the net number of allocated blocks of one extra run made
+under `tracemalloc` (kept separate so tracing does not skew the timings).
+
+Usage:
+    python scripts/bench_suite.py --output results.json
+    python scripts/bench_suite.py --filter list --runs 3
+    python scripts/bench_suite.py --compare baseline.json --max-regression 0.25
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+from pydatatracker import SQLiteChangeStore, TrackedAttr, TrackedDict, TrackedList, __version__
+from pydatatracker.exporters import HttpExporter, JsonLinesExporter, KafkaExporter, S3Exporter
+
+# a benchmark prepares its state and returns the operation to time and how many
+# individual operations one call of it performs
+Setup = Callable[[int], tuple[Callable[[], object], int]]
+BENCHMARKS: dict[str, Setup] = {}
+
+
+def benchmark(name: str) -> Callable[[Setup], Setup]:
+    def register(setup: Setup) -> Setup:
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+def _nested(depth: int) -> TrackedDict:
+    node = TrackedDict({"seed": 0}, tracking_auto_convert=True)
+    for level in range(depth):
+        node[f"level{level}"] = {"seed": 0}
+        node = node[f"level{level}"]
+    return node
+
+
+def _propagation(depth: int) -> Setup:
+    def setup(size: int) -> tuple[Callable[[], object], int]:
+        leaf = _nested(depth) if depth else TrackedDict()
+
+        def run() -> None:
+            for i in range(size):
+                leaf["value"] = i
+
+        return run, size
+
+    return setup
+
+
+for _depth in (0, 4, 16):
+    benchmark(f"propagation depth={_depth}")(_propagation(_depth))
+
+
+@benchmark("TrackedList.append")
+def list_append(size: int) -> tuple[Callable[[], object], int]:
+    target = TrackedList()
+
+    def run() -> None:
+        for i in range(size):
+            target.append(i)
+
+    return run, size
+
+
+@benchmark("TrackedList.insert")
+def list_insert(size: int) -> tuple[Callable[[], object], int]:
+    target = TrackedList()
+
+    def run() -> None:
+        for i in range(size):
+            target.insert(0, i)
+
+    return run, size
+
+
+@benchmark("TrackedList.pop")
+def list_pop(size: int) -> tuple[Callable[[], object], int]:
+    target = TrackedList(range(size))
+
+    def run() -> None:
+        for _ in range(size):
+            target.pop()
+
+    return run, size
+
+
+@benchmark("TrackedList.sort")
+def list_sort(size: int) -> tuple[Callable[[], object], int]:
+    target = TrackedList((i * 7919) % size for i in range(size))
+    count = max(size // 100, 1)
+
+    def run() -> None:
+        for i in range(count):
+            target.sort(reverse=bool(i % 2))
+
+    return run, count
+
+
+@benchmark("TrackedList.extend")
+def list_extend(size: int) -> tuple[Callable[[], object], int]:
+    target = TrackedList()
+    chunk = list(range(10))
+
+    def run() -> None:
+        for _ in range(size):
+            target.extend(chunk)
+
+    return run, size
+
+
+class _Monitored(TrackedAttr):
+    def __init__(self) -> None:
+        super().__init__()
+        self.value = 0
+        self.tracking_add_attribute_to_monitor("value")
+
+
+@benchmark("TrackedAttr setattr")
+def attr_setattr(size: int) -> tuple[Callable[[], object], int]:
+    target = _Monitored()
+
+    def run() -> None:
+        for i in range(size):
+            target.value = i
+
+    return run, size
+
+
+@benchmark("construct from JSON")
+def construct_json(size: int) -> tuple[Callable[[], object], int]:
+    payload = json.dumps(
+        {
+            "users": [
+                {"id": i, "name": f"user{i}", "tags": ["a", "b"], "prefs": {"theme": "dark"}}
+                for i in range(size // 10)
+            ]
+        }
+    )
+
+    def run() -> None:
+        TrackedDict(json.loads(payload), tracking_auto_convert=True)
+
+    return run, 1
+
+
+def _fan_out(observers: int) -> Setup:
+    def setup(size: int) -> tuple[Callable[[], object], int]:
+        target = TrackedDict()
+        for _ in range(observers):
+            target.tracking_add_observer(lambda change: None)
+
+        def run() -> None:
+            for i in range(size):
+                target["value"] = i
+
+        return run, size
+
+    return setup
+
+
+for _observers in (1, 10, 100):
+    benchmark(f"observer fan-out n={_observers}")(_fan_out(_observers))
+
+
+class _Sink:
+    """Stand-in client for the HTTP, S3 and Kafka exporters."""
+
+    def __call__(self, *args: object, **kwargs: object) -> None:
+        return None
+
+    put_object = send = __call__
+
+
+def _exporter(build: Callable[[Path], Callable]) -> Setup:
+    def setup(size: int) -> tuple[Callable[[], object], int]:
+        directory = Path(tempfile.mkdtemp(prefix="pydatatracker-bench-"))
+        target = TrackedDict()
+        target.tracking_add_observer(build(directory))
+
+        def run() -> None:
+            for i in range(size):
+                target["value"] = i
+
+        return run, size
+
+    return setup
+
+
+_EXPORTERS: dict[str, Callable[[Path], Callable]] = {
+    "JsonLinesExporter": lambda directory: JsonLinesExporter(directory / "changes.jsonl"),
+    "HttpExporter": lambda directory: HttpExporter(_Sink(), "http://localhost/changes"),
+    "S3Exporter": lambda directory: S3Exporter(_Sink(), "bucket"),
+    "KafkaExporter": lambda directory: KafkaExporter(_Sink(), "changes"),
+    "SQLiteChangeStore": lambda directory: SQLiteChangeStore(directory / "changes.db"),
+}
+for _name, _build in _EXPORTERS.items():
+    benchmark(f"exporter {_name}")(_exporter(_build))
+
+
+@benchmark("format_detailed")
+def format_detailed(size: int) -> tuple[Callable[[], object], int]:
+    target = TrackedDict({"nested": {"items": [1, 2, 3]}}, tracking_auto_convert=True)
+    for i in range(size):
+        target["nested"]["items"].append(i)
+    changes = target.tracking_changes()
+
+    def run() -> None:
+        for change in changes:
+            change.format_detailed()
+
+    return run, len(changes)
+
+
+def measure(setup: Setup, size: int, runs: int) -> dict[str, object]:
+    """Time `runs` fresh runs, then trace memory during one more."""
+
+    rates = []
+    for _ in range(runs):
+        run, operations = setup(size)
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        rates.append(operations / (time.perf_counter() - start))
+
+    run, operations = setup(size)
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "operations": operations,
+        "ops_per_sec": statistics.mean(rates),
+        "stdev": statistics.pstdev(rates),
+        "runs": runs,
+        "allocated_blocks": sys.getallocatedblocks() - blocks,
+        "peak_bytes": peak,
+    }
+
+
+def compare(results: dict, baseline: dict, max_regression: float) -> list[str]:
+    """Return the benchmarks more than `max_regression` slower than the baseline."""
+
+    failures = []
+    for name, result in results["benchmarks"].items():
+        previous = baseline.get("benchmarks", {}).get(name)
+        if not previous:
+            continue
+        ratio = result["ops_per_sec"] / previous["ops_per_sec"]
+        if ratio < 1 - max_regression:
+            failures.append(f"{name}: {ratio:.2f}x of baseline")
+    return failures
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=2000, help="operations per run")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--filter", default="", help="only run benchmarks containing this")
+    parser.add_argument("--output", type=Path, help="write the JSON results to this file")
+    parser.add_argument("--compare", type=Path, help="baseline JSON results to compare with")
+    parser.add_argument("--max-regression", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    results = {
+        "pydatatracker": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "size": args.size,
+        "benchmarks": {
+            name: measure(setup, args.size, args.runs)
+            for name, setup in BENCHMARKS.items()
+            if args.filter in name
+        },
+    }
+    text = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        failures = compare(results, json.loads(args.compare.read_text()), args.max_regression)
+        for failure in failures:
+            print(f"regression: {failure}", file=sys.stderr)
+        return 1 if failures else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
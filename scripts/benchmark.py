@@ -7,11 +7,12 @@ import time
 from contextlib import nullcontext
 from enum import Enum
 
-from pydatatracker import TrackedDict, tracking_actor
+from pydatatracker import TrackedAttr, TrackedDict, TrackedField, tracking_actor
 
 ITERATIONS = 5000
 WARMUP = 200
 RUNS = 5
+ATTRIBUTE_ITERATIONS = ITERATIONS
 
 
 class Mode(Enum):
@@ -21,6 +22,40 @@ class Mode(Enum):
     FULL = "full"
 
 
+class DictMode(Enum):
+    PLAIN = "plain dict"
+    TRACKED = "TrackedDict"
+    FAST_PATH = "TrackedDict fast path"
+
+
+class AttrMode(Enum):
+    PLAIN = "plain object"
+    UNMONITORED = "TrackedAttr unmonitored"
+    MONITORED = "TrackedAttr monitored"
+    FIELD_UNMONITORED = "TrackedField unmonitored"
+    FIELD_MONITORED = "TrackedField monitored"
+
+
+class PlainObject:
+    def __init__(self) -> None:
+        self.value = 0
+
+
+class ImperativeAttr(TrackedAttr):
+    def __init__(self) -> None:
+        super().__init__()
+        self.value = 0
+        self.tracking_add_attribute_to_monitor("value")
+
+
+class FieldAttr(TrackedAttr):
+    value = TrackedField()
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.value = 0
+
+
 def run(mode: Mode) -> float:
     payload = TrackedDict(
         tracking_capture_snapshots=mode in {Mode.SNAPSHOT, Mode.FULL},
@@ -35,6 +70,37 @@ def run(mode: Mode) -> float:
     return end - start
 
 
+def run_dict_writes(mode: DictMode) -> float:
+    """Time `__setitem__` with fresh keys, returning operations per second."""
+    if mode is DictMode.PLAIN:
+        target: dict = {}
+    elif mode is DictMode.TRACKED:
+        target = TrackedDict()
+    else:
+        target = TrackedDict(tracking_record_history=False)
+    start = time.perf_counter()
+    for i in range(ITERATIONS):
+        target[i] = i
+    end = time.perf_counter()
+    return ITERATIONS / (end - start)
+
+
+def run_attribute_writes(mode: AttrMode) -> float:
+    """Time attribute writes, returning operations per second."""
+    if mode is AttrMode.PLAIN:
+        target = PlainObject()
+    elif mode in {AttrMode.UNMONITORED, AttrMode.MONITORED}:
+        target = ImperativeAttr()
+    else:
+        target = FieldAttr()
+    name = "value" if mode in {AttrMode.MONITORED, AttrMode.FIELD_MONITORED} else "scratch"
+    start = time.perf_counter()
+    for i in range(ATTRIBUTE_ITERATIONS):
+        setattr(target, name, i)
+    end = time.perf_counter()
+    return ATTRIBUTE_ITERATIONS / (end - start)
+
+
 def main() -> None:
     results: dict[Mode, list[float]] = {mode: [] for mode in Mode}
     for mode in Mode:
@@ -46,6 +112,20 @@ def main() -> None:
         stdev = statistics.pstdev(samples)
         print(f"  {mode.value:<8} mean={mean:.4f}s stdev={stdev:.4f}s")
 
+    print(f"Overhead compared with a plain dict ({ITERATIONS} writes, {RUNS} runs)")
+    dict_rates = {
+        dict_mode: statistics.mean(run_dict_writes(dict_mode) for _ in range(RUNS))
+        for dict_mode in DictMode
+    }
+    for dict_mode, rate in dict_rates.items():
+        slowdown = dict_rates[DictMode.PLAIN] / rate
+        print(f"  {dict_mode.value:<25} {rate:>12,.0f} ops/s ({slowdown:.1f}x)")
+
+    print(f"Attribute write throughput ({ATTRIBUTE_ITERATIONS} writes, {RUNS} runs)")
+    for attr_mode in AttrMode:
+        rates = [run_attribute_writes(attr_mode) for _ in range(RUNS)]
+        print(f"  {attr_mode.value:<25} {statistics.mean(rates):>12,.0f} ops/s")
+
 
 if __name__ == "__main__":
     main()
@@ -43,16 +43,41 @@ __all__ = [
     "TrackedDict",
     "TrackedList",
     "TrackedAttr",
+    "TrackedField",
+    "tracked_fields",
+    "TrackedMappingView",
+    "TrackedSequenceView",
     "ChangeLogEntry",
+    "PersistentMap",
+    "PathSegment",
+    "TrackingPath",
     "add_to_ignore_in_stack",
     "ChangeCollector",
+    "SpillCollector",
+    "SQLiteChangeStore",
+    "SamplingPolicy",
+    "ObserverPolicy",
+    "PathSubscriptions",
     "tracking_actor",
+    "stats",
+    "enable_stats",
+    "disable_stats",
+    "reset_stats",
     "__version__",
 ]
 
+from .instrumentation import disable_stats, enable_stats, reset_stats, stats
+from .observer_policy import ObserverPolicy
 from .observers import ChangeCollector
+from .sampling import SamplingPolicy
+from .spill import SpillCollector
+from .store import SQLiteChangeStore
+from .subscriptions import PathSubscriptions
 from .types.actor import tracking_actor
-from .types.trackedattributes import TrackedAttr
+from .types.trackedattributes import TrackedAttr, TrackedField, tracked_fields
 from .types.trackeddict import TrackedDict
 from .types.trackedlist import TrackedList
+from .types.views import TrackedMappingView, TrackedSequenceView
 from .utils.changelog import ChangeLogEntry, add_to_ignore_in_stack
+from .utils.paths import PathSegment, TrackingPath
+from .utils.persistent import PersistentMap
@@ -0,0 +1,400 @@
+"""The ``pydatatracker`` command: tail, filter, merge, summarize and compact JSONL logs.
+
+Logs are read line by line as bytes, so memory use does not depend on the size
+of the file. Records that cannot match the action or actor filters are skipped
+with a substring check before being parsed, and JSON output writes the original
+lines without serializing them again.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import heapq
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter, deque
+from collections.abc import Iterable, Iterator, Sequence
+from fnmatch import fnmatchcase
+from itertools import chain
+from typing import IO, Any
+
+from .utils.changelog import ChangeLogEntry
+
+_RELATIVE = re.compile(r"^(\d+(?:\.\d+)?)([smhd])$")
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+_TABLE_COLUMNS = (("created_time", 26), ("action", 10), ("type", 12), ("location", 30))
+
+
+def parse_time(text: str) -> datetime.datetime:
+    """Parse an ISO timestamp or a duration before now such as ``15m`` or ``2h``."""
+
+    found = _RELATIVE.match(text)
+    now = datetime.datetime.now(datetime.UTC)
+    if found:
+        return now - datetime.timedelta(seconds=float(found[1]) * _UNITS[found[2]])
+    moment = datetime.datetime.fromisoformat(text)
+    return moment if moment.tzinfo else moment.replace(tzinfo=datetime.UTC)
+
+
+class RecordFilter:
+    """Filters applied to every record while streaming."""
+
+    def __init__(
+        self,
+        *,
+        actions: Sequence[str] = (),
+        locations: Sequence[str] = (),
+        actors: Sequence[str] = (),
+        since: datetime.datetime | None = None,
+        until: datetime.datetime | None = None,
+    ) -> None:
+        self.actions = set(actions)
+        self.locations = list(locations)
+        self.actors = set(actors)
+        self.since = since
+        self.until = until
+        # a matching record contains one of these encoded values, whatever else it holds
+        self._needles = [
+            [json.dumps(value).encode() for value in values]
+            for values in (self.actions, self.actors)
+            if values
+        ]
+
+    def __bool__(self) -> bool:
+        return bool(self.actions or self.locations or self.actors or self.since or self.until)
+
+    def may_match(self, line: bytes) -> bool:
+        """Cheap check on the raw line, False only if the record cannot match."""
+
+        return all(any(needle in line for needle in needles) for needles in self._needles)
+
+    def matches(self, record: dict[str, Any]) -> bool:
+        extra = record.get("extra") or {}
+        if self.actions and extra.get("action") not in self.actions:
+            return False
+        if self.actors and record.get("actor") not in self.actors:
+            return False
+        if self.locations:
+            location = str(extra.get("location", ""))
+            if not any(fnmatchcase(location, pattern) for pattern in self.locations):
+                return False
+        if self.since or self.until:
+            created = datetime.datetime.fromisoformat(str(record.get("created_time")))
+            if self.since and created < self.since:
+                return False
+            if self.until and created >= self.until:
+                return False
+        return True
+
+
+def iter_lines(handle: IO[bytes], follow: bool = False, interval: float = 0.25) -> Iterator[bytes]:
+    """Yield complete lines, waiting for more data at the end when following."""
+
+    partial = b""
+    while True:
+        line = handle.readline()
+        if line.endswith(b"\n"):
+            yield partial + line
+            partial = b""
+            continue
+        partial += line
+        if not follow:
+            if partial:
+                yield partial
+            return
+        # the file was truncated (rotated in place): start over
+        if handle.seekable() and os.fstat(handle.fileno()).st_size < handle.tell():
+            handle.seek(0)
+            partial = b""
+        time.sleep(interval)
+
+
+def last_lines(handle: IO[bytes], count: int, block_size: int = 65536) -> list[bytes]:
+    """Return the last `count` lines of a seekable file, reading backwards."""
+
+    end = handle.seek(0, os.SEEK_END)
+    position, data = end, b""
+    while position > 0 and data.count(b"\n") <= count:
+        step = min(block_size, position)
+        position -= step
+        handle.seek(position)
+        data = handle.read(step) + data
+    handle.seek(end)
+    lines = data.splitlines(keepends=True)
+    return lines[-count:] if count else []
+
+
+def select(lines: Iterable[bytes], record_filter: RecordFilter) -> Iterator[tuple[bytes, dict]]:
+    """Yield the (line, record) pairs passing the filter, skipping blank or bad lines."""
+
+    for line in lines:
+        if not line.strip() or (record_filter and not record_filter.may_match(line)):
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if not record_filter or record_filter.matches(record):
+            yield line, record
+
+
+def _table_row(record: dict[str, Any]) -> str:
+    extra = record.get("extra") or {}
+    cells = [
+        str(record.get(name, extra.get(name, "")))[:width].ljust(width)
+        for name, width in _TABLE_COLUMNS
+    ]
+    cells.append(str(extra.get("value", "")))
+    return " ".join(cells)
+
+
+def write_records(
+    records: Iterable[tuple[bytes, dict]], output_format: str, out: IO[str], flush: bool = False
+) -> None:
+    """Write records as raw JSON lines, table rows or detailed text.
+
+    With `flush`, used when following a log, every record is flushed as soon as
+    it is written instead of when the output buffer fills.
+    """
+
+    if output_format == "table":
+        header = [name.ljust(width) for name, width in _TABLE_COLUMNS]
+        out.write(" ".join(header) + " value\n")
+    for line, record in records:
+        if output_format == "json":
+            out.write(line.decode("utf-8").rstrip("\n") + "\n")
+        elif output_format == "table":
+            out.write(_table_row(record) + "\n")
+        else:
+            out.write("\n".join(ChangeLogEntry.from_dict(record).format_detailed()) + "\n\n")
+        if flush:
+            out.flush()
+
+
+class TopCounter:
+    """Approximate counts of the most frequent keys in bounded memory.
+
+    Implements the Space-Saving algorithm: at most `capacity` keys are
+    counted, and a new key replaces the key with the smallest count, taking
+    over that count plus one. Counts are exact as long as no more than
+    `capacity` distinct keys were seen, otherwise they may overestimate a key
+    by at most the count it took over; every key seen more often than
+    total / capacity times is kept.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.counts: dict[str, int] = {}
+        # one (count, key) entry per counted key, its count may be stale (lower)
+        self._heap: list[tuple[int, str]] = []
+
+    def add(self, key: str) -> None:
+        counts = self.counts
+        if key in counts:
+            counts[key] += 1
+            return
+        if len(counts) < self.capacity:
+            counts[key] = 1
+            heapq.heappush(self._heap, (1, key))
+            return
+        while True:
+            count, smallest = heapq.heappop(self._heap)
+            if counts[smallest] == count:
+                break
+            heapq.heappush(self._heap, (counts[smallest], smallest))
+        del counts[smallest]
+        counts[key] = count + 1
+        heapq.heappush(self._heap, (count + 1, key))
+
+    def most_common(self, top: int) -> list[tuple[str, int]]:
+        return heapq.nlargest(top, self.counts.items(), key=lambda item: item[1])
+
+
+def summarize(
+    records: Iterable[tuple[bytes, dict]], top: int = 10, location_capacity: int = 10_000
+) -> dict[str, Any]:
+    """Aggregate counts per action, type, actor and location, and the time span.
+
+    Actions, types and actors have few distinct values and are counted
+    exactly. Locations are counted with a `TopCounter` of `location_capacity`
+    keys, so memory use does not grow with the number of distinct locations.
+    """
+
+    total = 0
+    first = last = None
+    actions: Counter[str] = Counter()
+    types: Counter[str] = Counter()
+    actors: Counter[str] = Counter()
+    locations = TopCounter(max(location_capacity, top))
+    for _, record in records:
+        total += 1
+        extra = record.get("extra") or {}
+        actions[str(extra.get("action"))] += 1
+        types[str(extra.get("type"))] += 1
+        actors[str(record.get("actor") or "")] += 1
+        if "location" in extra:
+            locations.add(str(extra["location"]))
+        created = record.get("created_time")
+        if created:
+            first = created if first is None or created < first else first
+            last = created if last is None or created > last else last
+    return {
+        "count": total,
+        "first": first,
+        "last": last,
+        "actions": dict(actions.most_common(top)),
+        "types": dict(types.most_common(top)),
+        "actors": dict(actors.most_common(top)),
+        "locations": dict(locations.most_common(top)),
+    }
+
+
+def _filter_from(args: argparse.Namespace) -> RecordFilter:
+    return RecordFilter(
+        actions=args.action,
+        locations=args.location,
+        actors=args.actor,
+        since=parse_time(args.since) if args.since else None,
+        until=parse_time(args.until) if args.until else None,
+    )
+
+
+def _open(path: str) -> IO[bytes]:
+    return sys.stdin.buffer if path == "-" else open(path, "rb")  # noqa: SIM115
+
+
+def cmd_show(args: argparse.Namespace) -> int:
+    with _open(args.file) as handle:
+        write_records(select(iter_lines(handle), _filter_from(args)), args.format, sys.stdout)
+    return 0
+
+
+def cmd_tail(args: argparse.Namespace) -> int:
+    record_filter = _filter_from(args)
+    with _open(args.file) as handle:
+        if handle.seekable() and not record_filter:
+            records = select(last_lines(handle, args.lines), record_filter)
+        else:
+            # keep the last N matching records while streaming to the end
+            records = iter(deque(select(iter_lines(handle), record_filter), maxlen=args.lines))
+        if args.follow:
+            records = chain(records, select(iter_lines(handle, follow=True), record_filter))
+        write_records(records, args.format, sys.stdout, flush=args.follow)
+    return 0
+
+
+def cmd_stats(args: argparse.Namespace) -> int:
+    with _open(args.file) as handle:
+        summary = summarize(select(iter_lines(handle), _filter_from(args)), args.top)
+    sys.stdout.write(json.dumps(summary, indent=2) + "\n")
+    return 0
+
+
+def cmd_merge(args: argparse.Namespace) -> int:
+    from .exporters import merge_jsonl_lines
+
+    records = select(merge_jsonl_lines(args.files), _filter_from(args))
+    write_records(records, args.format, sys.stdout)
+    return 0
+
+
+def cmd_compact(args: argparse.Namespace) -> int:
+    from .compaction import compact_log
+
+    result = compact_log(
+        args.file,
+        args.output,
+        checkpoint=args.checkpoint,
+        run_size=args.run_size,
+        temp_dir=args.temp_dir,
+    )
+    sys.stdout.write(json.dumps(result._asdict()) + "\n")
+    return 0
+
+
+def cmd_demo(_: argparse.Namespace) -> int:
+    from .observers import ChangeCollector
+    from .types.trackeddict import TrackedDict
+
+    tracked = TrackedDict(tracking_capture_snapshots=False)
+    collector = ChangeCollector()
+    tracked.tracking_add_observer(collector)
+    tracked["status"] = "ready"
+    for entry in collector.as_list():
+        sys.stdout.write(json.dumps(entry.to_dict()) + "\n")
+    return 0
+
+
+def _add_filters(parser: argparse.ArgumentParser, *, merge: bool = False) -> None:
+    if merge:
+        parser.add_argument("files", nargs="+", help="JSONL change logs or segment directories")
+    else:
+        parser.add_argument("file", help="JSONL change log, '-' for standard input")
+    parser.add_argument("--action", action="append", default=[], help="keep this action")
+    parser.add_argument(
+        "--location", action="append", default=[], help="keep locations matching this glob"
+    )
+    parser.add_argument("--actor", action="append", default=[], help="keep this actor")
+    parser.add_argument("--since", help="ISO time or age such as 15m, 2h, 1d")
+    parser.add_argument("--until", help="ISO time or age such as 15m, 2h, 1d")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="pydatatracker", description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    show = sub.add_parser("show", help="print the matching records of a log")
+    _add_filters(show)
+    show.add_argument("--format", choices=("json", "table", "detailed"), default="json")
+    show.set_defaults(func=cmd_show)
+
+    tail = sub.add_parser("tail", help="print the last records and optionally follow the log")
+    _add_filters(tail)
+    tail.add_argument("-n", "--lines", type=int, default=10, help="number of records to print")
+    tail.add_argument("-f", "--follow", action="store_true", help="wait for new records")
+    tail.add_argument("--format", choices=("json", "table", "detailed"), default="json")
+    tail.set_defaults(func=cmd_tail)
+
+    stats = sub.add_parser("stats", help="count the matching records by action, actor, ...")
+    _add_filters(stats)
+    stats.add_argument("--top", type=int, default=10, help="entries listed per aggregate")
+    stats.set_defaults(func=cmd_stats)
+
+    merge = sub.add_parser("merge", help="print several logs merged in time order")
+    _add_filters(merge, merge=True)
+    merge.add_argument("--format", choices=("json", "table", "detailed"), default="json")
+    merge.set_defaults(func=cmd_merge)
+
+    compact = sub.add_parser("compact", help="keep the latest change per location")
+    compact.add_argument("file", help="JSONL change log to compact")
+    compact.add_argument("output", help="compacted log, may be the input file")
+    compact.add_argument("--checkpoint", help="also write the live state per location here")
+    compact.add_argument("--run-size", type=int, default=100_000, help="records per sorted run")
+    compact.add_argument("--temp-dir", help="directory for the temporary run files")
+    compact.set_defaults(func=cmd_compact)
+
+    demo = sub.add_parser("demo", help="print a change of a demo TrackedDict")
+    demo.set_defaults(func=cmd_demo)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except KeyboardInterrupt:
+        return 130
+    except BrokenPipeError:
+        # the reader went away (e.g. piped into head)
+        sys.stderr.close()
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
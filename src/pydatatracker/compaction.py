@@ -0,0 +1,403 @@
+"""Compaction of JSONL change logs to the changes that still matter.
+
+Only a change that replaces what is at a location makes earlier changes at or
+below that location obsolete:
+
+- setting or deleting a key or attribute (``__setitem__``, ``__delitem__``,
+  ``pop``, ``popitem``, attribute updates) replaces the location,
+- ``TrackedDict.update`` replaces each of its keys,
+- ``clear`` replaces the content of its container,
+- setting a list index replaces that index.
+
+Every other change (``setdefault``, ``init``, list appends, inserts, pops,
+sorts, ...) is kept until its location or one of its ancestors is replaced, and
+obsoletes nothing. Changes without a location in a tree, such as ``lock``,
+``unlock`` and sampling summaries, are always kept. List operations that move
+items (insert, pop, remove, del, sort, reverse) are kept at the list, and the
+indexes of later changes are counted from that point on, so a change at index
+2 never obsoletes a change made at index 2 before the items moved.
+
+Applying the compacted log in order therefore gives the same state as applying
+the original log.
+
+Compaction is an external sort, so logs larger than memory can be compacted:
+
+1. the log is read in runs of at most `run_size` changes, each reduced in
+   memory, sorted by (root, path) and written to a temporary file;
+2. the runs are merged, dropping changes older than a replacement of their
+   location or of one of its ancestors;
+3. the surviving changes are sorted back into time order, again through
+   temporary runs, and written out as the original JSON lines.
+
+Besides the runs, only a counter per list whose items moved is kept in memory.
+"""
+
+from __future__ import annotations
+
+import ast
+import datetime
+import heapq
+import json
+import os
+import tempfile
+from collections.abc import Iterable, Iterator
+from itertools import groupby
+from pathlib import Path
+from typing import IO, Any, NamedTuple
+
+from .utils.paths import PathSegment, TrackingPath
+
+# actions that do not change the data of a tree: kept, and replace nothing
+_PINNED = frozenset({"lock", "unlock", "sampling summary"})
+# methods replacing the value at their own location
+_REPLACING = {
+    "TrackedDict": frozenset({"__setitem__", "__delitem__", "pop", "popitem"}),
+    "TrackedList": frozenset({"__setitem__"}),
+    "TrackedAttr": frozenset({"__setattr__", "__delattr__", "__set__", "__delete__"}),
+}
+# list methods recording the index they changed, the change is kept at the list
+_LIST_ITEM_METHODS = frozenset({"append", "extend", "insert", "pop", "remove", "__delitem__"})
+# list methods moving the items after (or around) the changed index
+_MOVING = frozenset({"insert", "pop", "remove", "__delitem__", "sort", "reverse"})
+# methods removing the item at their own location
+_REMOVING = frozenset({"__delitem__", "__delattr__", "__delete__", "pop", "popitem", "remove"})
+
+# a location: root uuid and the path segments, each JSON encoded so that
+# segments of any type compare and a parent sorts before its children
+Key = tuple[str, tuple[str, ...]]
+
+
+class CompactionResult(NamedTuple):
+    """Counts from a `compact_log` run."""
+
+    records_in: int
+    records_out: int
+    runs: int
+
+
+class ChangeKey(NamedTuple):
+    """A location touched by a change and whether the change replaces it."""
+
+    key: Key
+    replaces: bool
+
+
+def _segment(kind: str, value: Any) -> str:
+    # the same encoding as TrackingPath.to_json
+    if not (isinstance(value, str | int | float | bool) or value is None):
+        value = repr(value)
+    return json.dumps([kind, value])
+
+
+def _update_items(value: Any) -> dict[Any, str] | None:
+    """Return the keys of a serialized ``update`` value and the repr of each value.
+
+    None if the value is not the repr of a dict with literal keys.
+    """
+
+    try:
+        tree = ast.parse(str(value), mode="eval").body
+        if not isinstance(tree, ast.Dict) or None in tree.keys:
+            return None
+        return {
+            ast.literal_eval(key): ast.get_source_segment(str(value), item) or ""
+            for key, item in zip(tree.keys, tree.values, strict=True)
+        }
+    except (SyntaxError, ValueError, TypeError, RecursionError):
+        return None
+
+
+def change_keys(record: dict[str, Any]) -> list[ChangeKey]:
+    """Return the locations a serialized change applies to.
+
+    Most changes touch one location. A ``TrackedDict.update`` replaces one
+    location per updated key, and changes without a location in a tree (lock,
+    unlock, sampling summaries) touch none, they are always kept.
+    """
+
+    extra = record.get("extra") or {}
+    if extra.get("action") in _PINNED:
+        return []
+    root = str(record.get("tracked_item_uuid", ""))
+    if "path" in record:
+        segments = [_segment(kind, value) for kind, value in record["path"]]
+    elif extra.get("location") is not None:
+        segments = [_segment("key", str(extra["location"]))]
+    else:
+        segments = []
+    kind, method = extra.get("type"), extra.get("method")
+    if kind == "TrackedDict" and method == "update":
+        items = _update_items(extra.get("value"))
+        if items is not None:
+            return [ChangeKey((root, (*segments, _segment("key", key))), True) for key in items]
+        return [ChangeKey((root, tuple(segments)), False)]
+    if kind == "TrackedList" and method in _LIST_ITEM_METHODS and segments:
+        if json.loads(segments[-1])[0] == "index":
+            segments.pop()
+        return [ChangeKey((root, tuple(segments)), False)]
+    # logs of earlier releases record negative indexes as written, they do not
+    # name the same item once the list has grown
+    relative = any(
+        segment_kind == "index" and isinstance(value, int) and value < 0
+        for segment_kind, value in record.get("path", ())
+    )
+    replaces = method == "clear" or (
+        bool(segments) and not relative and method in _REPLACING.get(str(kind), frozenset())
+    )
+    return [ChangeKey((root, tuple(segments)), replaces)]
+
+
+def _timestamp(record: dict[str, Any]) -> float:
+    created = record.get("created_time")
+    return datetime.datetime.fromisoformat(created).timestamp() if created else 0.0
+
+
+class _Epochs:
+    """Count the moves of each list so indexes before and after a move differ.
+
+    An index segment below a list that moved its items gets the number of
+    moves so far as a third element. Keys have to be rewritten in log order.
+    """
+
+    def __init__(self) -> None:
+        self._moves: dict[Key, int] = {}
+
+    def rewrite(self, key: Key) -> Key:
+        if not self._moves:
+            return key
+        root, segments = key
+        rewritten: list[str] = []
+        for segment in segments:
+            moves = self._moves.get((root, tuple(rewritten)))
+            if moves:
+                kind, value = json.loads(segment)[:2]
+                if kind == "index":
+                    segment = json.dumps([kind, value, moves])
+            rewritten.append(segment)
+        return root, tuple(rewritten)
+
+    def moved(self, key: Key) -> None:
+        self._moves[key] = self._moves.get(key, 0) + 1
+
+
+def _write_run(items: Iterable[tuple[Any, bytes]], directory: str) -> str:
+    """Write (sort header, line) pairs to a temporary run file."""
+
+    handle, name = tempfile.mkstemp(suffix=".run", dir=directory)
+    with os.fdopen(handle, "wb") as run:
+        for header, line in items:
+            # the serialized change never holds a raw tab, JSON escapes it
+            run.write(json.dumps(header).encode() + b"\t" + line.rstrip(b"\n") + b"\n")
+    return name
+
+
+def _read_run(name: str) -> Iterator[tuple[Any, bytes]]:
+    with open(name, "rb") as run:
+        for raw in run:
+            header, _, line = raw.partition(b"\t")
+            yield json.loads(header), line.rstrip(b"\n")
+
+
+def _merged(runs: list[str]) -> Iterator[tuple[Any, bytes]]:
+    return heapq.merge(*(_read_run(name) for name in runs), key=lambda item: item[0])
+
+
+def _reduce(
+    lines: Iterable[bytes], run_size: int, directory: str, runs: list[str], pinned: list[str]
+) -> int:
+    """Write runs sorted by key without the changes replaced within the run.
+
+    Each run holds [root, segments, 0, -time, -position] headers for
+    replacements, so the latest replacement of a key comes first, and
+    [root, segments, 1, time, position] headers for the other changes. Pinned
+    changes go to `pinned` runs in time order. Returns the number of changes.
+    """
+
+    count = held = 0
+    epochs = _Epochs()
+    # per key: [order of the latest replacement, its run item, kept run items]
+    buffer: dict[Key, list] = {}
+    batch: list[tuple[list, bytes]] = []
+
+    def flush() -> None:
+        nonlocal held
+        items = []
+        for _, replacement, kept in buffer.values():
+            if replacement is not None:
+                items.append(replacement)
+            items.extend(item for _, item in kept)
+        runs.append(_write_run(sorted(items, key=lambda item: item[0]), directory))
+        buffer.clear()
+        held = 0
+
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        order = (_timestamp(record), count)
+        count += 1
+        keys = change_keys(record)
+        if not keys:
+            batch.append(([*order], line))
+            if len(batch) >= run_size:
+                pinned.append(_write_run(sorted(batch), directory))
+                batch.clear()
+            continue
+        extra = record.get("extra") or {}
+        for key, replaces in keys:
+            key = epochs.rewrite(key)
+            if extra.get("type") == "TrackedList" and extra.get("method") in _MOVING:
+                epochs.moved(key)
+            slot = buffer.setdefault(key, [None, None, []])
+            root, segments = key
+            if replaces:
+                if slot[0] is not None and order < slot[0]:
+                    continue
+                held += slot[1] is None
+                kept = [entry for entry in slot[2] if entry[0] > order]
+                held -= len(slot[2]) - len(kept)
+                header = [root, list(segments), 0, -order[0], -order[1]]
+                slot[:] = [order, (header, line), kept]
+            elif slot[0] is None or order > slot[0]:
+                header = [root, list(segments), 1, *order]
+                slot[2].append((order, (header, line)))
+                held += 1
+        if held >= run_size:
+            flush()
+    if buffer:
+        flush()
+    if batch:
+        pinned.append(_write_run(sorted(batch), directory))
+    return count
+
+
+def _surviving(merged: Iterator[tuple[list, bytes]]) -> Iterator[tuple[Key, bool, list, bytes]]:
+    """Yield (key, replaces, [time, position], line) of the changes still relevant.
+
+    A change is dropped when its key or an ancestor of its key was replaced
+    after it.
+    """
+
+    # ancestors of the current key: (root, segments, order of their newest replacement)
+    chain: list[tuple[str, list[str], list | None]] = []
+    for (root, segments), group in groupby(merged, key=lambda item: (item[0][0], item[0][1])):
+        while chain and not (
+            chain[-1][0] == root and segments[: len(chain[-1][1])] == chain[-1][1]
+        ):
+            chain.pop()
+        newest = chain[-1][2] if chain else None
+        key = (root, tuple(segments))
+        for header, line in group:
+            replaces = header[2] == 0
+            order = [-header[3], -header[4]] if replaces else header[3:]
+            if newest is None or order > newest:
+                yield key, replaces, order, line
+                if replaces:
+                    newest = order
+        chain.append((root, segments, newest))
+
+
+def _write_checkpoint(handle: IO[bytes], key: Key, line: bytes) -> None:
+    """Write the state of a location from the last change kept for it."""
+
+    root, segments = key
+    record = json.loads(line)
+    extra = record.get("extra") or {}
+    path = [json.loads(segment)[:2] for segment in segments]
+    depth = len(record.get("path") or ([] if extra.get("location") is None else [None]))
+    value = extra.get("value")
+    if depth < len(path):
+        # one key of an update
+        value = (_update_items(value) or {}).get(path[-1][1])
+    elif depth > len(path):
+        # a list change kept at the list: only a snapshot describes the items
+        value = extra.get("data_post_change")
+    elif extra.get("method") in _REMOVING or extra.get("action") == "remove":
+        return
+    entry = {
+        "tracked_item_uuid": root,
+        "location": TrackingPath(PathSegment(kind, value) for kind, value in path).render(),
+        "path": path,
+        "created_time": record.get("created_time"),
+        "action": extra.get("action"),
+        "value": value,
+    }
+    handle.write(json.dumps(entry).encode() + b"\n")
+
+
+def compact_log(
+    source: str | Path,
+    destination: str | Path,
+    *,
+    checkpoint: str | Path | None = None,
+    run_size: int = 100_000,
+    temp_dir: str | Path | None = None,
+) -> CompactionResult:
+    """Compact a JSONL change log written by `JsonLinesExporter`.
+
+    Memory use is bounded by `run_size` records, the rest goes to temporary
+    run files that are removed afterwards. `destination` is replaced
+    atomically once compaction succeeds and may be the same file as `source`.
+
+    Args:
+        source: The log to compact.
+        destination: Where to write the compacted log, in time order.
+        checkpoint: Also write the state as JSON lines, one per live location
+            with its latest value, in (root, path) order.
+        run_size: Records held in memory per sorted run.
+        temp_dir: Directory for the run files, defaults to the destination's.
+    """
+
+    if run_size < 1:
+        raise ValueError("run_size must be at least 1")
+    destination = Path(destination)
+    directory = str(temp_dir or destination.parent)
+    runs: list[str] = []
+    time_runs: list[str] = []
+    written = 0
+    try:
+        with open(source, "rb") as log:
+            count = _reduce(log, run_size, directory, runs, time_runs)
+        key_runs = len(runs)
+
+        checkpoint_handle = open(checkpoint, "wb") if checkpoint else None  # noqa: SIM115
+        try:
+            # second pass: back to time order, [time, position] headers
+            batch: list[tuple[list, bytes]] = []
+            last: tuple[Key, bytes] | None = None
+            for key, _, order, line in _surviving(_merged(runs)):
+                if checkpoint_handle is not None:
+                    if last is not None and last[0] != key:
+                        _write_checkpoint(checkpoint_handle, *last)
+                    last = (key, line)
+                batch.append((order, line))
+                if len(batch) >= run_size:
+                    time_runs.append(_write_run(sorted(batch), directory))
+                    batch.clear()
+            if batch:
+                time_runs.append(_write_run(sorted(batch), directory))
+            if checkpoint_handle is not None and last is not None:
+                _write_checkpoint(checkpoint_handle, *last)
+        finally:
+            if checkpoint_handle is not None:
+                checkpoint_handle.close()
+
+        handle, partial = tempfile.mkstemp(suffix=".partial", dir=destination.parent)
+        runs.append(partial)
+        with os.fdopen(handle, "wb") as out:
+            previous = None
+            for order, line in _merged(time_runs):
+                # a change kept for several keys of an update is written once
+                if order != previous:
+                    out.write(line + b"\n")
+                    written += 1
+                previous = order
+        os.replace(partial, destination)
+        runs.remove(partial)
+    finally:
+        for name in runs + time_runs:
+            Path(name).unlink(missing_ok=True)
+    return CompactionResult(count, written, key_runs + len(time_runs))
@@ -2,13 +2,24 @@
 
 from __future__ import annotations
 
+import datetime
+import heapq
 import json
+import os
+import re
+import socket
 import uuid
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Iterator
+from operator import itemgetter
 from pathlib import Path
 
 from .utils.changelog import ChangeLogEntry
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
 
 class BaseExporter:
     """Base class for exporters that also act as observers."""
@@ -32,6 +43,140 @@ class JsonLinesExporter(BaseExporter):
             handle.write(json.dumps(change_dict) + "\n")
 
 
+class SharedJsonLinesExporter(BaseExporter):
+    """Append serialized change dicts to a JSONL file shared by several processes.
+
+    Every record is encoded up front and written with ``os.write`` on a
+    descriptor opened with ``O_APPEND``, so the kernel places it at the end of
+    the file in one piece. With `lock` (where ``fcntl`` is available) an
+    exclusive ``flock`` is held around the write, which also keeps records too
+    large for a single write call from interleaving. The descriptor is reopened
+    in a forked child, as a lock on an inherited descriptor would be shared with
+    the parent.
+    """
+
+    def __init__(self, path: str | Path, *, lock: bool = True) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = lock and fcntl is not None
+        self._fd: int | None = None
+        self._pid = 0
+
+    def _descriptor(self) -> int:
+        if self._fd is None or self._pid != os.getpid():
+            # the parent's descriptor stays open for the parent
+            self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            self._pid = os.getpid()
+        return self._fd
+
+    def export(self, change_dict: dict[str, object]) -> None:
+        self.write((json.dumps(change_dict) + "\n").encode("utf-8"))
+
+    def write(self, record: bytes) -> None:
+        """Append one complete, newline terminated record."""
+
+        fd = self._descriptor()
+        if self.lock:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            view = memoryview(record)
+            while view:
+                view = view[os.write(fd, view) :]
+        finally:
+            if self.lock:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def close(self) -> None:
+        if self._fd is not None and self._pid == os.getpid():
+            os.close(self._fd)
+        self._fd = None
+
+
+class SegmentedJsonLinesExporter(SharedJsonLinesExporter):
+    """Append serialized change dicts to a JSONL segment owned by this process.
+
+    Each process (identified by host name and pid, so a forked worker gets its
+    own) writes ``<prefix>-<host>-<pid>.jsonl`` in `directory` without any
+    locking. Read the segments back in time order with `merge_jsonl_lines`.
+    """
+
+    def __init__(self, directory: str | Path, *, prefix: str = "changes") -> None:
+        self.directory = Path(directory)
+        self.prefix = prefix
+        super().__init__(self._segment_path(), lock=False)
+
+    def _segment_path(self) -> Path:
+        return self.directory / f"{self.prefix}-{socket.gethostname()}-{os.getpid()}.jsonl"
+
+    def _descriptor(self) -> int:
+        if self._pid != os.getpid():
+            self.path = self._segment_path()
+        return super()._descriptor()
+
+
+# `to_dict` writes the creation time before the tree and the extra values
+_CREATED_TIME = re.compile(rb'"created_time":\s*"([^"]*)"')
+
+
+def _timestamp(created: object) -> float:
+    try:
+        return datetime.datetime.fromisoformat(str(created)).timestamp()
+    except ValueError:
+        return 0.0
+
+
+def _created_timestamp(line: bytes) -> float:
+    """Return the creation time of a serialized change without parsing it."""
+
+    found = _CREATED_TIME.search(line)
+    return _timestamp(found[1].decode()) if found else 0.0
+
+
+def _log_files(paths: Iterable[str | Path]) -> list[Path]:
+    files: list[Path] = []
+    for path in map(Path, paths):
+        files.extend(sorted(path.glob("*.jsonl")) if path.is_dir() else [path])
+    return files
+
+
+def _log_lines(path: Path) -> Iterator[bytes]:
+    with path.open("rb") as handle:
+        for line in handle:
+            if line.strip():
+                yield line if line.endswith(b"\n") else line + b"\n"
+
+
+def _log_records(path: Path) -> Iterator[tuple[float, dict[str, object]]]:
+    for line in _log_lines(path):
+        record = json.loads(line)
+        yield _timestamp(record.get("created_time")), record
+
+
+def merge_jsonl_lines(paths: Iterable[str | Path]) -> Iterator[bytes]:
+    """Yield the lines of several JSONL change logs merged by creation time.
+
+    Each log must already be in time order, as the segments of one process
+    are. Directories are expanded to the ``*.jsonl`` files they contain. Only
+    one line per log is held in memory, and lines are not parsed: the creation
+    time is read from the raw line.
+    """
+
+    files = _log_files(paths)
+    return heapq.merge(*(_log_lines(path) for path in files), key=_created_timestamp)
+
+
+def merge_jsonl(paths: Iterable[str | Path]) -> Iterator[dict[str, object]]:
+    """Yield the change dicts of several JSONL change logs merged by creation time.
+
+    Every line is parsed once, the logs are merged as (time, change) pairs.
+    """
+
+    files = _log_files(paths)
+    merged = heapq.merge(*(_log_records(path) for path in files), key=itemgetter(0))
+    for _, record in merged:
+        yield record
+
+
 class HttpExporter(BaseExporter):
     """Send serialized change dicts via an injected HTTP client."""
 
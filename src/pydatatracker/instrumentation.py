@@ -0,0 +1,188 @@
+"""Optional counters and timers for the tracking hot paths.
+
+Instrumentation is off by default. The hot paths only check `STATS.enabled`, a
+single attribute load, before doing any bookkeeping, so the disabled cost is
+negligible. Enable it with `enable_stats()` (or ``PYDATATRACKER_STATS=1`` in the
+environment) and read the numbers with `pydatatracker.stats()`.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+import weakref
+from collections import Counter
+from collections.abc import Callable
+from typing import Any
+
+
+def observer_name(observer: Callable[..., Any]) -> str:
+    """Return a stable, readable name for an observer callable."""
+
+    target = getattr(observer, "__func__", observer)
+    name = getattr(target, "__qualname__", None)
+    if name is None:
+        target = type(observer)
+        name = target.__qualname__
+    return f"{getattr(target, '__module__', '?')}.{name}"
+
+
+class ObserverMap:
+    """Values kept per observer object rather than per observer name.
+
+    Observers are held weakly where they allow it, so an entry goes away with
+    its observer. Others (callables without weak reference support) are held
+    until their entry is popped.
+    """
+
+    __slots__ = ("_weak", "_strong")
+
+    def __init__(self) -> None:
+        self._weak: weakref.WeakKeyDictionary[Callable[..., Any], Any] = weakref.WeakKeyDictionary()
+        self._strong: dict[Callable[..., Any], Any] = {}
+
+    def get(self, observer: Callable[..., Any], default: Any = None) -> Any:
+        try:
+            return self._weak.get(observer, default)
+        except TypeError:
+            return self._strong.get(observer, default)
+
+    def __setitem__(self, observer: Callable[..., Any], value: Any) -> None:
+        try:
+            self._weak[observer] = value
+        except TypeError:
+            self._strong[observer] = value
+
+    def pop(self, observer: Callable[..., Any], default: Any = None) -> Any:
+        try:
+            return self._weak.pop(observer, default)
+        except TypeError:
+            return self._strong.pop(observer, default)
+
+    def values(self) -> list[Any]:
+        return [*self._weak.values(), *self._strong.values()]
+
+
+class TrackingStats:
+    """Counters for entries, propagation, observers, snapshots and stacks."""
+
+    __slots__ = (
+        "enabled",
+        "entries_created",
+        "record_seconds",
+        "propagation_hops",
+        "observer_calls",
+        "observer_seconds",
+        "snapshot_bytes",
+        "stack_captures",
+        "observers",
+        "observer_names",
+        "containers",
+    )
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.reset()
+
+    def reset(self) -> None:
+        """Zero every counter, keeping the enabled state."""
+
+        self.entries_created = 0
+        self.record_seconds = 0.0
+        self.propagation_hops = 0
+        self.observer_calls = 0
+        self.observer_seconds = 0.0
+        self.snapshot_bytes = 0
+        self.stack_captures = 0
+        # observer -> [label, calls, cumulative seconds]
+        self.observers = ObserverMap()
+        # observer name -> number of observers seen with that name
+        self.observer_names: Counter[str] = Counter()
+        # "<type>:<uuid>" -> entries created by that container
+        self.containers: Counter[str] = Counter()
+
+    def call_observer(self, observer: Callable[..., Any], change: Any) -> None:
+        """Call an observer, adding the call and its duration to the counters."""
+
+        start = time.perf_counter()
+        try:
+            observer(change)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.observer_calls += 1
+            self.observer_seconds += elapsed
+            counts = self.observers.get(observer)
+            if counts is None:
+                self.observers[observer] = [self._label(observer), 1, elapsed]
+            else:
+                counts[1] += 1
+                counts[2] += elapsed
+
+    def _label(self, observer: Callable[..., Any]) -> str:
+        name = observer_name(observer)
+        self.observer_names[name] += 1
+        seen = self.observer_names[name]
+        return name if seen == 1 else f"{name}#{seen}"
+
+    def as_dict(self, top: int = 10) -> dict[str, Any]:
+        """Return the counters, the slowest observers and the hottest containers.
+
+        Observers are counted one by one and listed by name. When several
+        observers share a name (instances of one class, or the notifications of
+        several parent containers), the later ones get ``#2``, ``#3``... appended
+        in the order they were first called. Observer time includes everything
+        an observer triggers, so the entry of a parent container's notification
+        includes the propagation above it.
+        """
+
+        slowest = sorted(self.observers.values(), key=lambda item: -item[2])[:top]
+        return {
+            "enabled": self.enabled,
+            "entries_created": self.entries_created,
+            "record_seconds": self.record_seconds,
+            "propagation_hops": self.propagation_hops,
+            "observer_calls": self.observer_calls,
+            "observer_seconds": self.observer_seconds,
+            "snapshot_bytes": self.snapshot_bytes,
+            "stack_captures": self.stack_captures,
+            "observers": {
+                name: {"calls": calls, "seconds": seconds} for name, calls, seconds in slowest
+            },
+            "hot_containers": dict(self.containers.most_common(top)),
+        }
+
+
+STATS = TrackingStats()
+STATS.enabled = os.environ.get("PYDATATRACKER_STATS", "") not in ("", "0")
+
+
+def enable_stats() -> None:
+    """Start counting."""
+
+    STATS.enabled = True
+
+
+def disable_stats() -> None:
+    """Stop counting, keeping the numbers collected so far."""
+
+    STATS.enabled = False
+
+
+def reset_stats() -> None:
+    """Zero every counter."""
+
+    STATS.reset()
+
+
+def stats(*, reset: bool = False, top: int = 10) -> dict[str, Any]:
+    """Return the instrumentation counters as a dict.
+
+    Args:
+        reset: Zero the counters after reading them.
+        top: How many of the slowest observers and hottest containers to list.
+    """
+
+    result = STATS.as_dict(top)
+    if reset:
+        STATS.reset()
+    return result
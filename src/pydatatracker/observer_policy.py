@@ -0,0 +1,186 @@
+"""Timing, slow-observer detection and failure isolation for observer dispatch."""
+
+from __future__ import annotations
+
+import logging
+import time
+from bisect import bisect_left
+from collections.abc import Callable
+from typing import Any, Literal
+
+from .instrumentation import ObserverMap, observer_name
+
+# upper bounds (seconds) of the latency histogram buckets, the last one is open
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+
+OnError = Literal["raise", "log", "disable"]
+
+
+class ObserverLatency:
+    """Latency histogram and failure counts of the observers sharing a name.
+
+    `failures` and `disabled` add up the failures and disabled observers of
+    every instance with that name, each instance is disabled on its own.
+    """
+
+    __slots__ = ("name", "bounds", "buckets", "count", "total", "max", "failures", "disabled")
+
+    def __init__(self, name: str, bounds: tuple[float, ...]) -> None:
+        self.name = name
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.failures = 0
+        self.disabled = 0
+
+    def observe(self, seconds: float) -> None:
+        self.buckets[bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def as_dict(self) -> dict[str, Any]:
+        labels = [str(bound) for bound in self.bounds] + ["+Inf"]
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "max": self.max,
+            "failures": self.failures,
+            "disabled": self.disabled,
+            "buckets": dict(zip(labels, self.buckets, strict=True)),
+        }
+
+
+class ObserverPolicy:
+    """How observers of a container are timed and isolated from its mutations.
+
+    Pass an instance as `tracking_observer_policy` to a tracked container, it is
+    shared with the children like a sampling policy. Every call of a user
+    observer (propagation to parent containers is not wrapped) is timed into a
+    per-observer latency histogram. Calls slower than `slow_threshold` are
+    logged as warnings and passed to `on_slow`. When an observer raises:
+
+    - ``"raise"`` re-raises the error into the mutation (the default, as without
+      a policy),
+    - ``"log"`` logs it and continues with the next observer,
+    - ``"disable"`` logs it and removes the observer after `max_failures`
+      failures of that observer.
+
+    Failures are counted per observer object, latencies are reported per
+    observer name (the qualified name of its function or class).
+
+    A Histogram-like `histogram` (labelled by ``observer``), such as a
+    prometheus_client Histogram, also receives every latency.
+    """
+
+    def __init__(
+        self,
+        *,
+        slow_threshold: float | None = None,
+        on_error: OnError = "raise",
+        max_failures: int = 3,
+        on_slow: Callable[[str, float, Any], None] | None = None,
+        histogram: Any | None = None,
+        logger: logging.Logger | None = None,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        """Initialize the policy.
+
+        Args:
+            slow_threshold: Seconds after which an observer call counts as slow.
+            on_error: What to do when an observer raises.
+            max_failures: Failures after which ``"disable"`` removes an observer.
+            on_slow: Called with the observer name, the duration and the change
+                for every slow call.
+            histogram: Optional Histogram-like object receiving every latency.
+            logger: Logger for slow calls and failures.
+            buckets: Upper bounds in seconds of the latency histogram buckets.
+        """
+
+        if on_error not in ("raise", "log", "disable"):
+            raise ValueError("on_error must be 'raise', 'log' or 'disable'")
+        if max_failures < 1:
+            raise ValueError("max_failures must be at least 1")
+        self.slow_threshold = slow_threshold
+        self.on_error = on_error
+        self.max_failures = max_failures
+        self.on_slow = on_slow
+        self.histogram = histogram
+        self.logger = logger or logging.getLogger("pydatatracker")
+        self.buckets = tuple(sorted(buckets))
+        self._latencies: dict[str, ObserverLatency] = {}
+        # failures per observer object, the name only labels latencies and logs
+        self._failures = ObserverMap()
+
+    def _latency(self, observer: Callable[..., Any]) -> ObserverLatency:
+        name = observer_name(observer)
+        latency = self._latencies.get(name)
+        if latency is None:
+            latency = self._latencies[name] = ObserverLatency(name, self.buckets)
+        return latency
+
+    def dispatch(
+        self,
+        observer: Callable[..., Any],
+        change: Any,
+        call: Callable[[Callable[..., Any], Any], Any],
+    ) -> bool:
+        """Call an observer through `call` under this policy.
+
+        Returns:
+            False if the observer has been disabled and should be removed.
+        """
+
+        latency = self._latency(observer)
+        start = time.perf_counter()
+        try:
+            call(observer, change)
+        except Exception:
+            latency.observe(time.perf_counter() - start)
+            latency.failures += 1
+            if self.on_error == "raise":
+                raise
+            failures = self._failures.get(observer, 0) + 1
+            self._failures[observer] = failures
+            self.logger.exception(
+                "observer %s failed on %s (%d failures)",
+                latency.name,
+                change.extra.get("action"),
+                failures,
+            )
+            if self.on_error == "disable" and failures >= self.max_failures:
+                latency.disabled += 1
+                self._failures.pop(observer)
+                self.logger.warning(
+                    "observer %s disabled after %d failures", latency.name, failures
+                )
+                return False
+            return True
+        elapsed = time.perf_counter() - start
+        latency.observe(elapsed)
+        if self.histogram is not None:
+            self.histogram.labels(observer=latency.name).observe(elapsed)
+        if self.slow_threshold is not None and elapsed > self.slow_threshold:
+            self.logger.warning(
+                "slow observer %s took %.6fs on %s",
+                latency.name,
+                elapsed,
+                change.extra.get("action"),
+            )
+            if self.on_slow is not None:
+                self.on_slow(latency.name, elapsed, change)
+        return True
+
+    def latencies(self) -> dict[str, dict[str, Any]]:
+        """Return the latency histogram and failures of every observer seen."""
+
+        return {name: latency.as_dict() for name, latency in self._latencies.items()}
+
+    def __repr__(self) -> str:
+        return (
+            f"ObserverPolicy(slow_threshold={self.slow_threshold}, on_error={self.on_error!r}, "
+            f"max_failures={self.max_failures})"
+        )
@@ -2,20 +2,40 @@
 
 from __future__ import annotations
 
+import atexit
+import datetime
 import json
 import logging
+import os
+import threading
+import time
+import weakref
+from bisect import bisect_left
 from collections import deque
-from collections.abc import Callable, Iterable
+from collections.abc import Callable, Hashable, Iterator, Sequence
 from importlib import import_module
 from pathlib import Path
 from typing import Any
 
 from .exporters import HttpExporter, JsonLinesExporter, KafkaExporter, S3Exporter
+from .instrumentation import stats
 from .utils.changelog import ChangeLogEntry
+from .utils.paths import TrackingPath
 
 
 class ChangeCollector:
-    """Callable observer that stores incoming change log entries in memory."""
+    """Callable observer that stores incoming change log entries in memory.
+
+    Entries are indexed as they arrive by action, actor, tracked item uuid and
+    location prefix, and kept in arrival order for time range lookups, so
+    `query` only visits the entries of its most selective criterion. When
+    `capacity` is reached the oldest entry is dropped from the indexes too.
+
+    Time-only queries are a binary search while entries arrive in creation
+    order. Changes recorded by several threads can arrive out of order, the
+    collector then scans the entries until the out of order ones are evicted
+    or cleared.
+    """
 
     def __init__(
         self,
@@ -32,62 +52,220 @@ class ChangeCollector:
 
         self.capacity = capacity
         self.include_init_events = include_init_events
-        self._changes: deque[ChangeLogEntry] = deque(maxlen=self.capacity)
+        # live entries are _changes[_start:], evicted slots are compacted lazily
+        self._changes: list[ChangeLogEntry] = []
+        self._start = 0
+        self._by_action: dict[Any, deque[ChangeLogEntry]] = {}
+        self._by_actor: dict[Any, deque[ChangeLogEntry]] = {}
+        self._by_item: dict[Any, deque[ChangeLogEntry]] = {}
+        self._by_prefix: dict[tuple, deque[ChangeLogEntry]] = {}
+        # live entries created before the entry that arrived just before them
+        self._out_of_order: deque[ChangeLogEntry] = deque()
+
+    def _index_keys(self, change: ChangeLogEntry) -> Iterator[tuple[dict, Any]]:
+        yield self._by_action, change.extra.get("action")
+        yield self._by_actor, change.actor
+        yield self._by_item, change.tracked_item_uuid
+        keys = _location_keys(change.extra.get("location"))
+        for depth in range(1, len(keys) + 1):
+            yield self._by_prefix, keys[:depth]
 
-    def __call__(self, change: ChangeLogEntry) -> None:  # pragma: no cover - trivial
+    def __call__(self, change: ChangeLogEntry) -> None:
         if not self.include_init_events and change.extra.get("action") == "init":
             return
+        if self.capacity is not None and len(self) >= self.capacity:
+            if self.capacity <= 0:
+                return
+            self._evict_oldest()
+        if len(self) and change.created_time < self._changes[-1].created_time:
+            self._out_of_order.append(change)
         self._changes.append(change)
+        for index, key in self._index_keys(change):
+            bucket = index.get(key)
+            if bucket is None:
+                index[key] = bucket = deque()
+            bucket.append(change)
+
+    def _evict_oldest(self) -> None:
+        oldest = self._changes[self._start]
+        for index, key in self._index_keys(oldest):
+            bucket = index[key]
+            bucket.popleft()
+            if not bucket:
+                del index[key]
+        self._start += 1
+        # the entry after the evicted one no longer has a live predecessor
+        if (
+            self._out_of_order
+            and self._start < len(self._changes)
+            and self._out_of_order[0] is self._changes[self._start]
+        ):
+            self._out_of_order.popleft()
+        if self._start > 64 and self._start * 2 > len(self._changes):
+            del self._changes[: self._start]
+            self._start = 0
 
     def __len__(self) -> int:  # pragma: no cover - trivial
-        return len(self._changes)
+        return len(self._changes) - self._start
 
     def __bool__(self) -> bool:  # pragma: no cover
-        return bool(self._changes)
+        return len(self) > 0
 
     def clear(self) -> None:
         """Remove all collected change log entries."""
 
         self._changes.clear()
+        self._start = 0
+        self._by_action.clear()
+        self._by_actor.clear()
+        self._by_item.clear()
+        self._by_prefix.clear()
+        self._out_of_order.clear()
 
     def as_list(self) -> list[ChangeLogEntry]:
         """Return collected changes as a list (in arrival order)."""
 
-        return list(self._changes)
+        return self._changes[self._start :]
 
     def last(self) -> ChangeLogEntry | None:
         """Return the most recent collected change."""
 
-        return self._changes[-1] if self._changes else None
+        return self._changes[-1] if len(self) else None
 
     def filtered(self, action: str) -> list[ChangeLogEntry]:
         """Return collected changes matching a specific action."""
 
-        return [entry for entry in self._changes if entry.extra.get("action") == action]
+        return list(self._by_action.get(action, ()))
+
+    def query(
+        self,
+        *,
+        action: str | None = None,
+        actor: str | None = None,
+        tracked_item_uuid: str | None = None,
+        location_prefix: TrackingPath | Sequence[Hashable] | Hashable | None = None,
+        since: datetime.datetime | None = None,
+        until: datetime.datetime | None = None,
+    ) -> list[ChangeLogEntry]:
+        """Return collected changes matching every given criterion.
+
+        The smallest index among the given criteria supplies the candidates and
+        the remaining criteria are checked on those entries only.
+
+        Args:
+            action: The action of the change, e.g. ``"update"``.
+            actor: The actor recorded on the change.
+            tracked_item_uuid: The uuid of the container the change was recorded by.
+            location_prefix: A `TrackingPath`, a sequence of raw keys (e.g.
+                ``("users", "alice")``) or a single key; matches that location and
+                everything below it.
+            since: Only changes created at or after this time.
+            until: Only changes created before this time.
+
+        Returns:
+            The matching changes in arrival order.
+        """
 
-    def __iter__(self) -> Iterable[ChangeLogEntry]:  # pragma: no cover
-        return iter(self._changes)
+        criteria: list[tuple[dict, Any]] = []
+        if action is not None:
+            criteria.append((self._by_action, action))
+        if actor is not None:
+            criteria.append((self._by_actor, actor))
+        if tracked_item_uuid is not None:
+            criteria.append((self._by_item, tracked_item_uuid))
+        if location_prefix is not None:
+            prefix = _location_keys(location_prefix)
+            if prefix:
+                criteria.append((self._by_prefix, prefix))
+
+        if not criteria and self._out_of_order:
+            return [
+                entry
+                for entry in self.as_list()
+                if (since is None or entry.created_time >= since)
+                and (until is None or entry.created_time < until)
+            ]
+        if not criteria:
+            # entries arrived in creation order, so a time range is a slice
+            low, high = self._start, len(self._changes)
+            if since is not None:
+                low = bisect_left(self._changes, since, low, high, key=_created_time)
+            if until is not None:
+                high = bisect_left(self._changes, until, low, high, key=_created_time)
+            return self._changes[low:high]
+
+        buckets = []
+        for index, key in criteria:
+            bucket = index.get(key)
+            if not bucket:
+                return []
+            buckets.append((len(bucket), bucket))
+        candidates = min(buckets, key=lambda item: item[0])[1]
+        prefix = _location_keys(location_prefix)
+        return [
+            entry
+            for entry in candidates
+            if (action is None or entry.extra.get("action") == action)
+            and (actor is None or entry.actor == actor)
+            and (tracked_item_uuid is None or entry.tracked_item_uuid == tracked_item_uuid)
+            and (not prefix or _location_keys(entry.extra.get("location"))[: len(prefix)] == prefix)
+            and (since is None or entry.created_time >= since)
+            and (until is None or entry.created_time < until)
+        ]
+
+    def __iter__(self) -> Iterator[ChangeLogEntry]:  # pragma: no cover
+        return iter(self.as_list())
+
+
+def _created_time(change: ChangeLogEntry) -> datetime.datetime:
+    return change.created_time
+
+
+def _location_keys(location: Any) -> tuple:
+    """Return the raw keys of a location, prefix or single key."""
+
+    if location is None:
+        return ()
+    if isinstance(location, TrackingPath):
+        return location.keys
+    if isinstance(location, tuple | list):
+        return tuple(location)
+    return (location,)
 
 
 class FilteredObserver:
-    """Wraps another observer, only forwarding matching changes."""
+    """Wraps another observer, only forwarding matching changes.
+
+    `locations` matches whole locations, given as rendered strings or, for a
+    location one segment deep, as the raw key. `prefixes` matches subtrees: each
+    prefix is a sequence of raw keys (e.g. ``("users", "alice")``) compared with
+    the segments of the change's path, without rendering it.
+    """
 
-    def __init__(self, observer, *, actions=None, locations=None):
+    def __init__(self, observer, *, actions=None, locations=None, prefixes=None):
         self.observer = observer
         self.actions = set(actions or [])
         self.locations = set(locations or [])
+        self.prefixes = [tuple(prefix) for prefix in prefixes or []]
 
     def __call__(self, change):
         if self.actions and change.extra.get("action") not in self.actions:
             return
         location = change.extra.get("location")
         if self.locations and location not in self.locations:
+            keys = _location_keys(location)
+            if len(keys) != 1 or keys[0] not in self.locations:
+                return
+        if self.prefixes and not (
+            isinstance(location, TrackingPath)
+            and any(location.startswith(prefix) for prefix in self.prefixes)
+        ):
             return
         return self.observer(change)
 
 
-def filtered_observer(observer, *, actions=None, locations=None):
-    return FilteredObserver(observer, actions=actions, locations=locations)
+def filtered_observer(observer, *, actions=None, locations=None, prefixes=None):
+    return FilteredObserver(observer, actions=actions, locations=locations, prefixes=prefixes)
 
 
 def logging_observer(logger: logging.Logger | None = None) -> Callable[[ChangeLogEntry], None]:
@@ -177,23 +355,195 @@ def _resolve_callable(path: str) -> Callable[..., Any]:
 
 
 class MetricsObserver:
-    """Simple metrics observer wrapping a Counter-like interface."""
+    """Metrics observer wrapping a Counter-like interface.
+
+    Label children are looked up once per label set and cached. Besides
+    ``action``, `labels` can include ``type`` (the container type) and
+    ``location`` (the first `location_depth` segments of the location). Once
+    `max_label_sets` label sets exist, new ones are counted under ``other``.
+
+    With `flush_interval`, counts are accumulated locally and added to the
+    counter at most `flush_interval` seconds after the first pending change (a
+    timer thread flushes them when no later change does), when `flush` is
+    called, and at interpreter exit. Optional Histogram-like `depth_histogram` and
+    `size_histogram` receive the propagation depth (levels the change travelled
+    up to this observer) and the payload size (characters of its recorded
+    values) of every change.
 
-    def __init__(self, counter: Any) -> None:
+    With a Gauge-like `stats_gauge` (labelled by ``stat``), `publish_stats` also
+    exports the counters of `pydatatracker.stats()`, including the cumulative
+    time per observer as ``observer_seconds:<name>``.
+    """
+
+    LABELS = ("action", "type", "location")
+    OVERFLOW = "other"
+
+    def __init__(
+        self,
+        counter: Any,
+        *,
+        stats_gauge: Any | None = None,
+        labels: Sequence[str] = ("action",),
+        location_depth: int = 1,
+        max_label_sets: int = 1000,
+        flush_interval: float | None = None,
+        depth_histogram: Any | None = None,
+        size_histogram: Any | None = None,
+    ) -> None:
+        unknown = set(labels) - set(self.LABELS)
+        if unknown:
+            raise ValueError(f"unsupported metric labels: {sorted(unknown)}")
         self.counter = counter
+        self.stats_gauge = stats_gauge
+        self.labels = tuple(labels)
+        self.location_depth = location_depth
+        self.max_label_sets = max_label_sets
+        self.flush_interval = flush_interval
+        self.depth_histogram = depth_histogram
+        self.size_histogram = size_histogram
+        self._children: dict[tuple, Any] = {}
+        self._pending: dict[tuple, int] = {}
+        self._pending_depths: list[int] = []
+        self._pending_sizes: list[int] = []
+        self._next_flush = time.monotonic() + (flush_interval or 0.0)
+        # guards the pending counts, changes may arrive from several threads
+        self._lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+        if flush_interval is not None:
+            _BUFFERED.add(self)
+
+    def _key(self, change: ChangeLogEntry) -> tuple:
+        if self.labels == ("action",):
+            return (change.extra.get("action", "unknown"),)
+        key = []
+        for label in self.labels:
+            if label == "location":
+                location = change.extra.get("location")
+                if isinstance(location, TrackingPath):
+                    key.append(tuple.__getitem__(location, slice(0, self.location_depth)))
+                else:
+                    key.append("" if location is None else location)
+            else:
+                key.append(change.extra.get(label, "unknown"))
+        return tuple(key)
+
+    def _label_values(self, key: tuple) -> dict[str, str]:
+        values = {}
+        for label, value in zip(self.labels, key, strict=True):
+            if label == "location" and isinstance(value, tuple):
+                value = TrackingPath(value).render()
+            values[label] = str(value)
+        return values
+
+    def _child(self, key: tuple) -> Any:
+        child = self._children.get(key)
+        if child is None:
+            if len(self._children) >= self.max_label_sets:
+                key = (self.OVERFLOW,) * len(self.labels)
+                child = self._children.get(key)
+            if child is None:
+                child = self.counter.labels(**self._label_values(key))
+                self._children[key] = child
+        return child
 
     def __call__(self, change: ChangeLogEntry) -> None:
-        action = change.extra.get("action", "unknown")
-        self.counter.labels(action=action).inc()
+        key = self._key(change)
+        if self.flush_interval is None:
+            self._child(key).inc()
+            if self.depth_histogram is not None:
+                self.depth_histogram.observe(len(change.tree) - 1)
+            if self.size_histogram is not None:
+                self.size_histogram.observe(_payload_size(change))
+            return
+        depth = len(change.tree) - 1 if self.depth_histogram is not None else None
+        size = _payload_size(change) if self.size_histogram is not None else None
+        with self._lock:
+            self._pending[key] = self._pending.get(key, 0) + 1
+            if depth is not None:
+                self._pending_depths.append(depth)
+            if size is not None:
+                self._pending_sizes.append(size)
+            wait = self._next_flush - time.monotonic()
+            if wait > 0 and self._timer is None:
+                self._timer = threading.Timer(wait, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if wait <= 0:
+            self.flush()
+
+    def flush(self) -> None:
+        """Add the locally accumulated counts and observations to the metrics."""
+
+        with self._lock:
+            timer, self._timer = self._timer, None
+            if timer is not None and timer is not threading.current_thread():
+                timer.cancel()
+            pending, self._pending = self._pending, {}
+            depths, self._pending_depths = self._pending_depths, []
+            sizes, self._pending_sizes = self._pending_sizes, []
+            self._next_flush = time.monotonic() + (self.flush_interval or 0.0)
+            for key, count in pending.items():
+                self._child(key).inc(count)
+            for depth in depths:
+                self.depth_histogram.observe(depth)
+            for size in sizes:
+                self.size_histogram.observe(size)
+
+    def _after_fork(self) -> None:
+        # the timer thread and a lock held by another thread are not inherited
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def publish_stats(self) -> None:
+        """Set the stats gauge to the current instrumentation counters."""
+
+        if self.stats_gauge is None:
+            return
+        current = stats()
+        for name, value in current.items():
+            if isinstance(value, int | float) and not isinstance(value, bool):
+                self.stats_gauge.labels(stat=name).set(value)
+        for name, observer in current["observers"].items():
+            self.stats_gauge.labels(stat=f"observer_seconds:{name}").set(observer["seconds"])
+
+
+# buffering metrics observers, flushed at exit and reset in forked children
+_BUFFERED: weakref.WeakSet[MetricsObserver] = weakref.WeakSet()
+
+
+def _flush_buffered() -> None:
+    for observer in list(_BUFFERED):
+        observer.flush()
 
 
-def telemetry_observer(counter: Any | None = None) -> MetricsObserver:
-    """Return an observer that increments a Counter per action."""
+def _reset_after_fork() -> None:
+    for observer in list(_BUFFERED):
+        observer._after_fork()
+
+
+atexit.register(_flush_buffered)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def telemetry_observer(
+    counter: Any | None = None, *, stats_gauge: Any | None = None, **options: Any
+) -> MetricsObserver:
+    """Return an observer that increments a Counter per action.
+
+    `options` are passed to `MetricsObserver`; the default Counter is created
+    with the configured `labels`.
+    """
 
     if counter is None:
         try:
             from prometheus_client import Counter  # type: ignore
         except ImportError as exc:  # pragma: no cover
             raise RuntimeError("Install prometheus_client or pass an existing counter") from exc
-        counter = Counter("pydatatracker_changes", "Total changes", ["action"])
-    return MetricsObserver(counter)
+        labels = list(options.get("labels", ("action",)))
+        counter = Counter("pydatatracker_changes", "Total changes", labels)
+    return MetricsObserver(counter, stats_gauge=stats_gauge, **options)
+
+
+def _payload_size(change: ChangeLogEntry) -> int:
+    return sum(len(value) for value in change.extra.values() if isinstance(value, str))
@@ -0,0 +1,179 @@
+"""OpenTelemetry span events and batch spans for changes.
+
+`OpenTelemetryObserver` works with any tracer following the OpenTelemetry API.
+The ``opentelemetry-api`` package is only imported when no tracer is given.
+`InMemoryTracer` is a small in-process stand-in that keeps finished spans in a
+list, for tests and for running without an SDK.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from .utils.changelog import ChangeLogEntry
+
+EVENT_NAME = "pydatatracker.change"
+
+
+def change_attributes(change: ChangeLogEntry) -> dict[str, Any]:
+    """Return the span attributes describing a change."""
+
+    location = change.extra.get("location")
+    attributes = {
+        "pydatatracker.action": change.extra.get("action", ""),
+        "pydatatracker.container_type": change.extra.get("type", ""),
+        "pydatatracker.tracked_item_uuid": change.tracked_item_uuid,
+    }
+    if location is not None:
+        attributes["pydatatracker.location"] = str(location)
+    if change.actor:
+        attributes["pydatatracker.actor"] = change.actor
+    return attributes
+
+
+class OpenTelemetryObserver:
+    """Observer adding an event for every change to the current span.
+
+    Events are only built when the current span is recording, so changes made
+    in spans dropped by the tracer's sampler cost a single check. Use `batch` to
+    group the changes of a block of mutations under their own span, which
+    carries the entry count and the count per action when it ends.
+    """
+
+    def __init__(
+        self,
+        tracer: Any | None = None,
+        *,
+        get_current_span: Callable[[], Any] | None = None,
+        record_events: bool = True,
+    ) -> None:
+        """Initialize the observer.
+
+        Args:
+            tracer: A tracer, defaults to ``trace.get_tracer("pydatatracker")``.
+            get_current_span: Returns the active span, defaults to the tracer's
+                own ``get_current_span`` or ``opentelemetry.trace.get_current_span``.
+            record_events: Add an event per change; with False only batch spans
+                and their counts are recorded.
+        """
+
+        if tracer is None or (get_current_span is None and not hasattr(tracer, "get_current_span")):
+            try:
+                from opentelemetry import trace  # type: ignore
+            except ImportError as exc:  # pragma: no cover
+                raise RuntimeError(
+                    "Install opentelemetry-api or pass a tracer and get_current_span"
+                ) from exc
+            tracer = tracer or trace.get_tracer("pydatatracker")
+            get_current_span = get_current_span or trace.get_current_span
+        self.tracer = tracer
+        self.get_current_span = get_current_span or tracer.get_current_span
+        self.record_events = record_events
+        self._batch: ContextVar[Counter[str] | None] = ContextVar(
+            f"pydatatracker_otel_batch_{id(self)}", default=None
+        )
+
+    def __call__(self, change: ChangeLogEntry) -> None:
+        counts = self._batch.get()
+        if counts is not None:
+            counts[change.extra.get("action", "")] += 1
+        if not self.record_events:
+            return
+        span = self.get_current_span()
+        if span.is_recording():
+            span.add_event(EVENT_NAME, change_attributes(change))
+
+    @contextmanager
+    def batch(self, name: str = "pydatatracker.batch", **attributes: Any) -> Iterator[Any]:
+        """Run a block of mutations in a span of its own.
+
+        The span is started through the tracer, so it follows its sampler. When
+        the block ends the span gets ``pydatatracker.entry_count`` and a
+        ``pydatatracker.actions.<action>`` count per action.
+        """
+
+        counts: Counter[str] = Counter()
+        token = self._batch.set(counts)
+        try:
+            with self.tracer.start_as_current_span(name, attributes=attributes) as span:
+                try:
+                    yield span
+                finally:
+                    if span.is_recording():
+                        span.set_attribute("pydatatracker.entry_count", sum(counts.values()))
+                        for action, count in counts.items():
+                            span.set_attribute(f"pydatatracker.actions.{action}", count)
+        finally:
+            self._batch.reset(token)
+
+
+def otel_observer(tracer: Any | None = None, **options: Any) -> OpenTelemetryObserver:
+    """Return an observer adding change events to the current span."""
+
+    return OpenTelemetryObserver(tracer, **options)
+
+
+class InMemorySpan:
+    """Span recorded by `InMemoryTracer`."""
+
+    def __init__(self, name: str, attributes: dict[str, Any], recording: bool) -> None:
+        self.name = name
+        self.attributes = dict(attributes)
+        self.events: list[tuple[str, dict[str, Any]]] = []
+        self._recording = recording
+
+    def is_recording(self) -> bool:
+        return self._recording
+
+    def add_event(self, name: str, attributes: dict[str, Any] | None = None) -> None:
+        if self._recording:
+            self.events.append((name, dict(attributes or {})))
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if self._recording:
+            self.attributes[key] = value
+
+    def __repr__(self) -> str:
+        return f"InMemorySpan({self.name!r}, events={len(self.events)})"
+
+
+_NON_RECORDING = InMemorySpan("", {}, recording=False)
+
+
+class InMemoryTracer:
+    """Minimal tracer keeping finished, sampled spans in `finished_spans`.
+
+    `sampler` decides per span name whether a span records, mirroring how an
+    SDK sampler turns unsampled spans into non-recording ones.
+    """
+
+    def __init__(self, sampler: Callable[[str], bool] | None = None) -> None:
+        self.sampler = sampler
+        self.finished_spans: list[InMemorySpan] = []
+        self._current: ContextVar[InMemorySpan] = ContextVar(
+            f"pydatatracker_inmemory_span_{id(self)}", default=_NON_RECORDING
+        )
+
+    def get_current_span(self) -> InMemorySpan:
+        return self._current.get()
+
+    @contextmanager
+    def start_as_current_span(
+        self, name: str, attributes: dict[str, Any] | None = None
+    ) -> Iterator[InMemorySpan]:
+        recording = self.sampler is None or self.sampler(name)
+        span = InMemorySpan(name, attributes or {}, recording)
+        token = self._current.set(span)
+        try:
+            yield span
+        finally:
+            self._current.reset(token)
+            if recording:
+                self.finished_spans.append(span)
+
+    def clear(self) -> None:
+        self.finished_spans.clear()
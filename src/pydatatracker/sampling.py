@@ -0,0 +1,162 @@
+"""Sampling and rate limiting for change recording."""
+
+from __future__ import annotations
+
+import os
+import random
+import time
+import weakref
+from collections.abc import Hashable
+
+# actions that are recorded no matter what the sampling policy says
+ALWAYS_RECORDED = frozenset({"init", "lock", "unlock", "sampling summary"})
+
+
+class SamplingPolicy:
+    """Configuration deciding which changes a container records.
+
+    A change is recorded only if it passes every configured rule. `init`, `lock`
+    and `unlock` changes are always recorded. Each container gets its own
+    `Sampler` from the policy, so one policy can be shared by a whole tree.
+    """
+
+    def __init__(
+        self,
+        *,
+        every: int = 1,
+        fraction: float = 1.0,
+        max_per_second: int | None = None,
+        summary_interval: float = 60.0,
+        seed: int | None = None,
+    ) -> None:
+        """Initialize the policy.
+
+        Args:
+            every: Record only every Nth change (the first change is recorded).
+            fraction: Probability of recording a change, between 0 and 1.
+            max_per_second: Maximum number of changes recorded per second per
+                container.
+            summary_interval: Minimum number of seconds between summaries of the
+                suppressed changes.
+            seed: Optional seed for the random generator used by `fraction`.
+        """
+
+        if every < 1:
+            raise ValueError("every must be at least 1")
+        if not 0.0 <= fraction <= 1.0:
+            raise ValueError("fraction must be between 0 and 1")
+        if max_per_second is not None and max_per_second < 0:
+            raise ValueError("max_per_second must not be negative")
+        self.every = every
+        self.fraction = fraction
+        self.max_per_second = max_per_second
+        self.summary_interval = summary_interval
+        self.seed = seed
+
+    def new_sampler(self) -> Sampler:
+        """Return fresh per-container sampling state for this policy."""
+
+        return Sampler(self)
+
+    def __repr__(self) -> str:
+        return (
+            f"SamplingPolicy(every={self.every}, fraction={self.fraction}, "
+            f"max_per_second={self.max_per_second})"
+        )
+
+
+class Sampler:
+    """Per-container sampling state created by `SamplingPolicy.new_sampler`."""
+
+    __slots__ = (
+        "policy",
+        "_random",
+        "_seen",
+        "_window_start",
+        "_window_count",
+        "_suppressed",
+        "_last_summary",
+        "__weakref__",
+    )
+
+    def __init__(self, policy: SamplingPolicy) -> None:
+        self.policy = policy
+        self._random = random.Random(policy.seed) if policy.fraction < 1.0 else None
+        self._seen = 0
+        self._window_start = 0.0
+        self._window_count = 0
+        self._suppressed: dict[tuple[str, Hashable], int] = {}
+        self._last_summary = time.monotonic()
+        if self._random is not None and policy.seed is None:
+            _UNSEEDED.add(self)
+
+    def sample(self) -> bool:
+        """Decide whether the next change is recorded, before it is known.
+
+        Only the `every`, `fraction` and `max_per_second` rules are applied, so
+        tracked methods can decide before capturing anything for the change.
+        A change that is not kept must be counted with `suppress` once its
+        action and location are known, unless it is always recorded.
+        """
+
+        policy = self.policy
+        keep = True
+        if policy.every > 1:
+            keep = self._seen % policy.every == 0
+            self._seen += 1
+        if keep and self._random is not None:
+            keep = self._random.random() < policy.fraction
+        if keep and policy.max_per_second is not None:
+            now = time.monotonic()
+            if now - self._window_start >= 1.0:
+                self._window_start = now
+                self._window_count = 0
+            keep = self._window_count < policy.max_per_second
+            if keep:
+                self._window_count += 1
+        return keep
+
+    def suppress(self, action: str, location: Hashable = None) -> None:
+        """Count a change that was not recorded."""
+
+        key = (action, location)
+        self._suppressed[key] = self._suppressed.get(key, 0) + 1
+
+    @property
+    def suppressed(self) -> int:
+        """Total number of changes suppressed since the last summary."""
+
+        return sum(self._suppressed.values())
+
+    def summary_due(self) -> bool:
+        """Return True when suppressed changes should be summarized."""
+
+        return (
+            bool(self._suppressed)
+            and time.monotonic() - self._last_summary >= self.policy.summary_interval
+        )
+
+    def take_summary(self) -> list[dict[str, object]]:
+        """Return and reset the suppressed counts per action and location."""
+
+        summary = [
+            {"action": action, "location": location, "count": count}
+            for (action, location), count in self._suppressed.items()
+        ]
+        self._suppressed = {}
+        self._last_summary = time.monotonic()
+        return summary
+
+
+# samplers drawing from an unseeded generator, reseeded in forked children so
+# that worker processes do not all keep and drop the same changes
+_UNSEEDED: weakref.WeakSet[Sampler] = weakref.WeakSet()
+
+
+def _reseed_after_fork() -> None:
+    for sampler in list(_UNSEEDED):
+        sampler._random.seed()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reseed_after_fork)
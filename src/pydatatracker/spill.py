@@ -0,0 +1,288 @@
+"""Collector spilling older change log entries to memory-mapped segment files."""
+
+from __future__ import annotations
+
+import datetime
+import json
+import mmap
+import struct
+from bisect import bisect_right
+from collections import deque
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from .utils.changelog import ChangeLogEntry
+
+# one index record per entry: byte offset and length in the data file and
+# creation timestamp
+_INDEX = struct.Struct("<qId")
+_PATTERN = "segment-*.jsonl"
+
+
+class _Segment:
+    """An append-only JSONL data file with a fixed-size offset index next to it.
+
+    The data and the index are buffered separately, so after an unclean exit
+    either can hold records the other lacks. Opening a segment drops what is
+    not in both: the index is cut after the last record whose data is complete
+    and the data file is cut at the end of that record.
+    """
+
+    def __init__(self, data_path: Path) -> None:
+        self.data_path = data_path
+        self.index_path = data_path.with_suffix(".idx")
+        self.count = 0
+        self.size = 0
+        self.first_time = self.last_time = 0.0
+        if self.data_path.exists() or self.index_path.exists():
+            self._recover()
+        self._writers: tuple[Any, Any] | None = None
+        self._maps: tuple[mmap.mmap, mmap.mmap] | None = None
+        self._mapped_count = 0
+
+    def _recover(self) -> None:
+        data_size = self.data_path.stat().st_size if self.data_path.exists() else 0
+        self.index_path.touch()
+        with self.index_path.open("r+b") as handle:
+            count = handle.seek(0, 2) // _INDEX.size
+            while count:
+                handle.seek((count - 1) * _INDEX.size)
+                offset, length, self.last_time = _INDEX.unpack(handle.read(_INDEX.size))
+                if offset + length <= data_size:
+                    self.size = offset + length
+                    break
+                count -= 1
+            else:
+                self.last_time = 0.0
+            handle.truncate(count * _INDEX.size)
+            if count:
+                handle.seek(0)
+                self.first_time = _INDEX.unpack(handle.read(_INDEX.size))[2]
+        if data_size != self.size:
+            with self.data_path.open("r+b") as handle:
+                handle.truncate(self.size)
+        self.count = count
+
+    def append(self, payload: bytes, timestamp: float) -> None:
+        if self._writers is None:
+            self._writers = (self.data_path.open("ab"), self.index_path.open("ab"))
+        data, index = self._writers
+        data.write(payload)
+        index.write(_INDEX.pack(self.size, len(payload), timestamp))
+        if not self.count:
+            self.first_time = timestamp
+        self.last_time = timestamp
+        self.size += len(payload)
+        self.count += 1
+
+    def flush(self) -> None:
+        if self._writers is not None:
+            for handle in self._writers:
+                handle.flush()
+
+    def close(self) -> None:
+        if self._writers is not None:
+            for handle in self._writers:
+                handle.close()
+            self._writers = None
+        self._unmap()
+
+    def _unmap(self) -> None:
+        if self._maps is not None:
+            for mapped in self._maps:
+                mapped.close()
+            self._maps = None
+
+    def _mapped(self) -> tuple[mmap.mmap, mmap.mmap]:
+        # the active segment grows, remap it when entries were appended since
+        if self._maps is None or self._mapped_count != self.count:
+            self.flush()
+            self._unmap()
+            with self.data_path.open("rb") as data, self.index_path.open("rb") as index:
+                self._maps = (
+                    mmap.mmap(data.fileno(), 0, access=mmap.ACCESS_READ),
+                    mmap.mmap(index.fileno(), 0, access=mmap.ACCESS_READ),
+                )
+            self._mapped_count = self.count
+        return self._maps
+
+    def timestamp(self, position: int) -> float:
+        return _INDEX.unpack_from(self._mapped()[1], position * _INDEX.size)[2]
+
+    def read(self, position: int) -> ChangeLogEntry:
+        data, index = self._mapped()
+        start, length, _ = _INDEX.unpack_from(index, position * _INDEX.size)
+        return ChangeLogEntry.from_dict(json.loads(data[start : start + length]))
+
+    def bisect(self, timestamp: float) -> int:
+        """Return the position of the first entry created at or after `timestamp`."""
+
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.timestamp(middle) < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+
+class SpillCollector:
+    """Collector keeping a bounded tail in memory and older entries on disk.
+
+    Entries pushed out of the in-memory tail are appended as JSON lines to
+    segment files in `directory`, and a fixed-size index of (offset, length,
+    timestamp) records is written next to each segment. Reads map the segments with `mmap`
+    and use the index, so reading by position is O(1), reading a time range is a
+    binary search, and memory use does not grow with the history on disk.
+    Existing segments in `directory` are picked up again, so the history
+    survives a restart. After an unclean exit, entries that were not completely
+    written are dropped.
+
+    Entries read back from disk are rebuilt with `ChangeLogEntry.from_dict`,
+    their inverse operations are not kept.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        *,
+        memory_capacity: int = 1000,
+        segment_bytes: int = 64 * 1024 * 1024,
+        include_init_events: bool = False,
+    ) -> None:
+        """Initialize the collector.
+
+        Args:
+            directory: Directory holding the segment files, created if needed.
+            memory_capacity: Number of most recent entries kept in memory.
+            segment_bytes: Size after which a new segment file is started.
+            include_init_events: Whether to store container `init` events.
+        """
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.memory_capacity = memory_capacity
+        self.segment_bytes = segment_bytes
+        self.include_init_events = include_init_events
+        self._memory: deque[ChangeLogEntry] = deque()
+        self._segments = [_Segment(path) for path in sorted(self.directory.glob(_PATTERN))]
+        # position of the first entry of each segment
+        self._starts: list[int] = []
+        self._spilled = 0
+        for segment in self._segments:
+            self._starts.append(self._spilled)
+            self._spilled += segment.count
+
+    def __call__(self, change: ChangeLogEntry) -> None:
+        if not self.include_init_events and change.extra.get("action") == "init":
+            return
+        self._memory.append(change)
+        if len(self._memory) > self.memory_capacity:
+            self._spill(self._memory.popleft())
+
+    def _spill(self, change: ChangeLogEntry) -> None:
+        if not self._segments or self._segments[-1].size >= self.segment_bytes:
+            number = 0
+            if self._segments:
+                self._segments[-1].close()
+                number = int(self._segments[-1].data_path.stem.split("-")[1]) + 1
+            self._segments.append(_Segment(self.directory / f"segment-{number:06d}.jsonl"))
+            self._starts.append(self._spilled)
+        payload = (json.dumps(change.to_dict()) + "\n").encode("utf-8")
+        self._segments[-1].append(payload, change.created_time.timestamp())
+        self._spilled += 1
+
+    @property
+    def spilled(self) -> int:
+        """Number of entries stored on disk."""
+
+        return self._spilled
+
+    def __len__(self) -> int:
+        return self._spilled + len(self._memory)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __getitem__(self, position: int) -> ChangeLogEntry:
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("change position out of range")
+        if position >= self._spilled:
+            return self._memory[position - self._spilled]
+        number = bisect_right(self._starts, position) - 1
+        return self._segments[number].read(position - self._starts[number])
+
+    def __iter__(self) -> Iterator[ChangeLogEntry]:
+        for segment in self._segments:
+            for position in range(segment.count):
+                yield segment.read(position)
+        yield from list(self._memory)
+
+    def last(self) -> ChangeLogEntry | None:
+        """Return the most recent collected change."""
+
+        return self[-1] if len(self) else None
+
+    def between(
+        self,
+        since: datetime.datetime | None = None,
+        until: datetime.datetime | None = None,
+    ) -> Iterator[ChangeLogEntry]:
+        """Yield the changes created in a time range, oldest first.
+
+        Args:
+            since: Only changes created at or after this time.
+            until: Only changes created before this time.
+        """
+
+        start = since.timestamp() if since is not None else float("-inf")
+        stop = until.timestamp() if until is not None else float("inf")
+        for segment in self._segments:
+            if not segment.count or segment.last_time < start or segment.first_time >= stop:
+                continue
+            low = segment.bisect(start) if segment.first_time < start else 0
+            high = segment.bisect(stop) if segment.last_time >= stop else segment.count
+            for position in range(low, high):
+                yield segment.read(position)
+        for change in list(self._memory):
+            if start <= change.created_time.timestamp() < stop:
+                yield change
+
+    def flush(self) -> None:
+        """Flush segment files to disk."""
+
+        for segment in self._segments[-1:]:
+            segment.flush()
+
+    def close(self) -> None:
+        """Spill the entries held in memory, then close segment files and maps."""
+
+        while self._memory:
+            self._spill(self._memory.popleft())
+        self._close_segments()
+
+    def _close_segments(self) -> None:
+        for segment in self._segments:
+            segment.close()
+
+    def clear(self) -> None:
+        """Remove all collected entries, including the segment files."""
+
+        self._close_segments()
+        for segment in self._segments:
+            segment.data_path.unlink(missing_ok=True)
+            segment.index_path.unlink(missing_ok=True)
+        self._segments.clear()
+        self._starts.clear()
+        self._spilled = 0
+        self._memory.clear()
+
+    def __enter__(self) -> SpillCollector:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -0,0 +1,238 @@
+"""SQLite-backed change store with indexed queries."""
+
+from __future__ import annotations
+
+import datetime
+import json
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from pathlib import Path
+
+from .exporters import BaseExporter
+from .utils.changelog import ChangeLogEntry
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS changes (
+    id INTEGER PRIMARY KEY,
+    uuid TEXT NOT NULL,
+    tracked_item_uuid TEXT,
+    created_time REAL NOT NULL,
+    action TEXT,
+    actor TEXT,
+    location TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS changes_created_time ON changes (created_time);
+CREATE INDEX IF NOT EXISTS changes_action ON changes (action, created_time);
+CREATE INDEX IF NOT EXISTS changes_actor ON changes (actor, created_time);
+CREATE INDEX IF NOT EXISTS changes_tracked_item ON changes (tracked_item_uuid, created_time);
+CREATE INDEX IF NOT EXISTS changes_location ON changes (location);
+"""
+
+_INSERT = (
+    "INSERT INTO changes (uuid, tracked_item_uuid, created_time, action, actor, location, data)"
+    " VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+class SQLiteChangeStore(BaseExporter):
+    """Observer writing changes into a local SQLite database.
+
+    Changes are buffered and inserted in batches, one transaction per batch, into
+    a database in WAL mode. A batch is written when `batch_size` changes are
+    pending, when a change arrives more than `flush_interval` seconds after the
+    last write, and before every query. Call `close` (or use the store as a
+    context manager) to write the last batch.
+
+    The store can observe containers changed from several threads: one
+    connection is shared, and every write and query holds the store's lock.
+
+    A forked child process opens a connection of its own and starts with no
+    pending changes, the parent still writes the ones it had buffered. The
+    child of a ":memory:" store gets a new, empty database.
+
+    Example:
+        >>> store = SQLiteChangeStore("changes.db")  # doctest: +SKIP
+        >>> tracked.tracking_add_observer(store)  # doctest: +SKIP
+        >>> store.query(location="users:*", actor="admin", since=an_hour_ago)  # doctest: +SKIP
+    """
+
+    def __init__(
+        self,
+        path: str | Path = ":memory:",
+        *,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        include_init_events: bool = False,
+    ) -> None:
+        """Open (and create if needed) the database.
+
+        Args:
+            path: The database file, or ":memory:" for a private in-memory one.
+            batch_size: Number of pending changes that triggers a write.
+            flush_interval: Maximum number of seconds a change stays pending when
+                more changes arrive.
+            include_init_events: Whether to store container `init` events.
+        """
+
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.include_init_events = include_init_events
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._connection = self._connect()
+        # connections inherited through fork, kept open: closing them in the
+        # child could checkpoint or remove the parent's WAL files
+        self._inherited: list[sqlite3.Connection] = []
+        self._pending: list[tuple] = []
+        self._last_flush = time.monotonic()
+        _STORES.add(self)
+
+    def _connect(self) -> sqlite3.Connection:
+        # used by whichever thread records a change, under self._lock
+        connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(_SCHEMA)
+        return connection
+
+    def _after_fork(self) -> None:
+        # another thread of the parent may have held the lock
+        self._lock = threading.RLock()
+        self._inherited.append(self._connection)
+        self._connection = self._connect()
+        self._pending.clear()
+        self._last_flush = time.monotonic()
+
+    def __call__(self, change: ChangeLogEntry) -> None:
+        if not self.include_init_events and change.extra.get("action") == "init":
+            return
+        self._add(change.to_dict(), change.created_time.timestamp())
+
+    def export(self, change_dict: dict[str, object]) -> None:
+        created = datetime.datetime.fromisoformat(str(change_dict["created_time"]))
+        self._add(change_dict, created.timestamp())
+
+    def _add(self, change_dict: dict[str, object], timestamp: float) -> None:
+        extra = change_dict.get("extra") or {}
+        location = extra.get("location")  # type: ignore[union-attr]
+        row = (
+            change_dict["uuid"],
+            change_dict.get("tracked_item_uuid"),
+            timestamp,
+            extra.get("action"),  # type: ignore[union-attr]
+            change_dict.get("actor") or "",
+            None if location is None else str(location),
+            json.dumps(change_dict),
+        )
+        with self._lock:
+            self._pending.append(row)
+            if (
+                len(self._pending) >= self.batch_size
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            ):
+                self.flush()
+
+    def flush(self) -> None:
+        """Insert the pending changes in a single transaction."""
+
+        with self._lock:
+            if self._pending:
+                with self._connection:
+                    self._connection.executemany(_INSERT, self._pending)
+                self._pending.clear()
+            self._last_flush = time.monotonic()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self.flush()
+            return self._connection.execute("SELECT COUNT(*) FROM changes").fetchone()[0]
+
+    def query(
+        self,
+        *,
+        action: str | None = None,
+        actor: str | None = None,
+        tracked_item_uuid: str | None = None,
+        location: str | None = None,
+        since: datetime.datetime | None = None,
+        until: datetime.datetime | None = None,
+        limit: int | None = None,
+    ) -> list[ChangeLogEntry]:
+        """Return the stored changes matching every given criterion, oldest first.
+
+        Args:
+            action: The action of the change, e.g. ``"update"``.
+            actor: The actor recorded on the change.
+            tracked_item_uuid: The uuid of the container the change was recorded by.
+            location: A rendered location, or a glob pattern such as ``users:*``
+                (``*`` matches any characters, delimiters included).
+            since: Only changes created at or after this time.
+            until: Only changes created before this time.
+            limit: Return at most this many (the oldest) changes.
+
+        Returns:
+            The matching changes rebuilt with `ChangeLogEntry.from_dict`.
+        """
+
+        clauses: list[str] = []
+        parameters: list[object] = []
+        for column, value in (
+            ("action", action),
+            ("actor", actor),
+            ("tracked_item_uuid", tracked_item_uuid),
+        ):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                parameters.append(value)
+        if location is not None:
+            clauses.append("location GLOB ?")
+            parameters.append(location)
+        if since is not None:
+            clauses.append("created_time >= ?")
+            parameters.append(since.timestamp())
+        if until is not None:
+            clauses.append("created_time < ?")
+            parameters.append(until.timestamp())
+        sql = "SELECT data FROM changes"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY created_time, id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            parameters.append(limit)
+        with self._lock:
+            self.flush()
+            rows = self._connection.execute(sql, parameters).fetchall()
+        return [ChangeLogEntry.from_dict(json.loads(data)) for (data,) in rows]
+
+    def close(self) -> None:
+        """Write the pending changes and close the database."""
+
+        with self._lock:
+            self.flush()
+            self._connection.close()
+        _STORES.discard(self)
+
+    def __enter__(self) -> SQLiteChangeStore:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+_STORES: weakref.WeakSet[SQLiteChangeStore] = weakref.WeakSet()
+
+
+def _reopen_after_fork() -> None:
+    for store in list(_STORES):
+        store._after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reopen_after_fork)
@@ -0,0 +1,260 @@
+"""Path-pattern subscriptions dispatched through a trie."""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_right
+from collections.abc import Callable, Hashable, Iterable, Sequence
+from typing import Any
+
+from .utils.changelog import ChangeLogEntry
+from .utils.paths import TrackingPath
+
+WILDCARD = "*"
+REST = "**"
+
+# a bracketed index range or the text between two delimiters
+_TOKEN = re.compile(r"\[[^\]]*\]|[^:|.\[]+")
+_RANGE = re.compile(r"^\[(-?\d*):(-?\d*)\]$")
+
+
+def parse_pattern(pattern: str) -> list[Any]:
+    """Split a rendered path pattern into segment matchers.
+
+    ``users:*:email`` becomes ``["users", "*", "email"]``, ``items|[0:10]``
+    becomes ``["items", range(0, 10)]`` and a trailing ``**`` matches any
+    remaining segments. Keys containing a delimiter have to be given as a
+    sequence instead.
+    """
+
+    matchers: list[Any] = []
+    for token in _TOKEN.findall(pattern):
+        found = _RANGE.match(token)
+        if found:
+            start, stop = found.groups()
+            matchers.append(range(int(start or 0), int(stop) if stop else 2**63))
+        else:
+            matchers.append(token)
+    return matchers
+
+
+class Subscription:
+    """Handle returned by `PathSubscriptions.subscribe`."""
+
+    __slots__ = ("pattern", "callback", "prefix", "_node")
+
+    def __init__(self, pattern: tuple, callback: Callable, prefix: bool, node: _Node) -> None:
+        self.pattern = pattern
+        self.callback = callback
+        self.prefix = prefix
+        self._node = node
+
+    def __repr__(self) -> str:
+        return f"Subscription({self.pattern!r}, prefix={self.prefix})"
+
+
+class _Ranges:
+    """The index ranges at one trie position, looked up with a binary search.
+
+    The bounds of all ranges split the indexes into elementary spans, and each
+    span keeps the ranges covering it, so finding the ranges containing an
+    index is one bisect. The spans are rebuilt when a range is added or
+    removed, which is rare compared to lookups.
+    """
+
+    __slots__ = ("nodes", "_bounds", "_covering")
+
+    def __init__(self) -> None:
+        self.nodes: dict[range, _Node] = {}
+        self._bounds: list[int] = []
+        self._covering: list[list[tuple[range, _Node]]] = []
+
+    def __bool__(self) -> bool:
+        return bool(self.nodes)
+
+    def get(self, span: range, parent: _Node) -> _Node:
+        node = self.nodes.get(span)
+        if node is None:
+            node = self.nodes[span] = _Node(parent, span)
+            self._rebuild()
+        return node
+
+    def remove(self, span: range) -> None:
+        del self.nodes[span]
+        self._rebuild()
+
+    def covering(self, index: int) -> list[_Node]:
+        position = bisect_right(self._bounds, index) - 1
+        if position < 0:
+            return []
+        return [node for span, node in self._covering[position] if index in span]
+
+    def _rebuild(self) -> None:
+        starts: dict[int, list[range]] = {}
+        stops: dict[int, list[range]] = {}
+        for span in self.nodes:
+            if span:
+                starts.setdefault(span.start, []).append(span)
+                stops.setdefault(span.stop, []).append(span)
+        # spans covering an index are listed in the order they were added
+        order = {span: position for position, span in enumerate(self.nodes)}
+        self._bounds = sorted(starts.keys() | stops.keys())
+        self._covering = []
+        active: set[range] = set()
+        for bound in self._bounds:
+            active.difference_update(stops.get(bound, ()))
+            active.update(starts.get(bound, ()))
+            spans = sorted(active, key=order.__getitem__)
+            self._covering.append([(span, self.nodes[span]) for span in spans])
+
+
+class _Node:
+    """Trie node for one position in the subscribed patterns."""
+
+    __slots__ = ("parent", "key", "children", "wildcard", "ranges", "exact", "below")
+
+    def __init__(self, parent: _Node | None = None, key: Any = None) -> None:
+        # the node above and the matcher leading here, to prune unused nodes
+        self.parent = parent
+        self.key = key
+        self.children: dict[str, _Node] = {}
+        self.wildcard: _Node | None = None
+        self.ranges = _Ranges()
+        # subscriptions matching paths ending here, and paths at or below here
+        self.exact: list[Subscription] = []
+        self.below: list[Subscription] = []
+
+    def __bool__(self) -> bool:
+        return bool(self.exact or self.below or self.children or self.wildcard or self.ranges)
+
+    def step(self, matcher: Any) -> _Node:
+        if isinstance(matcher, slice):
+            matcher = range(matcher.start or 0, 2**63 if matcher.stop is None else matcher.stop)
+        if isinstance(matcher, range):
+            return self.ranges.get(matcher, self)
+        if matcher == WILDCARD:
+            if self.wildcard is None:
+                self.wildcard = _Node(self, WILDCARD)
+            return self.wildcard
+        key = str(matcher)
+        node = self.children.get(key)
+        if node is None:
+            node = self.children[key] = _Node(self, key)
+        return node
+
+    def prune(self) -> None:
+        """Detach this node and its ancestors as long as they are unused."""
+
+        node: _Node = self
+        while not node and node.parent is not None:
+            parent, key = node.parent, node.key
+            if isinstance(key, range):
+                parent.ranges.remove(key)
+            elif key == WILDCARD:
+                parent.wildcard = None
+            else:
+                del parent.children[key]
+            node = parent
+
+
+class PathSubscriptions:
+    """Observer dispatching changes to callbacks subscribed to path patterns.
+
+    Register one instance as an observer of the root of a tree (or use
+    `TrackBase.tracking_subscribe`, which does it for you). Patterns are matched
+    segment by segment against the raw keys of the change's `TrackingPath`:
+
+    - a literal key or index (compared as strings),
+    - ``*`` for any single segment,
+    - a `range`, a `slice` or ``[start:stop]`` for list indexes in a range,
+    - a trailing ``**`` (or ``prefix=True``) for the whole subtree.
+
+    Dispatch walks the trie once per path segment, so its cost depends on the
+    depth of the changed path and the wildcards along it, not on how many
+    subscriptions are registered. Index ranges are found with a binary search
+    over their bounds, and `unsubscribe` drops the trie nodes left unused.
+    """
+
+    def __init__(self) -> None:
+        self._root = _Node()
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def subscribe(
+        self,
+        pattern: str | Sequence[Hashable | range | slice],
+        callback: Callable[[ChangeLogEntry], Any],
+        *,
+        prefix: bool = False,
+    ) -> Subscription:
+        """Call `callback` for every change whose location matches `pattern`.
+
+        Args:
+            pattern: A rendered pattern such as ``users:*:email`` or a sequence
+                of matchers.
+            callback: The observer to call with matching change log entries.
+            prefix: Also match every location below the pattern.
+
+        Returns:
+            A handle for `unsubscribe`.
+        """
+
+        matchers = parse_pattern(pattern) if isinstance(pattern, str) else list(pattern)
+        if matchers and matchers[-1] == REST:
+            matchers.pop()
+            prefix = True
+        if REST in matchers:
+            raise ValueError("'**' is only supported at the end of a pattern")
+        node = self._root
+        for matcher in matchers:
+            node = node.step(matcher)
+        subscription = Subscription(tuple(matchers), callback, prefix, node)
+        (node.below if prefix else node.exact).append(subscription)
+        self._count += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a subscription returned by `subscribe`."""
+
+        node = subscription._node
+        target = node.below if subscription.prefix else node.exact
+        target.remove(subscription)
+        node.prune()
+        self._count -= 1
+
+    def match(self, location: TrackingPath | Hashable | None) -> list[Subscription]:
+        """Return the subscriptions matching a location."""
+
+        if location is None:
+            keys: Iterable[Any] = ()
+        elif isinstance(location, TrackingPath):
+            keys = location.keys
+        else:
+            keys = (location,)
+        matched: list[Subscription] = []
+        active = [self._root]
+        for key in keys:
+            text = str(key)
+            next_active: list[_Node] = []
+            for node in active:
+                matched.extend(node.below)
+                child = node.children.get(text)
+                if child is not None:
+                    next_active.append(child)
+                if node.wildcard is not None:
+                    next_active.append(node.wildcard)
+                if node.ranges and isinstance(key, int) and not isinstance(key, bool):
+                    next_active.extend(node.ranges.covering(key))
+            active = next_active
+            if not active:
+                return matched
+        for node in active:
+            matched.extend(node.below)
+            matched.extend(node.exact)
+        return matched
+
+    def __call__(self, change: ChangeLogEntry) -> None:
+        for subscription in self.match(change.extra.get("location")):
+            subscription.callback(change)
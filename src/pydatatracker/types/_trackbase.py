@@ -42,25 +42,104 @@ Classes:
 """
 
 # Standard Library
+import atexit
 import datetime
 import logging
-from collections.abc import Callable
+import math
+import threading
+import time
+import weakref
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
 from functools import wraps
-from typing import Any, Literal
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Literal
 from uuid import uuid4
 
 # 3rd Party
 # Project
-from ..utils.changelog import ChangeLogEntry
+from ..instrumentation import STATS
+from ..sampling import ALWAYS_RECORDED
+from ..utils.changelog import ChangeInverse, ChangeLogEntry
+from ..utils.paths import KEY, TrackingPath
 from .actor import current_actor
 
+if TYPE_CHECKING:
+    from ..observer_policy import ObserverPolicy
+    from ..sampling import Sampler
+    from ..subscriptions import PathSubscriptions, Subscription
+
+# uuid of the change being reverted while an inverse operation is applied
+_tracking_reverting: ContextVar[str | None] = ContextVar("_tracking_reverting", default=None)
+# context of the innermost tracked call, per thread and task, see TrackBase._tracking_context
+_tracking_call_context: ContextVar[dict[str, Any] | None] = ContextVar(
+    "_tracking_call_context", default=None
+)
+# instances with an open coalescing window, by uuid
+_tracking_coalescing: dict[str, "TrackBase"] = {}
+# instances with changes suppressed by sampling since their last summary, by uuid
+_tracking_sampling_pending: weakref.WeakValueDictionary[str, "TrackBase"] = (
+    weakref.WeakValueDictionary()
+)
+
+
+def _flush_expired_coalesced() -> None:
+    """Record the coalescing windows of every instance that expired by now.
+
+    Called whenever a change is created and whenever a history is read, so the
+    last update to an idle location is recorded (and reaches observers) once its
+    window is over even if that location is never changed again. An instance
+    that is busy in another thread (its `tracking_thread_safe` lock is held)
+    is skipped and flushes its own windows with its next change.
+    """
+    if not _tracking_coalescing:
+        return
+    now = time.monotonic()
+    for item in list(_tracking_coalescing.values()):
+        if item._tracking_coalesce_deadline > now:
+            continue
+        mutex = item._tracking_mutex
+        if mutex is None:
+            item._tracking_flush_coalesced(now)
+        elif mutex.acquire(blocking=False):
+            try:
+                item._tracking_flush_coalesced(now)
+            finally:
+                mutex.release()
+
+
+def _flush_sampling_summaries() -> None:
+    """Record the sampling summary of every instance with suppressed changes.
+
+    Registered to run at interpreter exit, so changes suppressed since the last
+    summary are still reported. Instances busy in another thread are skipped.
+    """
+    for item in list(_tracking_sampling_pending.values()):
+        mutex = item._tracking_mutex
+        if mutex is None:
+            item.tracking_flush_sampling_summary()
+        elif mutex.acquire(blocking=False):
+            try:
+                item.tracking_flush_sampling_summary()
+            finally:
+                mutex.release()
+
+
+atexit.register(_flush_sampling_summaries)
+
+
+def _call_observer(observer: Callable[..., Any], change_log_entry: ChangeLogEntry) -> None:
+    observer(change_log_entry)
+
 
 def check_lock(method: Callable[..., Any]) -> Callable[..., Any]:
     """Ensure methods are not called on locked objects.
 
     This decorator wraps a method to check if the instance is locked before
     executing the method. If the instance is locked, it raises a RuntimeError,
-    preventing any modifications to the object.
+    preventing any modifications to the object. Tracked container mutators use
+    `tracked_mutator`, which folds this check into the change tracking wrapper.
 
     Args:
         method: The method to be decorated for lock checking.
@@ -87,28 +166,34 @@ def check_lock(method: Callable[..., Any]) -> Callable[..., Any]:
             The result of the method if the instance is not locked.
 
         """
-        if hasattr(self, "_tracking_locked") and self._tracking_locked:
+        if self._tracking_locked:
             raise RuntimeError(f"{self.__class__.__name__} is locked and cannot be modified.")
         return method(self, *args, **kwargs)
 
     return wrapper
 
 
-def track_changes(method: Callable[..., Any]) -> Callable[..., Any]:
-    """Track changes made to an object.
+def _build_tracked_wrapper(
+    method: Callable[..., Any],
+    lock_check: bool,
+    passthrough: Callable[..., Any] | None,
+) -> Callable[..., Any]:
+    """Generate the single wrapper used for a tracked method.
 
-    This decorator wraps a method to monitor changes to the object.
-    It resets the tracking context, captures the state before and after
-    the method execution, and logs any changes, including removed items and
-    updates to tracked objects.
+    Lock checking, the fast path and change tracking all live in one function so
+    a tracked mutation only pays for one extra Python call layer.
 
     Args:
         method: The method to be decorated for change tracking.
+        lock_check: Whether to raise a RuntimeError when the instance is locked.
+        passthrough: The untracked equivalent of the method, called directly when
+            the instance is on the fast path. None disables the fast path.
 
     Returns:
-        The wrapped method that includes change tracking functionality.
+        The wrapped method.
 
     """
+    method_name = method.__name__
 
     @wraps(method)
     def wrapper(self, *args, **kwargs) -> Any:
@@ -127,43 +212,121 @@ def track_changes(method: Callable[..., Any]) -> Callable[..., Any]:
         Returns:
             The result of the method execution.
 
+        Raises:
+            RuntimeError: If lock checking is enabled and the instance is locked.
+
         """
-        # reset the tracking context
-        data_pre_change = None
-        if self._tracking_capture_snapshots and self._tracking_is_trackable(self) in [
-            "TrackedDict",
-            "TrackedList",
-        ]:
-            data_pre_change = repr(self)
+        if lock_check and self._tracking_locked:
+            raise RuntimeError(f"{self.__class__.__name__} is locked and cannot be modified.")
+        if passthrough is not None and self._tracking_fast_path:
+            return passthrough(self, *args, **kwargs)
+        mutex = self._tracking_mutex
+        if mutex is not None:
+            mutex.acquire()
+        try:
+            self._tracking_release_views()
+
+            # decide on sampling before anything is captured for the change
+            sampler = self._tracking_sampler
+            sampled = sampler is None or _tracking_reverting.get() is not None or sampler.sample()
+            data_pre_change = None
+            snapshots = (
+                sampled
+                and self._tracking_capture_snapshots
+                and (self._tracking_is_trackable(self) in ("TrackedDict", "TrackedList"))
+            )
+            if snapshots:
+                data_pre_change = repr(self)
+
+            # a fresh context for this call only, so calls in other threads or
+            # nested calls cannot overwrite it
+            context: dict[str, Any] = {}
+            token = _tracking_call_context.set(context)
+            try:
+                # Call the original method
+                result = method(self, *args, **kwargs)
+            finally:
+                _tracking_call_context.reset(token)
+
+            # Check if the method recorded an action in the tracking context
+            if "action" in context:
+                if "removed_items" in context:
+                    for olditem in context["removed_items"]:
+                        if self._tracking_is_trackable(olditem):
+                            if olditem._tracking_uuid in self._tracking_child_tracked_items:
+                                del self._tracking_child_tracked_items[olditem._tracking_uuid]
+                            if olditem._tracking_parent_item is self:
+                                olditem._tracking_parent_item = None
+                            olditem.tracking_remove_observer(self._tracking_notify_observers)
+                    self._tracking_refresh_fast_path()
+
+                if not sampled and context["action"] not in ALWAYS_RECORDED:
+                    self._tracking_suppress_change(context["action"], context.get("location"))
+                    return result
+                if snapshots:
+                    data_post_change = repr(self)
+                    context["data_pre_change"] = data_pre_change
+                    context["data_post_change"] = data_post_change
+                    if STATS.enabled:
+                        STATS.snapshot_bytes += len(data_pre_change) + len(data_post_change)
+                context["method"] = method_name
+                self._tracking_create_change(context)
+
+            return result
+        finally:
+            if mutex is not None:
+                mutex.release()
+
+    return wrapper
 
-        self._tracking_context = {}
 
-        # Call the original method
-        result = method(self, *args, **kwargs)
+def track_changes(method: Callable[..., Any]) -> Callable[..., Any]:
+    """Track changes made to an object.
 
-        # Check if the object has a tracking_context attribute (for tracking changes)
-        if self._tracking_context and "action" in self._tracking_context:
-            if "removed_items" in self._tracking_context:
-                for olditem in self._tracking_context["removed_items"]:
-                    if self._tracking_is_trackable(olditem):
-                        if olditem._tracking_uuid in self._tracking_child_tracked_items:
-                            del self._tracking_child_tracked_items[olditem._tracking_uuid]
-                        olditem.tracking_remove_observer(self._tracking_notify_observers)
+    This decorator wraps a method to monitor changes to the object.
+    It resets the tracking context, captures the state before and after
+    the method execution, and logs any changes, including removed items and
+    updates to tracked objects.
 
-            if self._tracking_capture_snapshots and self._tracking_is_trackable(self) in [
-                "TrackedDict",
-                "TrackedList",
-            ]:
-                self._tracking_context["data_pre_change"] = data_pre_change
-                self._tracking_context["data_post_change"] = repr(self)
-            self._tracking_context["method"] = method.__name__
-            self.tracking_create_change(**self._tracking_context)
+    Args:
+        method: The method to be decorated for change tracking.
 
-        self._tracking_context = {}
+    Returns:
+        The wrapped method that includes change tracking functionality.
 
-        return result
+    """
+    return _build_tracked_wrapper(method, lock_check=False, passthrough=None)
 
-    return wrapper
+
+def tracked_mutator(
+    passthrough: Callable[..., Any] | None = None,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Combine lock checking and change tracking for a mutating method.
+
+    This decorator replaces stacking `check_lock` and `track_changes`. When the
+    instance is on the fast path (nobody observes it, it keeps no history, and
+    snapshots and automatic conversion are off) the `passthrough` callable, such
+    as `dict.__setitem__`, is called directly and no change is recorded.
+
+    Args:
+        passthrough: The untracked equivalent of the decorated method. It must
+            accept the same arguments and behave the same way apart from
+            tracking. None disables the fast path for the method.
+
+    Returns:
+        A decorator that wraps a method with lock checking and change tracking.
+
+    Example:
+        >>> class Example(TrackBase, dict):
+        ...     @tracked_mutator(dict.__setitem__)
+        ...     def __setitem__(self, key, value): ...
+
+    """
+
+    def decorator(method: Callable[..., Any]) -> Callable[..., Any]:
+        return _build_tracked_wrapper(method, lock_check=True, passthrough=passthrough)
+
+    return decorator
 
 
 class TrackBase:
@@ -177,6 +340,37 @@ class TrackBase:
 
     """
 
+    # class level defaults so hot paths can read these without hasattr checks,
+    # tracked methods may run before __init__ has finished
+    _tracking_locked = False
+    _tracking_fast_path = False
+    _tracking_parent_item: "TrackBase | None" = None
+    _tracking_view_ref: "weakref.ref | None" = None
+    _tracking_sampler: "Sampler | None" = None
+    _tracking_observer_policy: "ObserverPolicy | None" = None
+    _tracking_mutex: "threading.RLock | None" = None
+    _tracking_initializing = False
+    _tracking_subscriptions: "PathSubscriptions | None" = None
+    # kind of the path segments naming the items of this container
+    _tracking_path_kind = KEY
+
+    # options that children inherit from their parent unless given explicitly
+    _tracking_inherited_options: dict[str, Any] = {
+        "tracking_capture_snapshots": False,
+        "tracking_capture_stack": False,
+        "tracking_record_history": True,
+        "tracking_stack_sample_rate": 1,
+        "tracking_sampling": None,
+        "tracking_coalesce_window": 0.0,
+        "tracking_observer_policy": None,
+        "tracking_thread_safe": False,
+    }
+
+    # methods whose "update" changes can be merged by the coalescing window, and
+    # the keys of a merged change that keep the value of the first update
+    _tracking_coalesce_methods = frozenset({"__setitem__", "__setattr__", "__set__"})
+    _tracking_coalesce_first_keys = ("old_value", "data_pre_change", "inverse")
+
     def __init__(
         self,
         tracking_name: str | None = None,
@@ -204,6 +398,16 @@ class TrackBase:
             tracking_location: The location of the tracked attribute.
             tracking_delimiter: The delimiter used for tracking attribute locations.
             **kwargs: Additional keyword arguments for further customization.
+                The inheritable options (`tracking_capture_snapshots`,
+                `tracking_capture_stack`, `tracking_record_history`,
+                `tracking_stack_sample_rate`, `tracking_sampling`,
+                `tracking_coalesce_window`, `tracking_observer_policy`,
+                `tracking_thread_safe`) fall back to the parent's setting and
+                then to the class default when missing or None. A
+                `tracking_sampling` policy is shared with children, but every
+                instance samples with its own counters. With
+                `tracking_thread_safe` every instance gets a lock of its own,
+                also held while it records a change propagated from a child.
 
         Returns:
             None
@@ -213,32 +417,158 @@ class TrackBase:
         self._tracking_auto_converted_in = tracking_auto_converted_in
         self._tracking_uuid = uuid4().hex
         self._tracking_observers = {}
-        self._tracking_context = {}
         self._tracking_changes: list[ChangeLogEntry] = []
+        self._tracking_undo_stack: list[ChangeLogEntry] = []
+        # changes made while constructing (value conversion) cannot be undone
+        self._tracking_initializing = True
         self._tracking_locked = False
         self._tracking_auto_convert = tracking_auto_convert
         self._tracking_created = datetime.datetime.now()
         self._tracking_child_tracked_items = {}
         self._tracking_delimiter = tracking_delimiter
         self._tracking_debug_flag = False
-        self._tracking_capture_snapshots = kwargs.get("tracking_capture_snapshots", False)
-        self._tracking_capture_stack = kwargs.get("tracking_capture_stack", False)
-        if tracking_parent:
-            self._tracking_capture_snapshots = getattr(
-                tracking_parent, "_tracking_capture_snapshots", False
-            )
-            self._tracking_capture_stack = getattr(
-                tracking_parent, "_tracking_capture_stack", False
-            )
-        if "tracking_capture_snapshots" in kwargs:
-            self._tracking_capture_snapshots = kwargs["tracking_capture_snapshots"]
-        if "tracking_capture_stack" in kwargs:
-            self._tracking_capture_stack = kwargs["tracking_capture_stack"]
+        self._tracking_stack_sample_counter = 0
+        self._tracking_coalesce_pending: dict[Any, list] = {}
+        self._tracking_coalesce_deadline = math.inf
+        for option, default in self._tracking_inherited_options.items():
+            value = kwargs.get(option)
+            if value is None and tracking_parent:
+                value = getattr(tracking_parent, f"_{option}", None)
+            setattr(self, f"_{option}", default if value is None else value)
+        self._tracking_sampler = (
+            self._tracking_sampling.new_sampler() if self._tracking_sampling is not None else None
+        )
+        if self._tracking_thread_safe:
+            self._tracking_mutex = threading.RLock()
         if tracking_parent:
             tracking_parent._tracking_add_child_tracked_item(tracking_location, self)
 
         self.tracking_create_change(action="init", init_data=f"{self}")
         self._tracking_convert_all_values()
+        self._tracking_initializing = False
+        self._tracking_refresh_fast_path()
+
+    @property
+    def _tracking_context(self) -> dict[str, Any]:
+        """Return the context of the tracked method running in this thread.
+
+        Tracked methods describe their change by filling this dict. Every call
+        of a tracked method gets a new context, held in a context variable
+        rather than on the instance, so concurrent calls from other threads
+        (or asyncio tasks) and nested tracked calls each fill their own.
+
+        Returns:
+            The context of the innermost tracked call, or an empty throwaway dict
+            outside of a tracked call.
+
+        """
+        context = _tracking_call_context.get()
+        return {} if context is None else context
+
+    def _tracking_refresh_fast_path(self) -> None:
+        """Recompute whether tracked methods can skip change tracking.
+
+        The fast path is only taken when nothing could observe a change: there
+        are no observers (a parent counts as one), no tracked children, the
+        instance keeps no history of its own, and snapshots and automatic
+        conversion are off. It must be refreshed whenever one of those inputs
+        changes.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        self._tracking_fast_path = not (
+            self._tracking_record_history
+            or self._tracking_capture_snapshots
+            or self._tracking_auto_convert
+            or self._tracking_child_tracked_items
+            or self._tracking_view_ref is not None
+            or any(self._tracking_observers.values())
+        )
+
+    def tracking_view(self) -> Any:
+        """Return a read-only view that shares storage with this container.
+
+        Creating a view is O(1). The view reads straight from the live container
+        until the container, or a tracked container below it, is about to be
+        modified. At that point the view copies only the levels on the path to
+        the change and keeps showing the data as it was when the view was
+        created. Views do not record any changes.
+
+        Args:
+            None
+
+        Returns:
+            A `TrackedMappingView` for dictionaries or a `TrackedSequenceView`
+            for lists.
+
+        Example:
+            >>> state = TrackedDict({"users": {"alice": 1}}, tracking_auto_convert=True)
+            >>> view = state.tracking_view()
+            >>> state["users"]["alice"] = 2
+            >>> view["users"]["alice"]
+            1
+
+        """
+        view = self._tracking_view_ref() if self._tracking_view_ref is not None else None
+        if view is None:
+            view = self._tracking_new_view()
+            self._tracking_view_ref = weakref.ref(view)
+            self._tracking_fast_path = False
+        return view
+
+    def _tracking_new_view(self) -> Any:
+        """Create a new read-only view of this instance.
+
+        This method should be overridden in any subclass that supports views.
+
+        Args:
+            None
+
+        Returns:
+            The new view.
+
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} does not support views")
+
+    def _tracking_release_views(self) -> None:
+        """Let outstanding views copy their data before a modification.
+
+        This method walks from this instance up through its parents. If any of
+        them has an outstanding view, the views are materialized from the top
+        down, so a parent view can hand out child views that are materialized
+        in turn before the change happens.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        node: TrackBase | None = self
+        while node is not None and node._tracking_view_ref is None:
+            node = node._tracking_parent_item
+        if node is None:
+            return
+
+        chain: list[TrackBase] = []
+        node = self
+        while node is not None:
+            chain.append(node)
+            node = node._tracking_parent_item
+        for node in reversed(chain):
+            if node._tracking_view_ref is None:
+                continue
+            view = node._tracking_view_ref()
+            node._tracking_view_ref = None
+            if view is not None:
+                view._tracking_materialize()
+            node._tracking_refresh_fast_path()
 
     def _tracking_convert_value(self, value: Any, location: Any = "") -> Any:
         """Convert a value to a trackable type if automatic conversion is enabled.
@@ -252,6 +582,9 @@ class TrackBase:
             value: The value to be converted to a trackable type.
             location: An optional string indicating the location of the value.
 
+        A tracked child put back by an undo was detached from this instance when
+        it was removed, so it is registered as a child again.
+
         Returns:
             The converted trackable value, or the original value if no conversion
                 is performed.
@@ -265,6 +598,12 @@ class TrackBase:
                 tracking_parent=self,
                 tracking_location=location,
             )
+        if (
+            _tracking_reverting.get() is not None
+            and isinstance(value, TrackBase)
+            and value._tracking_parent_item is None
+        ):
+            self._tracking_add_child_tracked_item(location, value)
         return value
 
     def _tracking_debug(self, message: str) -> None:
@@ -291,8 +630,8 @@ class TrackBase:
 
         This method registers a specified child tracked item within the tracking
         structure, allowing it to be monitored for changes. It also ensures that
-        the child item inherits the lock state of the parent and adds the parent
-        as an observer to the child item.
+        the child item and its own children silently inherit the lock state of
+        the parent and adds the parent as an observer to the child item.
 
         Args:
             location: The location of the child item within the tracking structure.
@@ -306,11 +645,10 @@ class TrackBase:
             "location": location,
             "item": trackable_item,
         }
-        if self._tracking_locked:
-            trackable_item.lock()
-        else:
-            trackable_item.unlock()
+        trackable_item._tracking_parent_item = self
+        trackable_item._tracking_set_subtree_locked(self._tracking_locked)
         trackable_item.tracking_add_observer(self._tracking_notify_observers)
+        self._tracking_refresh_fast_path()
 
     def _tracking_remove_child_tracked_item(self, trackable_item: "TrackBase") -> None:
         """Remove a child tracked item from the current instance.
@@ -328,7 +666,10 @@ class TrackBase:
 
         """
         self._tracking_child_tracked_items.pop(trackable_item._tracking_uuid, None)
+        if trackable_item._tracking_parent_item is self:
+            trackable_item._tracking_parent_item = None
         trackable_item.tracking_remove_observer(self._tracking_notify_observers)
+        self._tracking_refresh_fast_path()
 
     def _tracking_convert_all_values(self) -> None:
         """Convert all values of the instance to trackable types.
@@ -370,6 +711,48 @@ class TrackBase:
             and observer != self._tracking_notify_observers
         ):
             self._tracking_observers[priority].append(observer)
+        self._tracking_refresh_fast_path()
+
+    def tracking_subscribe(
+        self, pattern: Any, callback: Callable, *, prefix: bool = False
+    ) -> "Subscription":
+        """Call `callback` for changes whose location matches a path pattern.
+
+        The first subscription registers a `PathSubscriptions` trie as an
+        observer of this instance, every later subscription is added to the same
+        trie, so a change is dispatched in time proportional to the depth of its
+        path no matter how many subscriptions exist.
+
+        Args:
+            pattern: A pattern relative to this instance, such as
+                ``users:*:email``, ``items|[0:10]`` or ``users:**``, or a
+                sequence of matchers, see `PathSubscriptions`.
+            callback: The observer to call with matching change log entries.
+            prefix: Also match every location below the pattern.
+
+        Returns:
+            A handle to pass to `tracking_unsubscribe`.
+
+        """
+        if self._tracking_subscriptions is None:
+            from ..subscriptions import PathSubscriptions
+
+            self._tracking_subscriptions = PathSubscriptions()
+            self.tracking_add_observer(self._tracking_subscriptions)
+        return self._tracking_subscriptions.subscribe(pattern, callback, prefix=prefix)
+
+    def tracking_unsubscribe(self, subscription: "Subscription") -> None:
+        """Remove a subscription created by `tracking_subscribe`.
+
+        Args:
+            subscription: The handle returned by `tracking_subscribe`.
+
+        Returns:
+            None
+
+        """
+        if self._tracking_subscriptions is not None:
+            self._tracking_subscriptions.unsubscribe(subscription)
 
     def tracking_remove_observer(self, observer: Callable) -> None:
         """Remove an observer from the list of observers for tracking changes.
@@ -388,6 +771,22 @@ class TrackBase:
         for priority in self._tracking_observers:
             if observer in self._tracking_observers[priority]:
                 self._tracking_observers[priority].remove(observer)
+        self._tracking_refresh_fast_path()
+
+    def _tracking_flush_before_read(self) -> None:
+        """Record buffered changes before the history of this instance is read.
+
+        Expired coalescing windows of every instance and the sampling summary
+        of this instance are recorded, so the history accounts for every change.
+
+        Returns:
+            None
+
+        """
+        _flush_expired_coalesced()
+        if self._tracking_sampler is not None:
+            with self._tracking_mutex or nullcontext():
+                self.tracking_flush_sampling_summary()
 
     def tracking_changes(self, most_recent: int | None = None) -> list[ChangeLogEntry]:
         """Return a copy of the recorded change log entries.
@@ -399,14 +798,136 @@ class TrackBase:
             A list containing copies of the tracked change log entries.
 
         """
+        self._tracking_flush_before_read()
         if most_recent is None or most_recent >= len(self._tracking_changes):
             return list(self._tracking_changes)
         if most_recent <= 0:
             return []
         return list(self._tracking_changes[-most_recent:])
 
+    def tracking_undo(self, count: int = 1) -> list[ChangeLogEntry]:
+        """Revert the most recent changes by applying their inverse operations.
+
+        Changes made to this instance and to tracked items below it are reverted
+        newest first. Every inverse operation is applied through the normal
+        tracked methods, so it is recorded as a change with a "reverts" entry
+        naming the reverted change, notifies observers and cannot be undone
+        itself. The cost is proportional to the number of changes reverted.
+
+        Args:
+            count: The number of changes to revert.
+
+        Returns:
+            The reverted change log entries, newest first.
+
+        Raises:
+            RuntimeError: If an item that has to be modified is locked.
+
+        """
+        reverted: list[ChangeLogEntry] = []
+        stack = self._tracking_undo_stack
+        self.tracking_flush_coalesced()
+        while stack and len(reverted) < count:
+            entry = stack.pop()
+            if entry.inverse.reverted:
+                continue
+            self._tracking_revert(entry)
+            reverted.append(entry)
+        return reverted
+
+    def tracking_savepoint(self) -> int:
+        """Return a savepoint to pass to `tracking_rollback_to`.
+
+        Savepoints are positions in the undo stack, so a savepoint stops being
+        useful once `tracking_undo` reverts changes made before it.
+
+        Returns:
+            The savepoint.
+
+        """
+        self.tracking_flush_coalesced()
+        return len(self._tracking_undo_stack)
+
+    def tracking_rollback_to(
+        self, target: ChangeLogEntry | datetime.datetime | int
+    ) -> list[ChangeLogEntry]:
+        """Revert every change made after a change, a time or a savepoint.
+
+        Args:
+            target: A change log entry (the state right after that change is
+                restored), a timezone aware datetime or a savepoint returned by
+                `tracking_savepoint`.
+
+        Returns:
+            The reverted change log entries, newest first.
+
+        Raises:
+            RuntimeError: If an item that has to be modified is locked.
+
+        """
+        stack = self._tracking_undo_stack
+        self.tracking_flush_coalesced()
+        if isinstance(target, ChangeLogEntry):
+            inverse, threshold = target.inverse, target.created_time
+
+            def done() -> bool:
+                top = stack[-1]
+                if inverse is not None:
+                    return top.inverse is inverse
+                return top.created_time <= threshold
+
+        elif isinstance(target, datetime.datetime):
+
+            def done() -> bool:
+                return stack[-1].created_time <= target
+
+        else:
+
+            def done() -> bool:
+                return len(stack) <= target
+
+        reverted: list[ChangeLogEntry] = []
+        while stack and not done():
+            entry = stack.pop()
+            if not entry.inverse.reverted:
+                self._tracking_revert(entry)
+                reverted.append(entry)
+        return reverted
+
+    @contextmanager
+    def tracking_transaction(self) -> Iterator[int]:
+        """Revert every change made in the block if it raises an exception.
+
+        Yields:
+            The savepoint taken when the block started.
+
+        """
+        savepoint = self.tracking_savepoint()
+        try:
+            yield savepoint
+        except BaseException:
+            self.tracking_rollback_to(savepoint)
+            raise
+
+    def _tracking_revert(self, entry: ChangeLogEntry) -> None:
+        """Apply the inverse operation of a change.
+
+        Args:
+            entry: The change log entry to revert.
+
+        Returns:
+            None
+
+        """
+        token = _tracking_reverting.set(entry.uuid)
+        try:
+            entry.inverse.apply()
+        finally:
+            _tracking_reverting.reset(token)
+
     def last_change(self) -> ChangeLogEntry | None:
         """Return the most recent change or None if no changes exist."""
+        self._tracking_flush_before_read()
         return self._tracking_changes[-1] if self._tracking_changes else None
 
     def changes_since(
@@ -422,11 +943,35 @@ class TrackBase:
             A list of changes ordered chronologically.
 
         """
+        self._tracking_flush_before_read()
         if since is None:
             return list(self._tracking_changes)
         threshold = since.created_time if isinstance(since, ChangeLogEntry) else since
         return [entry for entry in self._tracking_changes if entry.created_time >= threshold]
 
+    def _tracking_append_change(self, change_log_entry: ChangeLogEntry) -> None:
+        """Add a change log entry to the history of this instance.
+
+        Entries created by this instance are appended before observers are
+        notified, so only the tail of the history has to be checked to avoid
+        storing the same entry twice. Nothing is stored when the instance was
+        created with `tracking_record_history=False`. Entries that can be
+        reverted are also pushed on the undo stack.
+
+        Args:
+            change_log_entry: The change log entry to store.
+
+        Returns:
+            None
+
+        """
+        if self._tracking_record_history and (
+            not self._tracking_changes or self._tracking_changes[-1] is not change_log_entry
+        ):
+            self._tracking_changes.append(change_log_entry)
+            if change_log_entry.inverse is not None:
+                self._tracking_undo_stack.append(change_log_entry)
+
     def _tracking_notify_observers(self, change_log_entry: ChangeLogEntry) -> None:
         """Notify all observers of changes to a tracked object.
 
@@ -443,9 +988,20 @@ class TrackBase:
 
         """
         priorities = sorted(self._tracking_observers.keys())
+        policy = self._tracking_observer_policy
+        if policy is None and not STATS.enabled:
+            for priority in priorities:
+                for observer in self._tracking_observers[priority]:
+                    observer(change_log_entry)
+            return
+        call = STATS.call_observer if STATS.enabled else _call_observer
         for priority in priorities:
-            for observer in self._tracking_observers[priority]:
-                observer(change_log_entry)
+            for observer in list(self._tracking_observers[priority]):
+                # propagation to a parent container is not subject to the policy
+                if policy is None or isinstance(getattr(observer, "__self__", None), TrackBase):
+                    call(observer, change_log_entry)
+                elif not policy.dispatch(observer, change_log_entry, call):
+                    self.tracking_remove_observer(observer)
 
     def tracking_create_change(self, **kwargs) -> None:
         """Create a change log entry for the tracked object.
@@ -456,6 +1012,14 @@ class TrackBase:
         change log entry is then added to the list of tracked changes and observers
         are notified.
 
+        When a sampling policy is set, the decision to record the change is made
+        before anything is allocated for it; tracked methods make it before they
+        capture snapshots. Suppressed changes are counted per action and location
+        and reported in a "sampling summary" change once `summary_interval` has
+        passed, when the history is read, or at interpreter exit. When a
+        coalescing window is set, updates are buffered per location and merged
+        by `_tracking_coalesce_change`.
+
         Args:
             **kwargs: Additional keyword arguments to include in the change log entry.
 
@@ -463,22 +1027,251 @@ class TrackBase:
             None
 
         """
+        sampler = self._tracking_sampler
+        if (
+            sampler is not None
+            and kwargs.get("action") not in ALWAYS_RECORDED
+            and _tracking_reverting.get() is None
+            and not sampler.sample()
+        ):
+            self._tracking_suppress_change(kwargs.get("action"), kwargs.get("location"))
+            return
+        self._tracking_create_change(kwargs)
+
+    def _tracking_create_change(self, kwargs: dict[str, Any]) -> None:
+        """Create the change log entry for a change that passed sampling.
+
+        Tracked methods decide on sampling before calling the method and call
+        this directly, the public `tracking_create_change` decides first.
+
+        Args:
+            kwargs: The keyword arguments of the change.
+
+        Returns:
+            None
+
+        """
+        _flush_expired_coalesced()
+        reverting = _tracking_reverting.get()
+        sampler = self._tracking_sampler
+        if sampler is not None and reverting is None and sampler.summary_due():
+            self.tracking_flush_sampling_summary()
         if "locked" not in kwargs:
             kwargs["locked"] = self._tracking_locked
         if "type" not in kwargs:
             kwargs["type"] = self._tracking_is_trackable(self)
         if "actor" not in kwargs:
             kwargs["actor"] = current_actor.get()
+        if reverting is not None:
+            # changes made while reverting are recorded as is and cannot be undone
+            kwargs.pop("inverse", None)
+            kwargs["reverts"] = reverting
+        elif self._tracking_coalesce_window > 0 and not self._tracking_coalesce_change(kwargs):
+            return
+        self._tracking_record_change(kwargs)
+
+    def _tracking_suppress_change(self, action: str, location: Any) -> None:
+        """Count a change suppressed by sampling.
+
+        The summary of the suppressed changes is recorded once it is due, when
+        the history is read, or at interpreter exit.
+
+        Args:
+            action: The action of the suppressed change.
+            location: The location of the suppressed change.
+
+        Returns:
+            None
+
+        """
+        sampler = self._tracking_sampler
+        sampler.suppress(action, location)
+        if self._tracking_uuid not in _tracking_sampling_pending:
+            _tracking_sampling_pending[self._tracking_uuid] = self
+        if sampler.summary_due():
+            self.tracking_flush_sampling_summary()
+
+    def _tracking_record_change(self, kwargs: dict[str, Any]) -> None:
+        """Build the change log entry for a change and notify observers.
+
+        The raw inverse operation a mutator put in the context under "inverse",
+        a (function, args) pair, is attached to the entry as a `ChangeInverse`
+        instead of being stored as a string.
+
+        Args:
+            kwargs: The complete keyword arguments of the change.
+
+        Returns:
+            None
+
+        """
+        stats_start = time.perf_counter() if STATS.enabled else None
+        inverse = kwargs.pop("inverse", None)
+        if self._tracking_initializing:
+            inverse = None
+        location = kwargs.get("location")
+        if location is not None and not isinstance(location, TrackingPath):
+            kwargs["location"] = TrackingPath.of(self._tracking_path_kind, location)
+        capture_stack = self._tracking_capture_stack
+        if capture_stack and self._tracking_stack_sample_rate > 1:
+            # capture the first change and then every Nth one
+            capture_stack = (
+                self._tracking_stack_sample_counter % self._tracking_stack_sample_rate == 0
+            )
+            self._tracking_stack_sample_counter += 1
         change_log_entry = ChangeLogEntry(
             self._tracking_uuid,
-            capture_stack=self._tracking_capture_stack,
+            capture_stack=capture_stack,
             **kwargs,
         )
-        change_log_entry.add_to_tree(
-            self._tracking_format_tree_location(change_log_entry.extra.get("location", None))
-        )
-        self._tracking_changes.append(change_log_entry)
+        if inverse is not None:
+            change_log_entry.inverse = ChangeInverse(self, *inverse)
+        change_log_entry.add_to_tree(self._tracking_format_tree_location(location))
+        self._tracking_append_change(change_log_entry)
         self._tracking_notify_observers(change_log_entry)
+        if stats_start is not None:
+            STATS.entries_created += 1
+            STATS.record_seconds += time.perf_counter() - stats_start
+            STATS.containers[f"{type(self).__name__}:{self._tracking_uuid}"] += 1
+
+    def _tracking_child_path(self, child_location: Any, location: Any) -> TrackingPath:
+        """Return the location of a change to a child as seen from this instance.
+
+        Only one segment, naming the child, is prepended to the child's path, the
+        path is not rendered to a string.
+
+        Args:
+            child_location: The key, index or attribute holding the child.
+            location: The location recorded by the child, if any.
+
+        Returns:
+            The path of the change from this instance.
+
+        """
+        if location is None:
+            return TrackingPath.of(self._tracking_path_kind, child_location)
+        if not isinstance(location, TrackingPath):
+            location = TrackingPath.of(KEY, location)
+        return location.prepend(self._tracking_path_kind, child_location)
+
+    def _tracking_coalesce_change(self, kwargs: dict[str, Any]) -> bool:
+        """Buffer an update in the coalescing window of its location.
+
+        Consecutive updates to the same location within `tracking_coalesce_window`
+        seconds are merged into one change, recorded when the window expires, when
+        another kind of change touches the location, or when
+        `tracking_flush_coalesced` is called. Expired windows of every instance
+        are flushed whenever a change is created or a history is read. Changes
+        without a location (lock, clear, sort, ...) flush every pending window
+        first so they stay in order.
+
+        Args:
+            kwargs: The complete keyword arguments of the change.
+
+        Returns:
+            True if the change should be recorded now, False if it was buffered.
+
+        """
+        pending = self._tracking_coalesce_pending
+        location = kwargs.get("location")
+        if (
+            location is not None
+            and kwargs.get("action") == "update"
+            and kwargs.get("method") in self._tracking_coalesce_methods
+        ):
+            window = pending.get(location)
+            if window is None:
+                deadline = time.monotonic() + self._tracking_coalesce_window
+                pending[location] = [kwargs, kwargs, 1, deadline]
+                self._tracking_coalesce_deadline = min(self._tracking_coalesce_deadline, deadline)
+                _tracking_coalescing[self._tracking_uuid] = self
+            else:
+                window[1] = kwargs
+                window[2] += 1
+            return False
+        if location is None:
+            self._tracking_flush_coalesced()
+        elif location in pending:
+            self._tracking_emit_coalesced(pending.pop(location))
+        return True
+
+    def _tracking_flush_coalesced(self, now: float = math.inf) -> None:
+        """Record the merged changes of windows that expired by `now`.
+
+        Args:
+            now: The monotonic time to compare deadlines with, all windows are
+                flushed by default.
+
+        Returns:
+            None
+
+        """
+        pending = self._tracking_coalesce_pending
+        expired = [location for location, window in pending.items() if window[3] <= now]
+        for location in expired:
+            self._tracking_emit_coalesced(pending.pop(location))
+        self._tracking_coalesce_deadline = min(
+            (window[3] for window in pending.values()), default=math.inf
+        )
+        if not pending:
+            _tracking_coalescing.pop(self._tracking_uuid, None)
+
+    def _tracking_emit_coalesced(self, window: list) -> None:
+        """Record the merged change of a coalescing window.
+
+        The merged change is the last update with the old value (and pre-change
+        snapshot) of the first update and the number of merged updates in
+        `update_count`.
+
+        Args:
+            window: The pending window, [first kwargs, last kwargs, count, deadline].
+
+        Returns:
+            None
+
+        """
+        first, last, count, _ = window
+        kwargs = dict(last)
+        for key in self._tracking_coalesce_first_keys:
+            if key in first:
+                kwargs[key] = first[key]
+        kwargs["update_count"] = count
+        self._tracking_record_change(kwargs)
+
+    def tracking_flush_coalesced(self) -> None:
+        """Record every pending coalesced update now.
+
+        Windows are otherwise flushed once they expire, the next time a change
+        is created or a history is read.
+
+        Returns:
+            None
+
+        """
+        if self._tracking_coalesce_pending:
+            self._tracking_flush_coalesced()
+
+    def tracking_flush_sampling_summary(self) -> None:
+        """Record a "sampling summary" change for the suppressed changes.
+
+        The summary lists the number of suppressed changes per action and
+        location since the previous summary. Nothing is recorded when sampling
+        is off or no change was suppressed.
+
+        Returns:
+            None
+
+        """
+        sampler = self._tracking_sampler
+        if sampler is None or not sampler.suppressed:
+            return
+        _tracking_sampling_pending.pop(self._tracking_uuid, None)
+        summary = sampler.take_summary()
+        self.tracking_create_change(
+            action="sampling summary",
+            suppressed=summary,
+            suppressed_total=sum(item["count"] for item in summary),
+        )
 
     def _tracking_format_tree_location(self, location: str = "") -> dict[str, str]:
         """Format the tree location for a change log entry.
@@ -508,9 +1301,10 @@ class TrackBase:
     def lock(self) -> None:
         """Lock the instance and all child tracked items.
 
-        This method sets the instance to a locked state, preventing modifications
-        to its data. It also locks all child tracked items, ensuring that
-        their values cannot be changed.
+        This method sets the instance and every tracked item below it to a
+        locked state in a single traversal, preventing modifications to their
+        data. Only one "lock" change is recorded, on this instance, with the
+        number of locked nodes in `subtree_size`.
 
         Args:
             None
@@ -519,17 +1313,16 @@ class TrackBase:
             None
 
         """
-        self._tracking_locked = True
-        for key in self._tracking_child_tracked_items:
-            self._tracking_child_tracked_items[key]["item"].lock()
-        self.tracking_create_change(action="lock")
+        subtree_size = self._tracking_set_subtree_locked(True)
+        self.tracking_create_change(action="lock", subtree_size=subtree_size)
 
     def unlock(self) -> None:
         """Unlock the instance and all child tracked items.
 
-        This method sets the instance to an unlocked state, allowing modifications
-        to its data. It also unlocks all child tracked items, ensuring that their
-        values can be changed.
+        This method sets the instance and every tracked item below it to an
+        unlocked state in a single traversal, allowing modifications to their
+        data. Only one "unlock" change is recorded, on this instance, with the
+        number of unlocked nodes in `subtree_size`.
 
         Args:
             None
@@ -538,10 +1331,81 @@ class TrackBase:
             None
 
         """
-        self._tracking_locked = False
-        for key in self._tracking_child_tracked_items:
-            self._tracking_child_tracked_items[key]["item"].unlock()
-        self.tracking_create_change(action="unlock")
+        subtree_size = self._tracking_set_subtree_locked(False)
+        self.tracking_create_change(action="unlock", subtree_size=subtree_size)
+
+    def tracking_freeze(self, snapshot: bool = False) -> Any:
+        """Freeze the whole subtree and optionally return a frozen snapshot.
+
+        This method locks the instance and all tracked items below it in one
+        traversal, recording a single summarized "lock" change. When `snapshot`
+        is True it also returns a read-only copy of the current data: dicts
+        become `MappingProxyType` objects and lists become tuples, so readers
+        cannot modify it and no lock checks are needed on it.
+
+        Args:
+            snapshot: Whether to build and return a frozen snapshot.
+
+        Returns:
+            The frozen snapshot when requested, otherwise None.
+
+        Example:
+            >>> config = TrackedDict({"db": {"host": "localhost"}})
+            >>> frozen = config.tracking_freeze(snapshot=True)
+            >>> frozen["db"]["host"]
+            'localhost'
+
+        """
+        self.lock()
+        return self._tracking_convert_to_frozen(self) if snapshot else None
+
+    def _tracking_subtree_children(self) -> Iterable["TrackBase"]:
+        """Return the tracked items directly below this instance.
+
+        Args:
+            None
+
+        Returns:
+            An iterable of the child tracked items.
+
+        """
+        return [child["item"] for child in self._tracking_child_tracked_items.values()]
+
+    def _tracking_set_lock_state(self, locked: bool) -> None:
+        """Set the lock state of this instance only, without recording a change.
+
+        Args:
+            locked: The new lock state.
+
+        Returns:
+            None
+
+        """
+        self._tracking_locked = locked
+
+    def _tracking_set_subtree_locked(self, locked: bool) -> int:
+        """Set the lock state of this instance and every tracked item below it.
+
+        The tree is walked once without recursion and without recording any
+        changes, so callers can record a single summarized change.
+
+        Args:
+            locked: The new lock state.
+
+        Returns:
+            The number of tracked items whose lock state was set.
+
+        """
+        seen: set[str] = set()
+        pending: list[TrackBase] = [self]
+        while pending:
+            node = pending.pop()
+            if node._tracking_uuid in seen:
+                continue
+            seen.add(node._tracking_uuid)
+            node._tracking_set_lock_state(locked)
+            pending.extend(node._tracking_subtree_children())
+        return len(seen)
 
     def tracking_get_formatted_updates(self) -> list[str]:
         """Retrieve a formatted list of the most recent changes.
@@ -560,6 +1424,7 @@ class TrackBase:
             A list of strings containing the formatted updates.
 
         """
+        self._tracking_flush_before_read()
         new_output = []
         for item in self._tracking_changes[:20]:
             # for item in self._tracking_changes:
@@ -649,6 +1514,38 @@ class TrackBase:
             return "TrackedAttr"
         return ""
 
+    def _tracking_convert_to_frozen(self, obj: Any) -> Any:
+        """Convert an object to a read-only copy of its data.
+
+        Dictionaries become `MappingProxyType` objects over a new dict and lists
+        become tuples. TrackedAttr instances become a `MappingProxyType` of their
+        monitored attributes. Nested values are converted recursively.
+
+        Args:
+            obj: The object to be converted.
+
+        Returns:
+            The read-only form of the object, or the original object if it is not
+            a container.
+
+        """
+        from .trackedattributes import TrackedAttr
+
+        if isinstance(obj, dict):
+            return MappingProxyType(
+                {key: self._tracking_convert_to_frozen(value) for key, value in obj.items()}
+            )
+        if isinstance(obj, list):
+            return tuple(self._tracking_convert_to_frozen(item) for item in obj)
+        if isinstance(obj, TrackedAttr):
+            return MappingProxyType(
+                {
+                    name: self._tracking_convert_to_frozen(getattr(obj, name))
+                    for name in obj._tracking_attributes_to_monitor
+                }
+            )
+        return obj
+
     def _tracking_convert_to_untrackable(self, obj: Any) -> Any:
         """Convert a trackable object to its untrackable form.
 
@@ -30,38 +30,183 @@ Features:
 Usage:
     - Instantiate TrackedAttr to create an object that tracks attribute changes.
     - Use `tracking_add_attribute_to_monitor` to start monitoring specific attributes.
+    - Or declare monitored attributes at class level with `TrackedField()` or the
+      `tracked_fields` class decorator so unmonitored attributes skip tracking.
     - Lock and unlock attributes using `lock` and `unlock` methods.
     - Access original values and change logs through provided methods.
 
 Classes:
     - `TrackedAttr`: Represents a class that can track attribute changes.
+    - `TrackedField`: Descriptor that declares a monitored attribute on the class.
+
+Functions:
+    - `tracked_fields`: Class decorator that installs `TrackedField` descriptors.
 
 """
 
 # Standard Library
 import contextlib
 import sys
+from collections.abc import Callable
 from typing import TYPE_CHECKING, Any
 
 # 3rd Party
 # Project
+from ..instrumentation import STATS
 from ..types._trackbase import TrackBase, track_changes
+from ..utils.paths import ATTRIBUTE
 
 if TYPE_CHECKING:
+    from ..observer_policy import ObserverPolicy
+    from ..sampling import SamplingPolicy
     from ..utils.changelog import ChangeLogEntry
 
 
+class TrackedField:
+    """Descriptor that declares a monitored attribute on a TrackedAttr subclass.
+
+    Assigning a `TrackedField()` in the class body makes the attribute monitored
+    on every instance without calling `tracking_add_attribute_to_monitor`. The
+    first assignment starts monitoring and later assignments are logged as
+    updates. Classes that declare fields no longer intercept every attribute
+    write, so unmonitored attributes are set at normal Python speed.
+
+    Example:
+        >>> class Settings(TrackedAttr):
+        ...     name = TrackedField()
+        ...
+        ...     def __init__(self):
+        ...         super().__init__()
+        ...         self.name = "alpha"  # tracked
+        ...         self.scratch = 1  # plain attribute write
+
+    """
+
+    def __init__(self) -> None:
+        """Initialize the descriptor, the name is filled in by `__set_name__`."""
+        self.name = ""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        """Record the attribute name this descriptor was assigned to.
+
+        Args:
+            owner: The class the descriptor was assigned on.
+            name: The attribute name.
+
+        """
+        self.name = name
+
+    def __get__(self, instance: "TrackedAttr | None", owner: type | None = None) -> Any:
+        """Return the stored value, or the descriptor itself on class access.
+
+        Args:
+            instance: The instance the attribute is read from.
+            owner: The class the attribute is read from.
+
+        Returns:
+            The value stored for this field.
+
+        Raises:
+            AttributeError: If the field has not been assigned yet.
+
+        """
+        if instance is None:
+            return self
+        try:
+            return instance.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(
+                f"{type(instance).__name__!r} object has no attribute {self.name!r}"
+            ) from None
+
+    def __set__(self, instance: "TrackedAttr", value: Any) -> None:
+        """Route the assignment through the instance's tracking machinery.
+
+        Args:
+            instance: The instance the attribute is assigned on.
+            value: The new value.
+
+        """
+        instance._tracking_field_set(self.name, value)
+
+
+def tracked_fields(*names: str) -> Callable[[type], type]:
+    """Class decorator that declares monitored attributes by name.
+
+    This is equivalent to assigning `TrackedField()` for each name in the class
+    body and is convenient when the attribute names are already listed
+    elsewhere.
+
+    Args:
+        *names: The attribute names to monitor.
+
+    Returns:
+        A decorator that installs the descriptors and returns the class.
+
+    Example:
+        >>> @tracked_fields("name", "profile")
+        ... class Settings(TrackedAttr):
+        ...     pass
+
+    """
+
+    def decorator(cls: type) -> type:
+        for name in names:
+            field = TrackedField()
+            field.__set_name__(cls, name)
+            setattr(cls, name, field)
+        _tracking_install_fields(cls)
+        return cls
+
+    return decorator
+
+
+def _tracking_install_fields(cls: type) -> None:
+    """Collect the TrackedField descriptors of a class and its bases.
+
+    Classes that declare at least one field and do not define their own
+    `__setattr__` get `object.__setattr__` back, which removes the per-write
+    interception that imperative monitoring needs.
+
+    Args:
+        cls: The TrackedAttr subclass to inspect.
+
+    """
+    fields: dict[str, TrackedField] = {}
+    for klass in reversed(cls.__mro__):
+        for name, value in vars(klass).items():
+            if isinstance(value, TrackedField):
+                fields[name] = value
+    cls._tracking_fields = frozenset(fields)
+    if fields and "__setattr__" not in vars(cls):
+        cls.__setattr__ = object.__setattr__
+
+
 class TrackedAttr(TrackBase):
     """Class for tracking and managing changes to attributes.
 
     This class extends the TrackBase class to provide functionality for monitoring
     changes to attributes, managing parent-child relationships, and handling
     attribute locking and unlocking. It includes methods for adding attributes to
-    the monitoring list, notifying observers of changes, and maintaining original
-    values of attributes.
+    the monitor registry, notifying observers of changes, and maintaining original
+    values of attributes. Subclasses may declare monitored attributes with
+    `TrackedField` instead of calling `tracking_add_attribute_to_monitor`.
 
     """
 
+    _tracking_fields: frozenset[str] = frozenset()
+    _tracking_path_kind = ATTRIBUTE
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Collect the TrackedField descriptors declared on a subclass.
+
+        Args:
+            **kwargs: Keyword arguments forwarded to `object.__init_subclass__`.
+
+        """
+        super().__init_subclass__(**kwargs)
+        _tracking_install_fields(cls)
+
     def __init__(
         self,
         tracking_auto_convert: bool = True,
@@ -69,25 +214,54 @@ class TrackedAttr(TrackBase):
         tracking_location: str | None = "",
         tracking_capture_snapshots: bool | None = None,
         tracking_capture_stack: bool | None = None,
+        tracking_record_history: bool | None = None,
+        tracking_stack_sample_rate: int | None = None,
+        tracking_sampling: "SamplingPolicy | None" = None,
+        tracking_coalesce_window: float | None = None,
+        tracking_observer_policy: "ObserverPolicy | None" = None,
+        tracking_thread_safe: bool | None = None,
     ) -> None:
         """Initialize a TrackedAttr instance.
 
         This constructor initializes the TrackedAttr instance with the provided
         parameters for automatic conversion, parent tracking, and location tracking.
-        It also sets up the base tracking attributes, including the list of attributes
-        to monitor, locked attributes, and original values.
+        It also sets up the base tracking attributes, including the registry of
+        monitored attributes, the reverse map from child UUID to attribute, locked
+        attributes, and original values.
 
         Args:
             tracking_auto_convert: Whether to automatically convert tracked attribute
                 values.
             tracking_parent: The parent TrackBase instance for hierarchical tracking.
             tracking_location: The location identifier for the tracked attribute.
-            tracking_delimiter: The delimiter used to separate tracking locations.
+            tracking_capture_snapshots: Whether to capture snapshots for changes.
+            tracking_capture_stack: Whether to capture the call stack for each change.
+            tracking_record_history: Whether the instance keeps its own list of
+                changes.
+            tracking_stack_sample_rate: Capture the stack for only one in this many
+                changes when stack capture is enabled.
+            tracking_sampling: Optional sampling policy limiting which changes
+                are recorded.
+            tracking_coalesce_window: Merge consecutive updates to the same
+                location within this many seconds into one change.
+            tracking_observer_policy: Optional policy timing observers and
+                isolating the instance from observers that fail.
+            tracking_thread_safe: Serialize attribute writes and tracked methods of
+                the instance with a lock of its own, for instances shared between
+                threads.
 
         Returns:
             None
 
         """
+        # the registries are set up before TrackBase.__init__ because attaching to
+        # a parent already syncs the lock state of monitored attributes. The
+        # monitor registry is assigned last, __setattr__ treats its presence as
+        # the signal that the registries are ready to be consulted
+        self._tracking_locked_attributes: set[str] = set()
+        self._tracking_original_values = {}
+        self._tracking_attribute_child_uuids: dict[str, str] = {}
+        self._tracking_attributes_to_monitor: dict[str, str | None] = {}
         TrackBase.__init__(
             self,
             tracking_auto_convert=tracking_auto_convert,
@@ -96,17 +270,20 @@ class TrackedAttr(TrackBase):
             tracking_delimiter=".",
             tracking_capture_snapshots=tracking_capture_snapshots,
             tracking_capture_stack=tracking_capture_stack,
+            tracking_record_history=tracking_record_history,
+            tracking_stack_sample_rate=tracking_stack_sample_rate,
+            tracking_sampling=tracking_sampling,
+            tracking_coalesce_window=tracking_coalesce_window,
+            tracking_observer_policy=tracking_observer_policy,
+            tracking_thread_safe=tracking_thread_safe,
         )
-        self._tracking_attributes_to_monitor = []
-        self._tracking_locked_attributes = []
-        self._tracking_original_values = {}
 
     def _tracking_is_tracking_attribute(self, attribute_name: str) -> bool:
         """Check if the specified attribute is being tracked.
 
-        This method verifies whether the given attribute name is present in the list
-        of attributes being monitored. It returns False if the monitoring list does
-        not exist.
+        This method verifies whether the given attribute name is present in the
+        registry of attributes being monitored. It returns False if the registry
+        does not exist yet.
 
         Args:
             attribute_name: The name of the attribute to check.
@@ -115,16 +292,15 @@ class TrackedAttr(TrackBase):
             True if the attribute is being tracked; otherwise, False.
 
         """
-        if not hasattr(self, "_tracking_attributes_to_monitor"):
-            return False
-        return attribute_name in self._tracking_attributes_to_monitor
+        monitored = self.__dict__.get("_tracking_attributes_to_monitor")
+        return monitored is not None and attribute_name in monitored
 
     def _tracking_is_locked_attribute(self, attribute_name: str) -> bool:
         """Check if the specified attribute is locked.
 
-        This method verifies whether the given attribute name is present in the list
-        of locked attributes. It returns False if the locked attributes list does
-        not exist.
+        This method verifies whether the given attribute name is present in the set
+        of locked attributes. It returns False if the locked attributes set does
+        not exist yet.
 
         Args:
             attribute_name: The name of the attribute to check.
@@ -133,9 +309,40 @@ class TrackedAttr(TrackBase):
             True if the attribute is locked; otherwise, False.
 
         """
-        if not hasattr(self, "_tracking_locked_attributes"):
-            return False
-        return attribute_name in self._tracking_locked_attributes
+        locked = self.__dict__.get("_tracking_locked_attributes")
+        return locked is not None and attribute_name in locked
+
+    def _tracking_register_attribute_value(self, attribute_name: str, value: Any) -> None:
+        """Record which tracked child, if any, a monitored attribute now holds.
+
+        This method keeps the monitor registry and the reverse map from child UUID
+        to attribute name in sync with the value stored on the instance. When a
+        tracked child is replaced, the old child is detached so its later changes
+        are no longer reported under this attribute.
+
+        Args:
+            attribute_name: The name of the monitored attribute.
+            value: The value now stored in the attribute.
+
+        Returns:
+            None
+
+        """
+        old_uuid = self._tracking_attributes_to_monitor.get(attribute_name)
+        new_uuid = value._tracking_uuid if self._tracking_is_trackable(value) else None
+        if old_uuid == new_uuid:
+            self._tracking_attributes_to_monitor[attribute_name] = new_uuid
+            return
+
+        if old_uuid is not None:
+            self._tracking_attribute_child_uuids.pop(old_uuid, None)
+            old_child = self._tracking_child_tracked_items.get(old_uuid)
+            if old_child is not None:
+                self._tracking_remove_child_tracked_item(old_child["item"])
+
+        if new_uuid is not None:
+            self._tracking_attribute_child_uuids[new_uuid] = attribute_name
+        self._tracking_attributes_to_monitor[attribute_name] = new_uuid
 
     def _tracking_notify_observers(self, change_log_entry: "ChangeLogEntry") -> None:
         """Notify observers of attribute changes.
@@ -153,38 +360,31 @@ class TrackedAttr(TrackBase):
             None
 
         """
-        if change_log_entry.tracked_item_uuid != self._tracking_uuid:
-            for item in self._tracking_attributes_to_monitor:
-                value = getattr(self, item)
-                if (
-                    self._tracking_is_trackable(value)
-                    and value._tracking_uuid == change_log_entry.tracked_item_uuid
-                ):
+        with self._tracking_mutex or contextlib.nullcontext():
+            if change_log_entry.tracked_item_uuid != self._tracking_uuid:
+                item = self._tracking_attribute_child_uuids.get(change_log_entry.tracked_item_uuid)
+                if item is not None:
                     new_change = change_log_entry.copy(
                         change_log_entry.extra["type"], self._tracking_uuid
                     )
                     new_change.add_to_tree(self._tracking_format_tree_location(item))
-                    if "location" in new_change.extra:
-                        new_change.extra["location"] = (
-                            f"{item}{value._tracking_delimiter}{new_change.extra['location']}"
-                        )
-                    else:
-                        new_change.extra["location"] = f"{item}"
+                    new_change.extra["location"] = self._tracking_child_path(
+                        item, new_change.extra.get("location")
+                    )
 
                     change_log_entry = new_change
+                    if STATS.enabled:
+                        STATS.propagation_hops += 1
 
-                    break
-
-        if change_log_entry not in self._tracking_changes:
-            self._tracking_changes.append(change_log_entry)
-        super()._tracking_notify_observers(change_log_entry)
+            self._tracking_append_change(change_log_entry)
+            super()._tracking_notify_observers(change_log_entry)
 
     def tracking_add_attribute_to_monitor(self, attribute_name: str) -> None:
-        """Add an attribute to the monitoring list.
+        """Add an attribute to the monitor registry.
 
-        This method adds the specified attribute to the list of attributes being
+        This method adds the specified attribute to the registry of attributes being
         monitored. If the attribute exists and is not already being monitored, it
-        is appended to the monitoring list, and its original value is stored. The
+        is added to the monitor registry, and its original value is stored. The
         attribute value is then converted if necessary, and a change log entry is
         created to record the start of monitoring.
 
@@ -194,21 +394,124 @@ class TrackedAttr(TrackBase):
         Returns:
             None
 
+        Raises:
+            TypeError: If the class declares TrackedField descriptors and the
+                attribute is not one of them.
+
         """
+        if self._tracking_fields and attribute_name not in self._tracking_fields:
+            raise TypeError(
+                f"{self.__class__.__name__} declares TrackedField descriptors, "
+                f"declare {attribute_name!r} as a TrackedField to monitor it."
+            )
         if (
             hasattr(self, attribute_name)
             and attribute_name not in self._tracking_attributes_to_monitor
         ):
-            self._tracking_attributes_to_monitor.append(attribute_name)
-            original_value = value = getattr(self, attribute_name)
-            value = self._tracking_convert_value(value, attribute_name)
-            super().__setattr__(attribute_name, value)
-            self.tracking_create_change(
-                action="start monitoring",
-                location=f"{attribute_name}",
-                value=original_value,
+            self._tracking_start_monitoring(attribute_name, getattr(self, attribute_name))
+
+    def _tracking_start_monitoring(self, attribute_name: str, value: Any) -> None:
+        """Register an attribute in the monitor registry and store its value.
+
+        The value is converted if necessary and a "start monitoring" change log
+        entry is created with the unconverted value.
+
+        Args:
+            attribute_name: The name of the attribute to be monitored.
+            value: The value to store for the attribute.
+
+        Returns:
+            None
+
+        """
+        self._tracking_attributes_to_monitor[attribute_name] = None
+        original_value = value
+        value = self._tracking_convert_value(value, attribute_name)
+        self._tracking_store_attribute(attribute_name, value)
+        self._tracking_register_attribute_value(attribute_name, value)
+        self.tracking_create_change(
+            action="start monitoring",
+            location=f"{attribute_name}",
+            value=original_value,
+        )
+
+    def _tracking_store_attribute(self, attribute_name: str, value: Any) -> None:
+        """Store an attribute value without going through tracking again.
+
+        TrackedField values live in the instance `__dict__` under the field name,
+        so they are written there directly to avoid re-entering the descriptor.
+
+        Args:
+            attribute_name: The name of the attribute.
+            value: The value to store.
+
+        Returns:
+            None
+
+        """
+        if attribute_name in self._tracking_fields:
+            self.__dict__[attribute_name] = value
+        else:
+            object.__setattr__(self, attribute_name, value)
+
+    def _tracking_set_monitored_attribute(
+        self, method: str, attribute_name: str, value: Any
+    ) -> None:
+        """Set a monitored or locked attribute and log the change.
+
+        Args:
+            method: The name of the method that triggered the attribute change.
+            attribute_name: The name of the attribute to set.
+            value: The new value to assign to the attribute.
+
+        Returns:
+            None
+
+        Raises:
+            RuntimeError: If the attribute is locked and cannot be modified.
+
+        """
+        if attribute_name in self._tracking_locked_attributes:
+            raise RuntimeError(
+                f"{self.__class__.__name__}.{attribute_name} is locked and cannot be modified."
             )
 
+        with self._tracking_mutex or contextlib.nullcontext():
+            try:
+                original_value = getattr(self, attribute_name)
+            except AttributeError:
+                original_value = "#!NotSet"
+
+            if not self._tracking_locked:
+                value = self._tracking_convert_value(value, attribute_name)
+                self._tracking_store_attribute(attribute_name, value)
+                self._tracking_register_attribute_value(attribute_name, value)
+
+            self._tracking_attribute_change(method, attribute_name, original_value, value)
+
+    def _tracking_field_set(self, attribute_name: str, value: Any) -> None:
+        """Handle an assignment to a TrackedField descriptor.
+
+        The first assignment starts monitoring the field, later assignments are
+        handled like writes to an imperatively monitored attribute.
+
+        Args:
+            attribute_name: The name of the field.
+            value: The new value to assign to the field.
+
+        Returns:
+            None
+
+        """
+        if attribute_name not in self._tracking_attributes_to_monitor:
+            if attribute_name in self._tracking_locked_attributes:
+                raise RuntimeError(
+                    f"{self.__class__.__name__}.{attribute_name} is locked and cannot be modified."
+                )
+            self._tracking_start_monitoring(attribute_name, value)
+            return
+        self._tracking_set_monitored_attribute("__set__", attribute_name, value)
+
     def _tracking_attribute_change(
         self, method: str, attribute_name: str, original_value: Any, new_value: Any
     ) -> None:
@@ -244,6 +547,7 @@ class TrackedAttr(TrackBase):
                 location=f"{attribute_name}",
                 value=new_value,
                 attribute_locked=self._tracking_is_locked_attribute(attribute_name),
+                inverse=(setattr, (attribute_name, original_value)),
                 **extra,
             )
 
@@ -285,7 +589,7 @@ class TrackedAttr(TrackBase):
     def _tracking_lock_attribute(self, attribute_name) -> None:
         """Lock a specified attribute to prevent modifications.
 
-        This method adds the given attribute name to the list of locked attributes,
+        This method adds the given attribute name to the set of locked attributes,
         ensuring that its value cannot be changed until it is unlocked. If the
         attribute is trackable, it also invokes the lock method on the attribute,
         maintaining the integrity of the tracking system.
@@ -300,7 +604,7 @@ class TrackedAttr(TrackBase):
         if not hasattr(self, attribute_name):
             return
 
-        self._tracking_locked_attributes.append(attribute_name)
+        self._tracking_locked_attributes.add(attribute_name)
         value = getattr(self, attribute_name)
         if self._tracking_is_trackable(value):
             value.lock()
@@ -314,7 +618,7 @@ class TrackedAttr(TrackBase):
     def _tracking_unlock_attribute(self, attribute_name: str = "") -> None:
         """Unlock a specified attribute to allow modifications.
 
-        This method removes the given attribute name from the list of locked
+        This method removes the given attribute name from the set of locked
         attributes, enabling changes to be made to its value. If the attribute is
         trackable, it also invokes the unlock method on the attribute, ensuring
         that the attribute can be modified.
@@ -334,20 +638,19 @@ class TrackedAttr(TrackBase):
             if self._tracking_is_trackable(value):
                 value.unlock()
 
-            self._tracking_locked_attributes.remove(attribute_name)
+            self._tracking_locked_attributes.discard(attribute_name)
             self.tracking_create_change(
                 action="unlock",
                 attribute_name=attribute_name,
                 attribute_locked=self._tracking_is_locked_attribute(attribute_name),
             )
 
-    @track_changes
     def lock(self, attribute_name: str = "") -> None:
         """Lock specified attributes to prevent modifications.
 
-        This method locks the given attribute or all monitored attributes,
-        preventing changes to their values. It updates the tracking context
-        to reflect the locking action, ensuring that data integrity is maintained.
+        This method locks the given attribute, or locks all monitored attributes
+        and the tracked items below them in one traversal. Locking everything
+        records a single summarized "lock" change on this instance.
 
         Args:
             attribute_name: The name of the attribute to be locked.
@@ -360,19 +663,14 @@ class TrackedAttr(TrackBase):
         if attribute_name:
             self._tracking_lock_attribute(attribute_name)
         else:
-            for attribute in self._tracking_attributes_to_monitor:
-                self._tracking_lock_attribute(attribute)
-            self._tracking_locked = True
-
-            # self.tracking_create_change(action='lock')
-            self._tracking_context["action"] = "lock"
+            super().lock()
 
     def unlock(self, attribute_name: str = "") -> None:
         """Unlock specified attributes to allow modifications.
 
-        This method unlocks the given attribute or all monitored attributes,
-        enabling changes to their values. It updates the tracking context
-        to reflect the unlocking action, ensuring that data integrity is maintained.
+        This method unlocks the given attribute, or unlocks all monitored
+        attributes and the tracked items below them in one traversal. Unlocking
+        everything records a single summarized "unlock" change on this instance.
 
         Args:
             attribute_name: The name of the attribute to be unlocked.
@@ -385,20 +683,52 @@ class TrackedAttr(TrackBase):
         if attribute_name:
             self._tracking_unlock_attribute(attribute_name)
         else:
-            self._tracking_locked = False
-            for attribute in self._tracking_attributes_to_monitor:
-                self._tracking_unlock_attribute(attribute)
+            super().unlock()
+
+    def _tracking_set_lock_state(self, locked: bool) -> None:
+        """Set the lock state of the instance and all monitored attributes.
+
+        Args:
+            locked: The new lock state.
+
+        Returns:
+            None
+
+        """
+        self._tracking_locked = locked
+        if locked:
+            self._tracking_locked_attributes.update(self._tracking_attributes_to_monitor)
+        else:
+            self._tracking_locked_attributes.clear()
 
-            self.tracking_create_change(action="unlock")
+    def _tracking_subtree_children(self) -> list[TrackBase]:
+        """Return the tracked children and tracked monitored attribute values.
+
+        Args:
+            None
+
+        Returns:
+            A list of the tracked items directly below this instance.
+
+        """
+        children = {
+            child["item"]._tracking_uuid: child["item"]
+            for child in self._tracking_child_tracked_items.values()
+        }
+        for attribute_name in self._tracking_attribute_child_uuids.values():
+            value = getattr(self, attribute_name)
+            children.setdefault(value._tracking_uuid, value)
+        return list(children.values())
 
     def __setattr__(self, attribute_name: str, value: Any) -> None:
         """Set the value of the specified attribute.
 
-        This method sets the value of the given attribute name. It first checks
-        if the attribute is locked, and if so, raises a RuntimeError. It then
-        retrieves the original value of the attribute and, if the attribute is
-        being tracked, converts the new value if necessary. Finally, it updates
-        the attribute value and logs the change if the attribute is being tracked.
+        This method sets the value of the given attribute name. Attributes that
+        are neither monitored nor locked are set directly after two dictionary
+        lookups. Otherwise it checks if the attribute is locked, and if so, raises
+        a RuntimeError. It then retrieves the original value of the attribute and
+        converts the new value if necessary. Finally, it updates the attribute
+        value and logs the change.
 
         Args:
             attribute_name: The name of the attribute to set.
@@ -411,29 +741,17 @@ class TrackedAttr(TrackBase):
             RuntimeError: If the attribute is locked and cannot be modified.
 
         """
-        if self._tracking_is_locked_attribute(attribute_name):
-            raise RuntimeError(
-                f"{self.__class__.__name__}.{attribute_name} is locked and cannot be modified."
-            )
-
-        try:
-            original_value = getattr(self, attribute_name)
-        except AttributeError:
-            original_value = "#!NotSet"
-
-        if (
-            not self._tracking_is_tracking_attribute(attribute_name)
-            or not (self._tracking_is_locked_attribute(attribute_name))
-            and (hasattr(self, "_tracking_locked") and not self._tracking_locked)
+        monitored = self.__dict__.get("_tracking_attributes_to_monitor")
+        if monitored is None or (
+            attribute_name not in monitored
+            and attribute_name not in self._tracking_locked_attributes
         ):
-            if self._tracking_is_tracking_attribute(attribute_name):
-                value = self._tracking_convert_value(value, attribute_name)
             super().__setattr__(attribute_name, value)
+            return
 
-        if self._tracking_is_tracking_attribute(attribute_name):
-            self._tracking_attribute_change(
-                sys._getframe().f_code.co_name, attribute_name, original_value, value
-            )
+        self._tracking_set_monitored_attribute(
+            sys._getframe().f_code.co_name, attribute_name, value
+        )
 
     def _tracking_known_uuids_tree(
         self, level: int = 0, attribute_name: str = "", emptybar: dict | None = None
@@ -474,7 +792,7 @@ class TrackedAttr(TrackBase):
 
         else:
             emptybar[level] = False
-            left = self._tracking_attributes_to_monitor[:]
+            left = list(self._tracking_attributes_to_monitor)
             pre_string = "".join("    " if emptybar[i] else " |  " for i in range(level))
             for attribute_name in self._tracking_attributes_to_monitor:
                 left.remove(attribute_name)
@@ -30,6 +30,7 @@ Features:
     - Preserves standard dictionary operations
     - Automatic conversion of tracked data values.
     - Supports conversion between tracked and untracked states
+    - Optional persistent versions for cheap point-in-time reads and restores
 
 Usage:
     - Instantiate TrackedDict to create a dictionary that tracks value changes.
@@ -41,17 +42,40 @@ Classes:
 """
 
 # Standard Library
+import contextlib
+import datetime
+from bisect import bisect_right
+from collections import deque
 from collections.abc import Hashable
+from operator import attrgetter
 from typing import TYPE_CHECKING, Any
 
 # 3rd Party
 # Project
-from ._trackbase import TrackBase, check_lock, track_changes
+from ..instrumentation import STATS
+from ..utils.persistent import DictVersion, PersistentMap
+from ._trackbase import TrackBase, tracked_mutator
+from .views import TrackedMappingView
 
 if TYPE_CHECKING:
+    from ..observer_policy import ObserverPolicy
+    from ..sampling import SamplingPolicy
     from ..utils.changelog import ChangeLogEntry
 
 
+def _dict_pop(self: dict, key: Hashable, default: Any | None = None) -> Any:
+    """Untracked `TrackedDict.pop`, which returns None for missing keys."""
+    return dict.pop(self, key, default)
+
+
+def _dict_revert_update(self: "TrackedDict", old_values: dict, added: list) -> None:
+    """Inverse of `TrackedDict.update`: drop added keys and restore old values."""
+    for key in added:
+        del self[key]
+    if old_values:
+        self.update(old_values)
+
+
 class TrackedDict(TrackBase, dict):
     """A dictionary class that tracks changes to its items.
 
@@ -63,6 +87,9 @@ class TrackedDict(TrackBase, dict):
 
     """
 
+    _tracking_versions: "deque[DictVersion] | None" = None
+    _tracking_pmap: PersistentMap | None = None
+
     def __init__(
         self,
         *args,
@@ -73,6 +100,14 @@ class TrackedDict(TrackBase, dict):
         tracking_location: str | None = "",
         tracking_capture_snapshots: bool | None = None,
         tracking_capture_stack: bool | None = None,
+        tracking_record_history: bool | None = None,
+        tracking_stack_sample_rate: int | None = None,
+        tracking_sampling: "SamplingPolicy | None" = None,
+        tracking_coalesce_window: float | None = None,
+        tracking_observer_policy: "ObserverPolicy | None" = None,
+        tracking_thread_safe: bool | None = None,
+        tracking_versioned: bool = False,
+        tracking_max_versions: int | None = None,
         **kwargs,
     ) -> None:
         """Initialize the tracked dictionary with optional tracking parameters.
@@ -88,6 +123,26 @@ class TrackedDict(TrackBase, dict):
             tracking_auto_convert: Boolean flag to enable/disable auto-conversion.
             tracking_parent: Optional parent tracking object.
             tracking_location: Optional string for tracking location context.
+            tracking_capture_snapshots: Whether to store repr snapshots of the
+                dictionary before and after each change.
+            tracking_capture_stack: Whether to capture the call stack for each change.
+            tracking_record_history: Whether the dictionary keeps its own list of
+                changes. When False and nothing observes the dictionary, mutations
+                skip change tracking entirely.
+            tracking_stack_sample_rate: Capture the stack for only one in this many
+                changes when stack capture is enabled.
+            tracking_sampling: Optional sampling policy limiting which changes
+                are recorded.
+            tracking_coalesce_window: Merge consecutive updates to the same
+                location within this many seconds into one change.
+            tracking_observer_policy: Optional policy timing observers and
+                isolating the container from observers that fail.
+            tracking_thread_safe: Serialize the tracked methods of the dictionary with a
+                lock of its own, for dictionaries shared between threads.
+            tracking_versioned: Keep a persistent version of the dictionary after
+                every change, see `tracking_versions` and `tracking_as_of`.
+            tracking_max_versions: The number of versions to retain, all versions
+                are kept when None.
             **kwargs: Keyword arguments to initialize the dictionary.
 
         """
@@ -97,6 +152,18 @@ class TrackedDict(TrackBase, dict):
             tracking_kwargs["tracking_capture_snapshots"] = tracking_capture_snapshots
         if tracking_capture_stack is not None:
             tracking_kwargs["tracking_capture_stack"] = tracking_capture_stack
+        if tracking_record_history is not None:
+            tracking_kwargs["tracking_record_history"] = tracking_record_history
+        if tracking_stack_sample_rate is not None:
+            tracking_kwargs["tracking_stack_sample_rate"] = tracking_stack_sample_rate
+        if tracking_sampling is not None:
+            tracking_kwargs["tracking_sampling"] = tracking_sampling
+        if tracking_coalesce_window is not None:
+            tracking_kwargs["tracking_coalesce_window"] = tracking_coalesce_window
+        if tracking_observer_policy is not None:
+            tracking_kwargs["tracking_observer_policy"] = tracking_observer_policy
+        if tracking_thread_safe is not None:
+            tracking_kwargs["tracking_thread_safe"] = tracking_thread_safe
         TrackBase.__init__(
             self,
             tracking_auto_converted_in=tracking_auto_converted_in,
@@ -107,6 +174,111 @@ class TrackedDict(TrackBase, dict):
             tracking_delimiter=":",
             **tracking_kwargs,
         )
+        if tracking_versioned:
+            self._tracking_pmap = PersistentMap(dict.items(self))
+            self._tracking_versions = deque(
+                [DictVersion(0, datetime.datetime.now(datetime.UTC), self._tracking_pmap)],
+                maxlen=tracking_max_versions,
+            )
+            self._tracking_refresh_fast_path()
+
+    def _tracking_refresh_fast_path(self) -> None:
+        """Recompute the fast path, which versioned dictionaries never take.
+
+        Returns:
+            None
+
+        """
+        super()._tracking_refresh_fast_path()
+        if self._tracking_versions is not None:
+            self._tracking_fast_path = False
+
+    def _tracking_commit_version(self, data: PersistentMap) -> None:
+        """Record `data` as the newest version if it differs from the current one.
+
+        Args:
+            data: The persistent map holding the new contents.
+
+        Returns:
+            None
+
+        """
+        if data is self._tracking_pmap:
+            return
+        versions = self._tracking_versions
+        self._tracking_pmap = data
+        versions.append(
+            DictVersion(versions[-1].number + 1, datetime.datetime.now(datetime.UTC), data)
+        )
+
+    @property
+    def tracking_versions(self) -> tuple[DictVersion, ...]:
+        """The retained versions of a versioned dictionary, oldest first.
+
+        Each version shares all unchanged nodes with its neighbours, so retaining
+        versions costs O(log n) memory per change.
+
+        Returns:
+            The retained versions, empty when versioning is off.
+
+        """
+        return tuple(self._tracking_versions or ())
+
+    def tracking_as_of(self, version: int | datetime.datetime) -> PersistentMap:
+        """Return the contents of the dictionary at a version or point in time.
+
+        Nested tracked containers are stored by reference, so they show their
+        current contents, use versioned children to read them as of a time too.
+
+        Args:
+            version: A version number, or a time to read the newest version
+                committed at or before.
+
+        Returns:
+            An immutable mapping with the contents of that version.
+
+        Raises:
+            RuntimeError: If versioning is off.
+            KeyError: If the version is not retained.
+
+        """
+        versions = self._tracking_versions
+        if versions is None:
+            raise RuntimeError("TrackedDict was not created with tracking_versioned=True")
+        if isinstance(version, datetime.datetime):
+            index = bisect_right(versions, version, key=attrgetter("created_time")) - 1
+            if index < 0:
+                raise KeyError(version)
+            return versions[index].data
+        index = version - versions[0].number
+        if not 0 <= index < len(versions):
+            raise KeyError(version)
+        return versions[index].data
+
+    def tracking_restore_version(self, version: int | datetime.datetime) -> None:
+        """Restore the contents of the dictionary to a previous version.
+
+        Only keys whose binding differs between the current and the requested
+        version are touched, found by skipping the subtrees both versions share.
+        Each restored key is a normal tracked change and commits a new version.
+
+        Args:
+            version: A version number or a point in time, see `tracking_as_of`.
+
+        Returns:
+            None
+
+        Raises:
+            RuntimeError: If versioning is off or the dictionary is locked.
+            KeyError: If the version is not retained.
+
+        """
+        target = self.tracking_as_of(version)
+        for key in list(self._tracking_pmap.diff(target)):
+            if key in target:
+                self[key] = target[key]
+            else:
+                del self[key]
 
     def _tracking_convert_all_values(self) -> None:
         """Convert all values in the dictionary to tracked objects.
@@ -131,42 +303,27 @@ class TrackedDict(TrackBase, dict):
                 attribute change.
 
         """
-        if (
-            change_log_entry.tracked_item_uuid != self._tracking_uuid
-            and change_log_entry.tracked_item_uuid in self._tracking_child_tracked_items
-        ):
-            new_change = change_log_entry.copy(change_log_entry.extra["type"], self._tracking_uuid)
-            new_change.add_to_tree(
-                self._tracking_format_tree_location(
-                    self._tracking_child_tracked_items[change_log_entry.tracked_item_uuid][
-                        "location"
-                    ]
+        with self._tracking_mutex or contextlib.nullcontext():
+            child = None
+            if change_log_entry.tracked_item_uuid != self._tracking_uuid:
+                child = self._tracking_child_tracked_items.get(change_log_entry.tracked_item_uuid)
+            if child is not None:
+                new_change = change_log_entry.copy(
+                    change_log_entry.extra["type"], self._tracking_uuid
                 )
-            )
-
-            if "location" in new_change.extra:
-                delimiter = self._tracking_child_tracked_items[change_log_entry.tracked_item_uuid][
-                    "item"
-                ]._tracking_delimiter
-                location = self._tracking_child_tracked_items[change_log_entry.tracked_item_uuid][
-                    "location"
-                ]
-                new_change.extra["location"] = (
-                    f"{location}{delimiter}{new_change.extra['location']}"
+                new_change.add_to_tree(self._tracking_format_tree_location(child["location"]))
+                new_change.extra["location"] = self._tracking_child_path(
+                    child["location"], new_change.extra.get("location")
                 )
-            else:
-                tracked_item = self._tracking_child_tracked_items[
-                    change_log_entry.tracked_item_uuid
-                ]
-                new_change.extra["location"] = f"{tracked_item['location']}"
-            change_log_entry = new_change
-
-        if change_log_entry not in self._tracking_changes:
-            self._tracking_changes.append(change_log_entry)
-        super()._tracking_notify_observers(change_log_entry)
-
-    @check_lock
-    @track_changes
+
+                change_log_entry = new_change
+                if STATS.enabled:
+                    STATS.propagation_hops += 1
+
+            self._tracking_append_change(change_log_entry)
+            super()._tracking_notify_observers(change_log_entry)
+
+    @tracked_mutator(dict.__delitem__)
     def __delitem__(self, key: Hashable) -> None:
         """Delete a key-value pair from the dictionary and track the change.
 
@@ -193,15 +350,17 @@ class TrackedDict(TrackBase, dict):
 
         if not self._tracking_locked:
             super().__delitem__(key)
+            if self._tracking_versions is not None and key in self._tracking_pmap:
+                self._tracking_commit_version(self._tracking_pmap.delete(key))
 
         if old_item:
             self._tracking_context.setdefault("removed_items", []).append(old_item)
         self._tracking_context["action"] = "update"
         self._tracking_context["value"] = old_item
         self._tracking_context["location"] = key
+        self._tracking_context["inverse"] = (TrackedDict.__setitem__, (key, old_item))
 
-    @check_lock
-    @track_changes
+    @tracked_mutator(dict.__setitem__)
     def __setitem__(self, key: Hashable, value: Any) -> None:
         """Set a key-value pair in the dictionary and track the change.
 
@@ -223,17 +382,24 @@ class TrackedDict(TrackBase, dict):
 
         """
         action = "update" if key in self else "add"
+        if action == "update":
+            old_value = dict.__getitem__(self, key)
+            self._tracking_context["old_value"] = old_value
+            self._tracking_context["inverse"] = (TrackedDict.__setitem__, (key, old_value))
+        else:
+            self._tracking_context["inverse"] = (TrackedDict.__delitem__, (key,))
 
         if not self._tracking_locked:
             value = self._tracking_convert_value(value, key)
             super().__setitem__(key, value)
+            if self._tracking_versions is not None:
+                self._tracking_commit_version(self._tracking_pmap.set(key, value))
 
         self._tracking_context["action"] = action
         self._tracking_context["value"] = value
         self._tracking_context["location"] = key
 
-    @check_lock
-    @track_changes
+    @tracked_mutator(_dict_pop)
     def pop(self, key: Hashable, default: Any | None = None) -> Any:
         """Remove and return the value for a specified key from the dictionary.
 
@@ -259,20 +425,25 @@ class TrackedDict(TrackBase, dict):
 
         """
         value = "###^$^@$^$default###^$^@$^"
+        removed = key in self
 
         if not self._tracking_locked:
             value = super().pop(key, default)
 
+        if self._tracking_versions is not None and key in self._tracking_pmap:
+            self._tracking_commit_version(self._tracking_pmap.delete(key))
+
         if value != "###^$^@$^$default###^$^@$^":
             self._tracking_context.setdefault("removed_items", []).append(value)
             self._tracking_context["value"] = value
+            if removed:
+                self._tracking_context["inverse"] = (TrackedDict.__setitem__, (key, value))
 
         self._tracking_context["action"] = "update"
         self._tracking_context["location"] = key
         return value if value != "###^$^@$^$default###^$^@$^" else default
 
-    @check_lock
-    @track_changes
+    @tracked_mutator(dict.popitem)
     def popitem(self) -> tuple:
         """Remove and return a (key, value) pair from the dictionary.
 
@@ -296,6 +467,8 @@ class TrackedDict(TrackBase, dict):
 
         if not self._tracking_locked:
             key, value = super().popitem()
+            if self._tracking_versions is not None:
+                self._tracking_commit_version(self._tracking_pmap.delete(key))
 
         self._tracking_context["action"] = "remove"
         if value != "###^$^@$^$default###^$^@$^":
@@ -304,11 +477,11 @@ class TrackedDict(TrackBase, dict):
 
         if key != "###^$^@$^$default###^$^@$^":
             self._tracking_context["location"] = key
+            self._tracking_context["inverse"] = (TrackedDict.__setitem__, (key, value))
 
         return key, value
 
-    @check_lock
-    @track_changes
+    @tracked_mutator(dict.update)
     def update(self, *args, **kwargs) -> None:
         """Update dictionary with elements from iterable of key/value pairs.
 
@@ -331,20 +504,27 @@ class TrackedDict(TrackBase, dict):
         """
         removed_items: list[Hashable] = []
         transformed_data: dict[Hashable, Any] = {}
+        old_values: dict[Hashable, Any] = {}
+        added: list[Hashable] = []
         if not self._tracking_locked:
             transformed_data = {}
             for key, value in dict(*args, **kwargs).items():
                 if key in self:
                     removed_items.append(self[key])
+                    old_values.setdefault(key, self[key])
+                else:
+                    added.append(key)
                 transformed_data[key] = self._tracking_convert_value(value, key)
             super().update(transformed_data)
+            if self._tracking_versions is not None:
+                self._tracking_commit_version(self._tracking_pmap.update(transformed_data))
 
         self._tracking_context["action"] = "update"
         self._tracking_context["removed_items"] = removed_items
         self._tracking_context["value"] = transformed_data
+        self._tracking_context["inverse"] = (_dict_revert_update, (old_values, added))
 
-    @check_lock
-    @track_changes
+    @tracked_mutator(dict.setdefault)
     def setdefault(self, key: Hashable, default: Any | None = None) -> Any:
         """Set a default value for a key if it is not already in the dictionary.
 
@@ -373,7 +553,10 @@ class TrackedDict(TrackBase, dict):
         if not self._tracking_locked:
             if key not in self:
                 default = self._tracking_convert_value(default, key)
+                self._tracking_context["inverse"] = (TrackedDict.__delitem__, (key,))
             default = super().setdefault(key, default)
+            if self._tracking_versions is not None:
+                self._tracking_commit_version(self._tracking_pmap.set(key, default))
 
         self._tracking_context["action"] = "update"
         self._tracking_context["location"] = key
@@ -381,8 +564,7 @@ class TrackedDict(TrackBase, dict):
         self._tracking_context["return_value"] = default
         return default
 
-    @check_lock
-    @track_changes
+    @tracked_mutator(dict.clear)
     def clear(self) -> None:
         """Clear all items from the dictionary and track the operation.
 
@@ -401,13 +583,16 @@ class TrackedDict(TrackBase, dict):
         if not self._tracking_locked:
             for item in self:
                 self._tracking_context.setdefault("removed_items", []).append(self[item])
+            if self:
+                self._tracking_context["inverse"] = (TrackedDict.update, (dict(self),))
 
             super().clear()
+            if self._tracking_versions is not None and self._tracking_pmap:
+                self._tracking_commit_version(PersistentMap())
 
         self._tracking_context["action"] = "remove"
 
-    @check_lock
-    @track_changes
+    @tracked_mutator()
     def copy(self, untracked: bool = True) -> dict:
         """Create a copy of the dictionary with optional tracking removal.
 
@@ -434,6 +619,15 @@ class TrackedDict(TrackBase, dict):
         self._tracking_context["untracked"] = untracked
         return new_object
 
+    def _tracking_new_view(self) -> TrackedMappingView:
+        """Create a read-only copy-on-write view of the dictionary.
+
+        Returns:
+            A new `TrackedMappingView` sharing storage with this dictionary.
+
+        """
+        return TrackedMappingView(self)
+
     def _tracking_known_uuids_tree(
         self, level: int = 0, emptybar: dict[int, bool] | None = None
     ) -> list[str]:
@@ -38,17 +38,49 @@ Classes:
 """
 
 # Standard Library
+import contextlib
 from collections.abc import Callable
 from typing import TYPE_CHECKING, Any
 
 # 3rd Party
 # Project
-from ._trackbase import TrackBase, check_lock, track_changes
+from ..instrumentation import STATS
+from ..utils.paths import INDEX
+from ._trackbase import TrackBase, tracked_mutator
+from .views import TrackedSequenceView
 
 if TYPE_CHECKING:
+    from ..observer_policy import ObserverPolicy
+    from ..sampling import SamplingPolicy
     from ..utils.changelog import ChangeLogEntry
 
 
+def _list_setitem(self: list, index: int, item: Any) -> None:
+    """Untracked `TrackedList.__setitem__`, which only accepts int indexes."""
+    if not isinstance(index, int):
+        raise TypeError(f"Tracked list index must be an int, not {type(index)}")
+    list.__setitem__(self, index, item)
+
+
+def _list_delitem(self: list, index: int) -> None:
+    """Untracked `TrackedList.__delitem__`, which only accepts int indexes."""
+    if not isinstance(index, int):
+        raise TypeError(f"Tracked list index must be an int, not {type(index)}")
+    list.__delitem__(self, index)
+
+
+def _list_truncate(self: "TrackedList", length: int) -> None:
+    """Inverse of `TrackedList.extend`: pop items until `length` remain."""
+    while len(self) > length:
+        self.pop()
+
+
+def _list_restore_order(self: "TrackedList", items: list) -> None:
+    """Inverse of `TrackedList.sort`: put the items back in their old order."""
+    self.clear()
+    self.extend(items)
+
+
 class TrackedList(TrackBase, list):
     """A list class that tracks changes to its items.
 
@@ -60,6 +92,8 @@ class TrackedList(TrackBase, list):
 
     """
 
+    _tracking_path_kind = INDEX
+
     def __init__(
         self,
         data: list | None = None,
@@ -69,6 +103,12 @@ class TrackedList(TrackBase, list):
         tracking_location: str | None = "",
         tracking_capture_snapshots: bool | None = None,
         tracking_capture_stack: bool | None = None,
+        tracking_record_history: bool | None = None,
+        tracking_stack_sample_rate: int | None = None,
+        tracking_sampling: "SamplingPolicy | None" = None,
+        tracking_coalesce_window: float | None = None,
+        tracking_observer_policy: "ObserverPolicy | None" = None,
+        tracking_thread_safe: bool | None = None,
     ) -> None:
         """Initialize the tracked list.
 
@@ -81,6 +121,22 @@ class TrackedList(TrackBase, list):
             tracking_auto_convert: Whether to automatically convert values.
             tracking_parent: The parent tracking object.
             tracking_location: The location of the tracking object.
+            tracking_capture_snapshots: Whether to store repr snapshots of the list
+                before and after each change.
+            tracking_capture_stack: Whether to capture the call stack for each change.
+            tracking_record_history: Whether the list keeps its own list of changes.
+                When False and nothing observes the list, mutations skip change
+                tracking entirely.
+            tracking_stack_sample_rate: Capture the stack for only one in this many
+                changes when stack capture is enabled.
+            tracking_sampling: Optional sampling policy limiting which changes
+                are recorded.
+            tracking_coalesce_window: Merge consecutive updates to the same
+                location within this many seconds into one change.
+            tracking_observer_policy: Optional policy timing observers and
+                isolating the container from observers that fail.
+            tracking_thread_safe: Serialize the tracked methods of the list with a
+                lock of its own, for lists shared between threads.
 
         """
         if data is None:
@@ -91,6 +147,18 @@ class TrackedList(TrackBase, list):
             extra_kwargs["tracking_capture_snapshots"] = tracking_capture_snapshots
         if tracking_capture_stack is not None:
             extra_kwargs["tracking_capture_stack"] = tracking_capture_stack
+        if tracking_record_history is not None:
+            extra_kwargs["tracking_record_history"] = tracking_record_history
+        if tracking_stack_sample_rate is not None:
+            extra_kwargs["tracking_stack_sample_rate"] = tracking_stack_sample_rate
+        if tracking_sampling is not None:
+            extra_kwargs["tracking_sampling"] = tracking_sampling
+        if tracking_coalesce_window is not None:
+            extra_kwargs["tracking_coalesce_window"] = tracking_coalesce_window
+        if tracking_observer_policy is not None:
+            extra_kwargs["tracking_observer_policy"] = tracking_observer_policy
+        if tracking_thread_safe is not None:
+            extra_kwargs["tracking_thread_safe"] = tracking_thread_safe
         TrackBase.__init__(
             self,
             tracking_auto_converted_in=tracking_auto_converted_in,
@@ -124,38 +192,27 @@ class TrackedList(TrackBase, list):
                 attribute change.
 
         """
-        if (
-            change_log_entry.tracked_item_uuid != self._tracking_uuid
-            and change_log_entry.tracked_item_uuid in self._tracking_child_tracked_items
-        ):
-            new_change = change_log_entry.copy(change_log_entry.extra["type"], self._tracking_uuid)
-            new_change.add_to_tree(
-                self._tracking_format_tree_location(
-                    self._tracking_child_tracked_items[change_log_entry.tracked_item_uuid][
-                        "location"
-                    ]
+        with self._tracking_mutex or contextlib.nullcontext():
+            child = None
+            if change_log_entry.tracked_item_uuid != self._tracking_uuid:
+                child = self._tracking_child_tracked_items.get(change_log_entry.tracked_item_uuid)
+            if child is not None:
+                new_change = change_log_entry.copy(
+                    change_log_entry.extra["type"], self._tracking_uuid
                 )
-            )
-            if "location" in new_change.extra:
-                delimiter = self._tracking_child_tracked_items[change_log_entry.tracked_item_uuid][
-                    "item"
-                ]._tracking_delimiter
-                new_change.extra["location"] = (
-                    f"{self._tracking_child_tracked_items[change_log_entry.tracked_item_uuid]['location']}{delimiter}{new_change.extra['location']}"
-                )
-            else:
-                new_change.extra["location"] = (
-                    f"{self._tracking_child_tracked_items[change_log_entry.tracked_item_uuid]['location']}"
+                new_change.add_to_tree(self._tracking_format_tree_location(child["location"]))
+                new_change.extra["location"] = self._tracking_child_path(
+                    child["location"], new_change.extra.get("location")
                 )
 
-            change_log_entry = new_change
+                change_log_entry = new_change
+                if STATS.enabled:
+                    STATS.propagation_hops += 1
 
-        if change_log_entry not in self._tracking_changes:
-            self._tracking_changes.append(change_log_entry)
-        super()._tracking_notify_observers(change_log_entry)
+            self._tracking_append_change(change_log_entry)
+            super()._tracking_notify_observers(change_log_entry)
 
-    @check_lock
-    @track_changes
+    @tracked_mutator(_list_setitem)
     def __setitem__(self, index: int, item: Any) -> None:
         """Set an item in the tracked list.
 
@@ -174,6 +231,9 @@ class TrackedList(TrackBase, list):
         if not isinstance(index, int):
             raise TypeError(f"Tracked list index must be an int, not {type(index)}")
 
+        # record the position, -1 names a different item once the list grows
+        if -len(self) <= index < 0:
+            index += len(self)
         try:
             old_item = self[index]
         except IndexError:
@@ -186,11 +246,12 @@ class TrackedList(TrackBase, list):
         if old_item:
             self._tracking_context.setdefault("removed_items", []).append(old_item)
         self._tracking_context["action"] = "update"
+        self._tracking_context["old_value"] = old_item
+        self._tracking_context["inverse"] = (TrackedList.__setitem__, (index, old_item))
         self._tracking_context["value"] = item
         self._tracking_context["location"] = index
 
-    @check_lock
-    @track_changes
+    @tracked_mutator(_list_delitem)
     def __delitem__(self, index: int) -> None:
         """Delete an item from the tracked list.
 
@@ -213,16 +274,17 @@ class TrackedList(TrackBase, list):
             raise TypeError(f"Tracked list index must be an int, not {type(index)}")
 
         old_item = self[index]
+        position = index + len(self) if index < 0 else index
         if not self._tracking_locked:
             super().__delitem__(index)
 
         self._tracking_context.setdefault("removed_items", []).append(old_item)
         self._tracking_context["action"] = "update"
         self._tracking_context["value"] = old_item
-        self._tracking_context["location"] = index
+        self._tracking_context["location"] = position
+        self._tracking_context["inverse"] = (TrackedList.insert, (position, old_item))
 
-    @check_lock
-    @track_changes
+    @tracked_mutator(list.append)
     def append(self, item: Any) -> None:
         """Append an item to the tracked list.
 
@@ -249,9 +311,9 @@ class TrackedList(TrackBase, list):
         self._tracking_context["action"] = "add"
         self._tracking_context["value"] = item
         self._tracking_context["location"] = index
+        self._tracking_context["inverse"] = (TrackedList.pop, (index,))
 
-    @check_lock
-    @track_changes
+    @tracked_mutator(list.extend)
     def extend(self, items: list) -> None:
         """Extend the tracked list with items from another list.
 
@@ -268,6 +330,7 @@ class TrackedList(TrackBase, list):
             >>> tracked_list.extend(['a', 'b'])  # Extend is tracked
 
         """
+        original_length = len(self)
         if not self._tracking_locked:
             new_data = []
             count = len(self)
@@ -288,9 +351,9 @@ class TrackedList(TrackBase, list):
         self._tracking_context["action"] = "add"
         self._tracking_context["value"] = items
         self._tracking_context["location"] = location
+        self._tracking_context["inverse"] = (_list_truncate, (original_length,))
 
-    @check_lock
-    @track_changes
+    @tracked_mutator(list.insert)
     def insert(self, index: int, item: Any) -> None:
         """Insert an item into the tracked list.
 
@@ -311,16 +374,18 @@ class TrackedList(TrackBase, list):
             >>> tracked_list.insert(5, 'a')  # Insert is tracked
 
         """
+        # the position the item ends up at, list.insert clamps the index
+        position = min(max(index + len(self) if index < 0 else index, 0), len(self))
         if not self._tracking_locked:
-            item = self._tracking_convert_value(item, index)
+            item = self._tracking_convert_value(item, position)
             super().insert(index, item)
 
         self._tracking_context["action"] = "add"
         self._tracking_context["value"] = item
-        self._tracking_context["location"] = index
+        self._tracking_context["location"] = position
+        self._tracking_context["inverse"] = (TrackedList.pop, (position,))
 
-    @check_lock
-    @track_changes
+    @tracked_mutator(list.remove)
     def remove(self, item: Any) -> None:
         """Remove an item from the tracked list.
 
@@ -353,9 +418,10 @@ class TrackedList(TrackBase, list):
         self._tracking_context["action"] = "remove"
         self._tracking_context["value"] = item
         self._tracking_context["location"] = index
+        if index is not None:
+            self._tracking_context["inverse"] = (TrackedList.insert, (index, item))
 
-    @check_lock
-    @track_changes
+    @tracked_mutator(list.pop)
     def pop(self, index: int = -1) -> Any:
         """Remove and return an item from the tracked list.
 
@@ -383,12 +449,14 @@ class TrackedList(TrackBase, list):
         """
         passed_index = index
         actual_index = len(self) - 1 if passed_index == -1 else index
+        position = index + len(self) if index < 0 else index
         item = "###^$^@$^$default###^$^@$^"
         if not self._tracking_locked:
             item = super().pop(index)
 
         if item != "###^$^@$^$default###^$^@$^":
             self._tracking_context.setdefault("removed_items", []).append(item)
+            self._tracking_context["inverse"] = (TrackedList.insert, (position, item))
         self._tracking_context["action"] = "remove"
         self._tracking_context["value"] = None if item == "###^$^@$^$default###^$^@$^" else item
         self._tracking_context["location"] = actual_index
@@ -396,8 +464,7 @@ class TrackedList(TrackBase, list):
 
         return item
 
-    @check_lock
-    @track_changes
+    @tracked_mutator(list.clear)
     def clear(self) -> None:
         """Clear all items from the tracked list.
 
@@ -412,13 +479,14 @@ class TrackedList(TrackBase, list):
         if not self._tracking_locked:
             for item in self:
                 self._tracking_context.setdefault("removed_items", []).append(item)
+            if self:
+                self._tracking_context["inverse"] = (TrackedList.extend, (list(self),))
 
             super().clear()
 
         self._tracking_context["action"] = "remove"
 
-    @check_lock
-    @track_changes
+    @tracked_mutator()
     def sort(self, key: Callable | None = None, reverse: bool = False) -> None:
         """Sort the tracked list.
 
@@ -436,14 +504,14 @@ class TrackedList(TrackBase, list):
 
         """
         if not self._tracking_locked:
+            self._tracking_context["inverse"] = (_list_restore_order, (list(self),))
             super().sort(key=key, reverse=reverse)
             for item in self._tracking_child_tracked_items:
                 self._tracking_child_tracked_items[item]["index"] = self.index(item)
 
         self._tracking_context["action"] = "update"
 
-    @check_lock
-    @track_changes
+    @tracked_mutator(list.reverse)
     def reverse(self) -> None:
         """Reverse the tracked list.
 
@@ -457,14 +525,14 @@ class TrackedList(TrackBase, list):
 
         """
         if not self._tracking_locked:
+            self._tracking_context["inverse"] = (TrackedList.reverse, ())
             super().reverse()
             for item in self._tracking_child_tracked_items:
                 self._tracking_child_tracked_items[item]["index"] = self.index(item)
 
         self._tracking_context["action"] = "update"
 
-    @check_lock
-    @track_changes
+    @tracked_mutator()
     def copy(self, untracked: bool = True) -> "list[Any] | TrackedList":
         """Copy the tracked list.
 
@@ -488,6 +556,15 @@ class TrackedList(TrackBase, list):
         self._tracking_context["action"] = "copy"
         return new_data
 
+    def _tracking_new_view(self) -> TrackedSequenceView:
+        """Create a read-only copy-on-write view of the list.
+
+        Returns:
+            A new `TrackedSequenceView` sharing storage with this list.
+
+        """
+        return TrackedSequenceView(self)
+
     def _tracking_known_uuids_tree(
         self, level: int = 0, emptybar: dict[int, bool] | None = None
     ) -> list[str]:
@@ -0,0 +1,128 @@
+"""Read-only copy-on-write views of tracked containers.
+
+A view shares storage with the live container it was created from. Before the
+container, or any tracked container below it, is modified, the view copies the
+level being changed (one shallow copy per level on the path to the change) and
+keeps serving the data as it was when the view was created. Unchanged branches
+keep being shared with the live tree.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping, Sequence
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from ._trackbase import TrackBase
+
+
+class _TrackedViewBase:
+    """Shared machinery for mapping and sequence views."""
+
+    __slots__ = ("_source", "_data", "_child_views", "__weakref__")
+
+    def __init__(self, source: TrackBase) -> None:
+        self._source = source
+        self._data: Any = None
+        self._child_views: dict[str, _TrackedViewBase] = {}
+
+    @property
+    def tracking_materialized(self) -> bool:
+        """Whether the view holds a private copy instead of sharing the source."""
+        return self._data is not None
+
+    def _tracking_wrap(self, value: Any) -> Any:
+        """Return a nested view for tracked containers, the value otherwise."""
+        from .trackeddict import TrackedDict
+        from .trackedlist import TrackedList
+
+        if isinstance(value, TrackedDict | TrackedList):
+            view = self._child_views.get(value._tracking_uuid)
+            if view is None:
+                view = value.tracking_view()
+                self._child_views[value._tracking_uuid] = view
+            return view
+        return value
+
+    def _tracking_materialize(self) -> None:  # pragma: no cover - abstract
+        raise NotImplementedError
+
+
+class TrackedMappingView(_TrackedViewBase, Mapping):
+    """Read-only mapping view of a `TrackedDict`."""
+
+    __slots__ = ()
+
+    def _tracking_materialize(self) -> None:
+        """Copy the current level of the source before it changes."""
+        if self._data is not None:
+            return
+        self._data = {key: self._tracking_wrap(value) for key, value in dict.items(self._source)}
+        self._child_views = {}
+
+    def __getitem__(self, key: Any) -> Any:
+        if self._data is not None:
+            return self._data[key]
+        return self._tracking_wrap(dict.__getitem__(self._source, key))
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._data is not None:
+            return iter(self._data)
+        # iterate over a copy of the keys so a write during iteration, which
+        # materializes the view, cannot break the iterator
+        return iter(tuple(dict.keys(self._source)))
+
+    def __len__(self) -> int:
+        if self._data is not None:
+            return len(self._data)
+        return dict.__len__(self._source)
+
+    def __contains__(self, key: object) -> bool:
+        if self._data is not None:
+            return key in self._data
+        return dict.__contains__(self._source, key)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+
+class TrackedSequenceView(_TrackedViewBase, Sequence):
+    """Read-only sequence view of a `TrackedList`."""
+
+    __slots__ = ()
+
+    def _tracking_materialize(self) -> None:
+        """Copy the current level of the source before it changes."""
+        if self._data is not None:
+            return
+        self._data = tuple(self._tracking_wrap(value) for value in list.__iter__(self._source))
+        self._child_views = {}
+
+    def __getitem__(self, index: Any) -> Any:
+        if self._data is not None:
+            return self._data[index]
+        if isinstance(index, slice):
+            return tuple(
+                self._tracking_wrap(value) for value in list.__getitem__(self._source, index)
+            )
+        return self._tracking_wrap(list.__getitem__(self._source, index))
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._data is not None:
+            return iter(self._data)
+        return iter([self._tracking_wrap(value) for value in list.__iter__(self._source)])
+
+    def __len__(self) -> int:
+        if self._data is not None:
+            return len(self._data)
+        return list.__len__(self._source)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Sequence) and not isinstance(other, str | bytes):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)!r})"
@@ -29,33 +29,49 @@ Features:
 
 Functions:
     add_to_ignore_in_stack: Add items to stack trace filter
+    is_ignored_code: Cached check whether a frame's code is filtered out
+    format_frame: Format a captured (code, line number) pair
     fix_header: Convert snake_case to Title Case for display
 
 Classes:
     ChangeLogEntry: Main class for tracking individual changes
+    ChangeInverse: The operation that reverts a change
 
 """
 
 # Standard Library
 import ast
 import datetime
-import inspect
 import pprint
+import re
+import sys
+from collections.abc import Callable, Mapping
+from pathlib import Path
+from types import CodeType
+from typing import Any
 from uuid import uuid4
 
 # 3rd Party
-
 # Project
+from ..instrumentation import STATS
+from .paths import PathSegment, TrackingPath
 
 # Globals
 _IGNORE_IN_STACK = []
+# frames from inside the package are never reported as the actor
+_PACKAGE_DIR = str(Path(__file__).resolve().parent.parent)
+_IGNORE_MATCHER = re.compile(f"^{re.escape(_PACKAGE_DIR)}")
+_IGNORED_CODE_CACHE: dict[CodeType, bool] = {}
+_STACK_DEPTH = 25
 
 
 def add_to_ignore_in_stack(tlist: list[str]) -> None:
     """Add entries to the list of items to ignore when processing stack traces.
 
     Extends the global _IGNORE_IN_STACK list with new entries that should be filtered
-    out when analyzing call stacks for change tracking purposes.
+    out when analyzing call stacks for change tracking purposes. The entries are
+    compiled into a single matcher and the per code object cache of ignore
+    decisions is reset.
 
     Args:
         tlist: List of strings to add to the ignore list. Each string represents a
@@ -63,7 +79,48 @@ def add_to_ignore_in_stack(tlist: list[str]) -> None:
             Note: this is not a regex pattern, the string will be used as is
 
     """
+    global _IGNORE_MATCHER
+
     _IGNORE_IN_STACK.extend(tlist)
+    patterns = [f"^{re.escape(_PACKAGE_DIR)}"]
+    patterns.extend(re.escape(item) for item in _IGNORE_IN_STACK)
+    _IGNORE_MATCHER = re.compile("|".join(patterns))
+    _IGNORED_CODE_CACHE.clear()
+
+
+def is_ignored_code(code: CodeType) -> bool:
+    """Return whether frames running a code object are skipped for actors.
+
+    The decision only depends on the code object's filename, so it is cached per
+    code object and a frame costs one dictionary lookup after the first time.
+
+    Args:
+        code: The code object of a stack frame.
+
+    Returns:
+        True if the frame belongs to the package or matches an ignore entry.
+
+    """
+    try:
+        return _IGNORED_CODE_CACHE[code]
+    except KeyError:
+        ignored = _IGNORE_MATCHER.search(code.co_filename) is not None
+        _IGNORED_CODE_CACHE[code] = ignored
+        return ignored
+
+
+def format_frame(code: CodeType, lineno: int) -> str:
+    """Format a captured frame the way tracebacks do.
+
+    Args:
+        code: The code object of the frame.
+        lineno: The line number the frame was executing.
+
+    Returns:
+        The formatted frame.
+
+    """
+    return f'File "{code.co_filename}", line {lineno}, in {code.co_name}'
 
 
 def fix_header(header_name: str) -> str:
@@ -82,6 +139,39 @@ def fix_header(header_name: str) -> str:
     return header_name.replace("_", " ").title()
 
 
+class ChangeInverse:
+    """The operation that reverts a recorded change.
+
+    The inverse keeps the raw values needed to undo the change (the old value of
+    an update, the removed item of a delete, ...). It is shared by an entry and
+    all copies propagated to the parents, so reverting the change from any level
+    marks it reverted everywhere.
+
+    """
+
+    __slots__ = ("target", "function", "args", "reverted")
+
+    def __init__(self, target: Any, function: Callable[..., Any], args: tuple) -> None:
+        """Initialize the inverse of a change.
+
+        Args:
+            target: The tracked object the change was made to.
+            function: The tracked method or function applying the inverse, called
+                with the target followed by `args`.
+            args: The arguments for `function`.
+
+        """
+        self.target = target
+        self.function = function
+        self.args = args
+        self.reverted = False
+
+    def apply(self) -> None:
+        """Revert the change by applying the inverse operation to the target."""
+        self.reverted = True
+        self.function(self.target, *self.args)
+
+
 class ChangeLogEntry:
     ...
     """Represents an entry in the change log for tracking modifications.
@@ -98,10 +188,13 @@ class ChangeLogEntry:
 
         Creates a new change log entry with a unique identifier and metadata. Sets up
         tracking information including timestamps, stack traces, and actor
-        identification.
+        identification. Stack frames are stored as raw (code, line number) pairs
+        and only formatted when `stack` is read.
 
         Args:
             item_uuid: Identifier for the item being tracked
+            capture_stack: Whether to capture the stack and infer the actor from
+                it when no actor is given.
             **kwargs: Additional metadata to store about the change.
                 Common keys include:
                     - type: The type of change (e.g., "update", "add", "remove")
@@ -117,11 +210,14 @@ class ChangeLogEntry:
         self.header_column_width = 17
         self.created_time = datetime.datetime.now(datetime.UTC)
         actor = self.extra.pop("actor", None)
+        self._stack: list[str] | None = None
+        self._raw_stack: list[tuple[CodeType, int]] = []
+        self.inverse: ChangeInverse | None = None
         if capture_stack and actor is None:
-            self.stack = self.get_stack()
-            self.actor = self.find_relevant_actor()
+            self._raw_stack, self.actor = self._capture_stack()
+            if STATS.enabled:
+                STATS.stack_captures += 1
         else:
-            self.stack = []
             self.actor = actor or ""
         self.tree = []
         for item in self.extra:
@@ -130,36 +226,58 @@ class ChangeLogEntry:
             if not isinstance(self.extra[item], str):
                 self.extra[item] = repr(self.extra[item])
 
+    def _capture_stack(self) -> tuple[list[tuple[CodeType, int]], str]:
+        """Capture raw frames and find the actor in a single walk of the stack.
+
+        The first frames are kept as (code, line number) pairs. The walk goes on
+        past them only if the actor has not been found yet.
+
+        Returns:
+            The raw frames and the formatted actor frame, or an empty string.
+
+        """
+        raw_stack: list[tuple[CodeType, int]] = []
+        actor = ""
+        frame = sys._getframe(2)  # skip _capture_stack and __init__
+        while frame is not None:
+            code = frame.f_code
+            if len(raw_stack) < _STACK_DEPTH:
+                raw_stack.append((code, frame.f_lineno))
+            if not actor and not is_ignored_code(code):
+                actor = format_frame(code, frame.f_lineno)
+            if actor and len(raw_stack) >= _STACK_DEPTH:
+                break
+            frame = frame.f_back
+        return raw_stack, actor
+
+    @property
+    def stack(self) -> list[str]:
+        """Return the captured stack, formatting it on first access."""
+        if self._stack is None:
+            self._stack = [format_frame(code, lineno) for code, lineno in self._raw_stack]
+        return self._stack
+
+    @stack.setter
+    def stack(self, value: list[str]) -> None:
+        self._stack = list(value)
+        self._raw_stack = []
+
     def find_relevant_actor(self) -> str:
         """Walk the stack to find the first non-tracking frame."""
-        frame = inspect.currentframe()
-        if not frame:
-            return ""
-        # Skip frames inside ChangeLogEntry creation
-        frame = frame.f_back
-        while frame:
-            code = frame.f_code
-            filename = code.co_filename
-            if not any(ignore in filename for ignore in _IGNORE_IN_STACK):
-                return f'File "{filename}", line {frame.f_lineno}, in {code.co_name}'
+        frame = sys._getframe(1)
+        while frame is not None:
+            if not is_ignored_code(frame.f_code):
+                return format_frame(frame.f_code, frame.f_lineno)
             frame = frame.f_back
         return ""
 
     def get_stack(self) -> list[str]:
         """Retrieve the current stack trace in a lightweight manner."""
         stack = []
-        frame = inspect.currentframe()
-        if not frame:
-            return stack
-        frame = frame.f_back  # skip get_stack
-        depth = 0
-        while frame and depth < 25:
-            stack.append(
-                f'File "{frame.f_code.co_filename}", '
-                f"line {frame.f_lineno}, in {frame.f_code.co_name}"
-            )
+        frame = sys._getframe(1)  # skip get_stack
+        while frame is not None and len(stack) < _STACK_DEPTH:
+            stack.append(format_frame(frame.f_code, frame.f_lineno))
             frame = frame.f_back
-            depth += 1
         return stack
 
     def __repr__(self) -> str:
@@ -226,11 +344,13 @@ class ChangeLogEntry:
         """
         extra = self.extra.copy()
         extra["type"] = new_type
-        new_log = ChangeLogEntry(new_item_uuid, **extra)
+        new_log = ChangeLogEntry(new_item_uuid, capture_stack=False, **extra)
         new_log.created_time = self.created_time
-        new_log.stack = self.stack
+        new_log._raw_stack = self._raw_stack
+        new_log._stack = self._stack
         new_log.actor = self.actor
         new_log.tree = self.tree
+        new_log.inverse = self.inverse
         return new_log
 
     def format_detailed(self, show_stack: bool = False, data_lines_to_show: int = 10) -> list[str]:
@@ -306,16 +426,59 @@ class ChangeLogEntry:
         return tmsg
 
     def to_dict(self) -> dict[str, object]:
-        """Serialize the change log entry to a JSON-friendly dict."""
-        return {
+        """Serialize the change log entry to a JSON-friendly dict.
+
+        The location is rendered to a string here, its segments are kept in
+        "path" as [kind, value] pairs.
+        """
+        extra = self.extra.copy()
+        data: dict[str, object] = {
             "uuid": self.uuid,
             "tracked_item_uuid": self.tracked_item_uuid,
             "created_time": self.created_time.isoformat(),
             "actor": self.actor,
             "stack": self.stack,
             "tree": self.tree,
-            "extra": self.extra.copy(),
+            "extra": extra,
         }
+        location = extra.get("location")
+        if isinstance(location, TrackingPath):
+            extra["location"] = location.render()
+            data["path"] = location.to_json()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "ChangeLogEntry":
+        """Rebuild a change log entry from the output of `to_dict`.
+
+        The location is restored as a `TrackingPath` when its segments were
+        serialized in "path". Inverse operations are not serialized, so a rebuilt
+        entry cannot be undone.
+
+        Args:
+            data: A dict produced by `to_dict`, e.g. read back from a JSONL file.
+
+        Returns:
+            The rebuilt change log entry, with its original uuid and timestamp.
+
+        """
+        extra = dict(data.get("extra") or {})
+        path = data.get("path")
+        if path:
+            extra["location"] = TrackingPath(PathSegment(kind, value) for kind, value in path)
+        entry = cls(
+            str(data.get("tracked_item_uuid", "")),
+            capture_stack=False,
+            actor=data.get("actor") or None,
+            **extra,
+        )
+        entry.uuid = str(data.get("uuid") or entry.uuid)
+        if data.get("created_time"):
+            entry.created_time = datetime.datetime.fromisoformat(str(data["created_time"]))
+        if data.get("stack"):
+            entry.stack = list(data["stack"])  # type: ignore[arg-type]
+        entry.tree = list(data.get("tree") or [])  # type: ignore[call-overload]
+        return entry
 
     def format_data(self, name: str, data_lines_to_show: int) -> list[str]:
         """Format the data for a given attribute or extra metadata.
@@ -334,7 +497,9 @@ class ChangeLogEntry:
         """
         data = getattr(self, name, self.extra.get(name, "-#@$%##$"))
 
-        if data == "-#@$%##$":
+        if isinstance(data, TrackingPath):
+            data = data.render()
+        elif data == "-#@$%##$":
             return []
 
         header = fix_header(name)
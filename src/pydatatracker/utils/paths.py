@@ -0,0 +1,183 @@
+# Project: bastproxy
+# Filename: pydatatracker/utils/paths.py
+#
+# File Description: Structured locations of changes in tracked trees
+#
+# By: Bast
+"""Structured locations of changes within a tree of tracked objects.
+
+Change log entries record where a change happened as a `TrackingPath`, a tuple
+of typed segments (dictionary keys, list indexes and attribute names) starting
+at the object that holds the history. Strings such as ``users:alice|[0]`` are
+only rendered when a path is printed, serialized, hashed or compared, so
+propagating a change to a parent only prepends one segment, and keys containing
+delimiter characters stay unambiguous.
+
+Key Components:
+    - PathSegment: One typed step of a path
+    - TrackingPath: The tuple of segments recorded in `ChangeLogEntry.extra`
+
+Features:
+    - Lazy rendering with the delimiter of each container type
+    - Prefix matching on raw keys without any string parsing
+    - Comparison with the rendered strings used by earlier releases
+
+Classes:
+    PathSegment: A key, index or attribute segment
+    TrackingPath: A location made of path segments
+
+"""
+
+# Standard Library
+from collections.abc import Hashable, Iterable
+from typing import Any, NamedTuple
+
+# 3rd Party
+# Project
+
+KEY = "key"
+INDEX = "index"
+ATTRIBUTE = "attribute"
+
+# delimiter rendered in front of a segment, by the kind of container holding it
+DELIMITERS = {KEY: ":", INDEX: "|", ATTRIBUTE: "."}
+
+
+class PathSegment(NamedTuple):
+    """One step of a path: a dictionary key, list index or attribute name."""
+
+    kind: str
+    value: Hashable
+
+
+class TrackingPath(tuple):
+    """The location of a change as a tuple of `PathSegment`s.
+
+    Paths compare equal to paths with the same segments and to their rendered
+    string (so ``"name"`` or ``"users:alice"`` keep working), and hash like that
+    string. Raw keys are not compared, use `keys` and `startswith` to inspect
+    paths without rendering them.
+
+    Example:
+        >>> path = TrackingPath.of(KEY, "users").child(KEY, "alice")
+        >>> str(path), path.keys, path.startswith(["users"])
+        ('users:alice', ('users', 'alice'), True)
+
+    """
+
+    # no __slots__: tuple subclasses cannot have slots, and the rendered string
+    # is cached in the instance dict as `_rendered` (paths are immutable)
+    _rendered: str
+
+    @classmethod
+    def of(cls, kind: str, value: Hashable) -> "TrackingPath":
+        """Create a path with a single segment.
+
+        Args:
+            kind: The segment kind, `KEY`, `INDEX` or `ATTRIBUTE`.
+            value: The key, index or attribute name.
+
+        Returns:
+            The new path.
+
+        """
+        return tuple.__new__(cls, (PathSegment(kind, value),))
+
+    def prepend(self, kind: str, value: Hashable) -> "TrackingPath":
+        """Return this path below a new first segment.
+
+        Args:
+            kind: The kind of the new segment.
+            value: The key, index or attribute name of the new segment.
+
+        Returns:
+            The new path.
+
+        """
+        return tuple.__new__(TrackingPath, (PathSegment(kind, value), *self))
+
+    def child(self, kind: str, value: Hashable) -> "TrackingPath":
+        """Return this path extended by one segment.
+
+        Args:
+            kind: The kind of the new segment.
+            value: The key, index or attribute name of the new segment.
+
+        Returns:
+            The new path.
+
+        """
+        return tuple.__new__(TrackingPath, (*self, PathSegment(kind, value)))
+
+    @property
+    def keys(self) -> tuple[Hashable, ...]:
+        """The raw keys, indexes and attribute names of the path."""
+        return tuple(segment.value for segment in self)
+
+    def startswith(self, prefix: "TrackingPath | Iterable[Hashable]") -> bool:
+        """Return True if the path starts with `prefix`.
+
+        Args:
+            prefix: A `TrackingPath`, compared segment by segment, or a sequence
+                of raw keys, compared with the values of the segments.
+
+        Returns:
+            Whether the path is `prefix` or lies below it.
+
+        """
+        if isinstance(prefix, TrackingPath):
+            return tuple.__getitem__(self, slice(0, len(prefix))) == tuple(prefix)
+        prefix = tuple(prefix)
+        if len(prefix) > len(self):
+            return False
+        return all(segment.value == key for segment, key in zip(self, prefix, strict=False))
+
+    def render(self) -> str:
+        """Render the path with the delimiter of each container type.
+
+        The string is rendered once per path and cached, hashing a path hashes
+        it (and a string caches its own hash).
+        """
+        try:
+            return self._rendered
+        except AttributeError:
+            pass
+        parts = [str(self[0].value)] if self else []
+        for segment in tuple.__getitem__(self, slice(1, None)):
+            parts.append(DELIMITERS[segment.kind])
+            parts.append(str(segment.value))
+        self._rendered = rendered = "".join(parts)
+        return rendered
+
+    __str__ = render
+
+    def to_json(self) -> list[list[Any]]:
+        """Return the segments as JSON friendly [kind, value] pairs."""
+        return [
+            [
+                segment.kind,
+                segment.value
+                if isinstance(segment.value, str | int | float | bool) or segment.value is None
+                else repr(segment.value),
+            ]
+            for segment in self
+        ]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, TrackingPath):
+            # keys such as 1, 1.0 and True are equal but render differently,
+            # equal paths must render alike to hash alike
+            return tuple.__eq__(self, other) and self.render() == other.render()
+        if isinstance(other, str):
+            return self.render() == other
+        return NotImplemented
+
+    def __ne__(self, other: object) -> bool:
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __hash__(self) -> int:
+        return hash(self.render())
+
+    def __repr__(self) -> str:
+        return repr(self.render())
@@ -0,0 +1,365 @@
+# Project: bastproxy
+# Filename: pydatatracker/utils/persistent.py
+#
+# File Description: Persistent (immutable, structurally shared) mapping
+#
+# By: Bast
+"""Persistent mapping used to keep cheap versions of tracked dictionaries.
+
+This module provides `PersistentMap`, an immutable mapping implemented as a hash
+array mapped trie (HAMT). Every update returns a new map in O(log n) that shares
+all unchanged nodes with the map it was derived from, so keeping many versions of
+a large dictionary costs memory proportional to the number of changes, not to the
+number of versions times the size of the dictionary.
+
+Key Components:
+    - PersistentMap: Immutable mapping with `set`, `delete` and `update`
+    - DictVersion: One committed version of a versioned `TrackedDict`
+
+Features:
+    - O(log32 n) lookups and updates
+    - Structural sharing between versions
+    - `diff` that skips shared subtrees, so comparing two close versions costs
+      time proportional to their differences
+
+Classes:
+    PersistentMap: Immutable hash array mapped trie
+    DictVersion: Version number, timestamp and data of a dictionary version
+
+"""
+
+# Standard Library
+import datetime
+from collections.abc import Hashable, Iterable, Iterator, Mapping
+from typing import Any, NamedTuple
+
+# 3rd Party
+# Project
+
+_BITS = 5
+_MASK = (1 << _BITS) - 1
+_HASH_MASK = (1 << 64) - 1
+_MISSING = object()
+
+
+def _hash(key: Hashable) -> int:
+    """Return the hash of a key as a non-negative 64 bit integer."""
+    return hash(key) & _HASH_MASK
+
+
+class _BitmapNode:
+    """Trie node holding up to 32 leaves ((key, value) tuples) or child nodes."""
+
+    __slots__ = ("bitmap", "entries")
+
+    def __init__(self, bitmap: int, entries: tuple) -> None:
+        self.bitmap = bitmap
+        self.entries = entries
+
+    def get(self, key: Hashable, key_hash: int, shift: int) -> Any:
+        bit = 1 << ((key_hash >> shift) & _MASK)
+        if not self.bitmap & bit:
+            return _MISSING
+        entry = self.entries[(self.bitmap & (bit - 1)).bit_count()]
+        if type(entry) is tuple:
+            return entry[1] if entry[0] is key or entry[0] == key else _MISSING
+        return entry.get(key, key_hash, shift + _BITS)
+
+    def _replace(self, index: int, entry: Any) -> "_BitmapNode":
+        entries = self.entries
+        return _BitmapNode(self.bitmap, (*entries[:index], entry, *entries[index + 1 :]))
+
+    def assoc(self, key: Hashable, key_hash: int, value: Any, shift: int) -> tuple[Any, bool]:
+        bit = 1 << ((key_hash >> shift) & _MASK)
+        index = (self.bitmap & (bit - 1)).bit_count()
+        entries = self.entries
+        if not self.bitmap & bit:
+            new_entries = (*entries[:index], (key, value), *entries[index:])
+            return _BitmapNode(self.bitmap | bit, new_entries), True
+        entry = entries[index]
+        if type(entry) is tuple:
+            entry_key, entry_value = entry
+            if entry_key is key or entry_key == key:
+                if entry_value is value:
+                    return self, False
+                return self._replace(index, (key, value)), False
+            node = _make_node(
+                entry_key, _hash(entry_key), entry_value, key, key_hash, value, shift + _BITS
+            )
+            return self._replace(index, node), True
+        node, added = entry.assoc(key, key_hash, value, shift + _BITS)
+        if node is entry:
+            return self, False
+        return self._replace(index, node), added
+
+    def without(self, key: Hashable, key_hash: int, shift: int) -> tuple[Any, bool]:
+        bit = 1 << ((key_hash >> shift) & _MASK)
+        if not self.bitmap & bit:
+            return self, False
+        index = (self.bitmap & (bit - 1)).bit_count()
+        entry = self.entries[index]
+        if type(entry) is tuple:
+            if not (entry[0] is key or entry[0] == key):
+                return self, False
+            replacement = None
+        else:
+            replacement, removed = entry.without(key, key_hash, shift + _BITS)
+            if not removed:
+                return self, False
+            # pull a lone leaf up so paths stay as short as possible
+            if (
+                type(replacement) is _BitmapNode
+                and len(replacement.entries) == 1
+                and type(replacement.entries[0]) is tuple
+            ):
+                replacement = replacement.entries[0]
+        if replacement is not None:
+            return self._replace(index, replacement), True
+        if len(self.entries) == 1:
+            return None, True
+        entries = self.entries
+        return _BitmapNode(self.bitmap ^ bit, (*entries[:index], *entries[index + 1 :])), True
+
+    def items(self) -> Iterator[tuple[Hashable, Any]]:
+        for entry in self.entries:
+            if type(entry) is tuple:
+                yield entry
+            else:
+                yield from entry.items()
+
+
+class _CollisionNode:
+    """Node holding the entries of keys whose full hashes are equal."""
+
+    __slots__ = ("key_hash", "entries")
+
+    def __init__(self, key_hash: int, entries: tuple) -> None:
+        self.key_hash = key_hash
+        self.entries = entries
+
+    def _find(self, key: Hashable) -> int:
+        for index, (entry_key, _) in enumerate(self.entries):
+            if entry_key is key or entry_key == key:
+                return index
+        return -1
+
+    def get(self, key: Hashable, key_hash: int, shift: int) -> Any:
+        index = self._find(key) if key_hash == self.key_hash else -1
+        return _MISSING if index < 0 else self.entries[index][1]
+
+    def assoc(self, key: Hashable, key_hash: int, value: Any, shift: int) -> tuple[Any, bool]:
+        if key_hash != self.key_hash:
+            node = _BitmapNode(1 << ((self.key_hash >> shift) & _MASK), (self,))
+            return node.assoc(key, key_hash, value, shift)
+        index = self._find(key)
+        if index < 0:
+            return _CollisionNode(key_hash, (*self.entries, (key, value))), True
+        if self.entries[index][1] is value:
+            return self, False
+        entries = self.entries
+        new_entries = (*entries[:index], (key, value), *entries[index + 1 :])
+        return _CollisionNode(key_hash, new_entries), False
+
+    def without(self, key: Hashable, key_hash: int, shift: int) -> tuple[Any, bool]:
+        index = self._find(key) if key_hash == self.key_hash else -1
+        if index < 0:
+            return self, False
+        entries = (*self.entries[:index], *self.entries[index + 1 :])
+        if len(entries) == 1:
+            return entries[0], True
+        return _CollisionNode(key_hash, entries), True
+
+    def items(self) -> Iterator[tuple[Hashable, Any]]:
+        yield from self.entries
+
+
+def _make_node(
+    key1: Hashable, hash1: int, value1: Any, key2: Hashable, hash2: int, value2: Any, shift: int
+) -> Any:
+    """Create the smallest node holding two entries that share a slot."""
+    if hash1 == hash2:
+        return _CollisionNode(hash1, ((key1, value1), (key2, value2)))
+    node, _ = _EMPTY_NODE.assoc(key1, hash1, value1, shift)
+    node, _ = node.assoc(key2, hash2, value2, shift)
+    return node
+
+
+_EMPTY_NODE = _BitmapNode(0, ())
+
+
+def _entry_items(entry: Any) -> Iterator[tuple[Hashable, Any]]:
+    """Iterate over the items of a leaf or a node."""
+    if type(entry) is tuple:
+        yield entry
+    else:
+        yield from entry.items()
+
+
+def _diff_entries(first: Any, second: Any, shift: int) -> Iterator[Hashable]:
+    """Yield the keys bound differently in two entries, skipping shared nodes."""
+    if first is second:
+        return
+    if type(first) is _BitmapNode and type(second) is _BitmapNode:
+        first_entries, second_entries = first.entries, second.entries
+        for position in range(1 << _BITS):
+            bit = 1 << position
+            in_first, in_second = first.bitmap & bit, second.bitmap & bit
+            if not in_first and not in_second:
+                continue
+            first_entry = (
+                first_entries[(first.bitmap & (bit - 1)).bit_count()] if in_first else None
+            )
+            second_entry = (
+                second_entries[(second.bitmap & (bit - 1)).bit_count()] if in_second else None
+            )
+            yield from _diff_entries(first_entry, second_entry, shift + _BITS)
+        return
+    first_items = dict(_entry_items(first)) if first is not None else {}
+    second_items = dict(_entry_items(second)) if second is not None else {}
+    for key, value in first_items.items():
+        if second_items.get(key, _MISSING) is not value:
+            yield key
+    for key in second_items:
+        if key not in first_items:
+            yield key
+
+
+class PersistentMap(Mapping):
+    """Immutable mapping sharing structure between versions.
+
+    `set`, `delete` and `update` return new maps and leave the original intact.
+    Values are stored as given, mutable values are shared between versions.
+
+    Example:
+        >>> first = PersistentMap({'a': 1})
+        >>> second = first.set('b', 2)
+        >>> dict(first), dict(second)
+        ({'a': 1}, {'a': 1, 'b': 2})
+
+    """
+
+    __slots__ = ("_root", "_size")
+
+    def __init__(self, items: Mapping | Iterable[tuple[Hashable, Any]] | None = None) -> None:
+        """Create a map, optionally filled from a mapping or (key, value) pairs.
+
+        Args:
+            items: The initial contents of the map.
+
+        """
+        self._root = _EMPTY_NODE
+        self._size = 0
+        if items:
+            pairs = items.items() if isinstance(items, Mapping) else items
+            root, size = self._root, 0
+            for key, value in pairs:
+                root, added = root.assoc(key, _hash(key), value, 0)
+                size += added
+            self._root, self._size = root, size
+
+    @classmethod
+    def _from_root(cls, root: _BitmapNode | None, size: int) -> "PersistentMap":
+        new_map = cls.__new__(cls)
+        new_map._root = _EMPTY_NODE if root is None else root
+        new_map._size = size
+        return new_map
+
+    def __getitem__(self, key: Hashable) -> Any:
+        value = self._root.get(key, _hash(key), 0)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return self._root.get(key, _hash(key), 0) is not _MISSING  # type: ignore[arg-type]
+
+    def __iter__(self) -> Iterator[Hashable]:
+        for key, _ in self._root.items():
+            yield key
+
+    def __len__(self) -> int:
+        return self._size
+
+    def items(self):  # type: ignore[override]
+        """Return the (key, value) pairs of the map."""
+        return dict(self._root.items()).items()
+
+    def set(self, key: Hashable, value: Any) -> "PersistentMap":
+        """Return a new map with `key` bound to `value`.
+
+        Args:
+            key: The key to bind.
+            value: The value to bind it to.
+
+        Returns:
+            The new map, or this map if the key is already bound to `value`.
+
+        """
+        root, added = self._root.assoc(key, _hash(key), value, 0)
+        if root is self._root:
+            return self
+        return self._from_root(root, self._size + added)
+
+    def delete(self, key: Hashable) -> "PersistentMap":
+        """Return a new map without `key`.
+
+        Args:
+            key: The key to remove.
+
+        Returns:
+            The new map.
+
+        Raises:
+            KeyError: If the key is not in the map.
+
+        """
+        root, removed = self._root.without(key, _hash(key), 0)
+        if not removed:
+            raise KeyError(key)
+        return self._from_root(root, self._size - 1)
+
+    def update(self, items: Mapping | Iterable[tuple[Hashable, Any]]) -> "PersistentMap":
+        """Return a new map with all pairs from `items` bound.
+
+        Args:
+            items: A mapping or an iterable of (key, value) pairs.
+
+        Returns:
+            The new map.
+
+        """
+        pairs = items.items() if isinstance(items, Mapping) else items
+        root, size = self._root, self._size
+        for key, value in pairs:
+            root, added = root.assoc(key, _hash(key), value, 0)
+            size += added
+        if root is self._root:
+            return self
+        return self._from_root(root, size)
+
+    def diff(self, other: "PersistentMap") -> Iterator[Hashable]:
+        """Yield the keys that are bound differently in `other`.
+
+        Subtrees shared by both maps are skipped, so comparing two versions
+        derived from each other costs time proportional to their differences.
+
+        Args:
+            other: The map to compare with.
+
+        Yields:
+            Keys that are missing from one of the maps or bound to a different
+            object.
+
+        """
+        yield from _diff_entries(self._root, other._root, 0)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self._root.items())!r})"
+
+
+class DictVersion(NamedTuple):
+    """One committed version of a versioned `TrackedDict`."""
+
+    number: int
+    created_time: datetime.datetime
+    data: PersistentMap
@@ -0,0 +1,153 @@
+import datetime
+import io
+import json
+
+from pydatatracker import TrackedDict
+from pydatatracker.cli import TopCounter, iter_lines, last_lines, main, parse_time, write_records
+from pydatatracker.exporters import JsonLinesExporter
+from pydatatracker.utils.changelog import ChangeLogEntry
+
+
+def _write_log(path):
+    exporter = JsonLinesExporter(path)
+    tracked = TrackedDict(tracking_capture_snapshots=False)
+    tracked.tracking_add_observer(exporter)
+    tracked["name"] = "alice"
+    tracked["name"] = "bob"
+    tracked["age"] = 3
+    del tracked["age"]
+    return path
+
+
+def _records(text):
+    return [json.loads(line) for line in text.splitlines()]
+
+
+def test_show_filters_by_action_and_location(tmp_path, capsys):
+    log = _write_log(tmp_path / "changes.jsonl")
+    with log.open("a") as handle:
+        handle.write("not json\n\n")
+
+    assert main(["show", str(log), "--action", "update", "--location", "na*"]) == 0
+    records = _records(capsys.readouterr().out)
+    assert [record["extra"]["value"] for record in records] == ["bob"]
+
+
+def test_show_time_filters(tmp_path, capsys):
+    log = _write_log(tmp_path / "changes.jsonl")
+
+    main(["show", str(log), "--since", "1h"])
+    assert len(_records(capsys.readouterr().out)) == 4
+    main(["show", str(log), "--until", "2000-01-01T00:00:00"])
+    assert capsys.readouterr().out == ""
+
+
+def test_show_table_and_detailed_formats(tmp_path, capsys):
+    log = _write_log(tmp_path / "changes.jsonl")
+
+    main(["show", str(log), "--location", "age", "--format", "table"])
+    header, *rows = capsys.readouterr().out.splitlines()
+    assert header.split() == ["created_time", "action", "type", "location", "value"]
+    assert [row.split()[1:4] for row in rows] == [["add", "TrackedDict", "age"]] + [
+        ["update", "TrackedDict", "age"]
+    ]
+
+    main(["show", str(log), "--action", "add", "--location", "age", "--format", "detailed"])
+    out = capsys.readouterr().out
+    assert "Location" in out and "age" in out
+
+
+def test_tail_prints_last_records(tmp_path, capsys):
+    log = _write_log(tmp_path / "changes.jsonl")
+
+    main(["tail", "-n", "2", str(log)])
+    assert [r["extra"]["action"] for r in _records(capsys.readouterr().out)] == [
+        "add",
+        "update",
+    ]
+    main(["tail", "-n", "1", "--action", "update", "--location", "name", str(log)])
+    assert [r["extra"]["value"] for r in _records(capsys.readouterr().out)] == ["bob"]
+
+
+def test_last_lines_reads_backwards_across_blocks(tmp_path):
+    path = tmp_path / "lines.txt"
+    path.write_bytes(b"".join(b"line%d\n" % i for i in range(100)))
+    with path.open("rb") as handle:
+        assert last_lines(handle, 3, block_size=7) == [b"line97\n", b"line98\n", b"line99\n"]
+        assert handle.tell() == path.stat().st_size
+
+
+def test_iter_lines_follows_appended_data(tmp_path):
+    path = tmp_path / "growing.jsonl"
+    path.write_bytes(b"one\n")
+    with path.open("rb") as handle, path.open("ab", buffering=0) as writer:
+        lines = iter_lines(handle, follow=True, interval=0.001)
+        assert next(lines) == b"one\n"
+        writer.write(b"tw")
+        writer.write(b"o\n")
+        assert next(lines) == b"two\n"
+
+
+def test_stats_aggregates(tmp_path, capsys):
+    log = _write_log(tmp_path / "changes.jsonl")
+
+    assert main(["stats", str(log)]) == 0
+    summary = json.loads(capsys.readouterr().out)
+    assert summary["count"] == 4
+    assert summary["actions"] == {"add": 2, "update": 2}
+    assert summary["locations"] == {"name": 2, "age": 2}
+    assert summary["first"] <= summary["last"]
+
+
+def test_top_counter_keeps_frequent_keys_in_bounded_memory():
+    counter = TopCounter(8)
+    for index in range(1000):
+        counter.add("hot" if index % 3 == 0 else f"cold{index}")
+        if index % 5 == 0:
+            counter.add("warm")
+
+    assert len(counter.counts) == 8
+    assert [key for key, _ in counter.most_common(2)] == ["hot", "warm"]
+    assert counter.most_common(1)[0][1] >= 334
+
+    exact = TopCounter(10)
+    for key in "abacab":
+        exact.add(key)
+    assert exact.most_common(3) == [("a", 3), ("b", 2), ("c", 1)]
+
+
+def test_write_records_flushes_only_when_asked():
+    class Output(io.StringIO):
+        flushes = 0
+
+        def flush(self):
+            self.flushes += 1
+
+    records = [(b'{"extra": {}}\n', {"extra": {}})] * 3
+    out = Output()
+    write_records(records, "json", out)
+    assert out.flushes == 0 and len(out.getvalue().splitlines()) == 3
+    write_records(records, "json", out, flush=True)
+    assert out.flushes == 3
+
+
+def test_merge_interleaves_logs(tmp_path, capsys):
+    first = _write_log(tmp_path / "first.jsonl")
+    second = _write_log(tmp_path / "second.jsonl")
+
+    assert main(["merge", str(second), str(first), "--location", "name"]) == 0
+    records = _records(capsys.readouterr().out)
+    times = [record["created_time"] for record in records]
+    assert len(records) == 4 and times == sorted(times)
+
+
+def test_parse_time_accepts_ages_and_iso():
+    now = datetime.datetime.now(datetime.UTC)
+    assert abs((now - parse_time("2h")).total_seconds() - 7200) < 5
+    assert parse_time("2024-01-01T00:00:00").tzinfo is datetime.UTC
+
+
+def test_demo_prints_a_change(capsys):
+    main(["demo"])
+    entry = ChangeLogEntry.from_dict(json.loads(capsys.readouterr().out.splitlines()[-1]))
+    assert entry.extra["location"].render() == "status"
@@ -0,0 +1,297 @@
+import json
+import random
+from ast import literal_eval
+
+import pytest
+
+from pydatatracker import TrackedDict
+from pydatatracker.cli import main
+from pydatatracker.compaction import ChangeKey, change_keys, compact_log
+from pydatatracker.exporters import JsonLinesExporter
+
+
+def _records(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def _value(text):
+    # strings are serialized as they are, everything else as its repr
+    try:
+        return literal_eval(text)
+    except (ValueError, SyntaxError):
+        return text
+
+
+def _rebuild(records):
+    """Apply serialized changes, in order, to a new TrackedDict."""
+
+    state = TrackedDict(tracking_auto_convert=True)
+    for record in records:
+        extra = record["extra"]
+        action, method = extra["action"], extra.get("method")
+        keys = [value for _, value in record.get("path", [])]
+        if action in ("lock", "unlock"):
+            getattr(state, action)()
+            continue
+        if action == "init":
+            if not keys:
+                state.update(literal_eval(extra["init_data"]))
+            continue
+        own_location = method not in ("update", "clear", "sort", "reverse")
+        try:
+            container = state
+            for key in keys[:-1] if own_location else keys:
+                container = container[key]
+            if method == "__setitem__":
+                container[keys[-1]] = _value(extra["value"])
+            elif method in ("__delitem__", "pop", "remove"):
+                del container[keys[-1]]
+            elif method == "setdefault":
+                container.setdefault(keys[-1], _value(extra["default"]))
+            elif method == "append":
+                container.append(_value(extra["value"]))
+            elif method == "insert":
+                container.insert(keys[-1], _value(extra["value"]))
+            elif method == "update":
+                container.update(_value(extra["value"]))
+            elif method == "clear":
+                container.clear()
+            elif method == "sort":
+                container.sort()
+            else:
+                raise AssertionError(f"unexpected change {method}")
+        except (KeyError, IndexError):
+            # recorded by a new child while its value was converted, before
+            # the change attaching it to the tree
+            continue
+    return state
+
+
+def _assert_same_state(original, compacted, tracked=None):
+    rebuilt = _rebuild(original)
+    assert _rebuild(compacted) == rebuilt
+    assert _rebuild(compacted)._tracking_locked == rebuilt._tracking_locked
+    if tracked is not None:
+        assert rebuilt == tracked
+        assert rebuilt._tracking_locked == tracked._tracking_locked
+
+
+def _build_log(path, steps=300, seed=7):
+    rng = random.Random(seed)
+    # children of an empty container are not attached, so the root is never empty
+    tracked = TrackedDict({"seed": 0}, tracking_auto_convert=True, tracking_capture_snapshots=False)
+    tracked.tracking_add_observer(JsonLinesExporter(path))
+    # the initial data is not in the log
+    tracked["seed"] = 0
+    users = ["alice", "bob", "carol"]
+    for step in range(steps):
+        user = rng.choice(users)
+        choice = rng.random()
+        if choice < 0.01:
+            tracked.clear()
+            tracked["seed"] = step
+        elif choice < 0.03:
+            tracked.lock()
+            tracked.unlock()
+        elif choice < 0.08:
+            tracked.update({user: {"name": user, "tags": [step]}, "step": step})
+        elif choice < 0.12:
+            tracked[user] = {"name": user, "tags": []}
+        elif user not in tracked:
+            continue
+        elif choice < 0.45:
+            tracked[user]["name"] = f"{user}{step}"
+        elif choice < 0.6:
+            tracked[user]["tags"].append(step)
+        elif choice < 0.65:
+            tracked[user]["tags"].insert(0, step)
+        elif choice < 0.7 and tracked[user]["tags"]:
+            tracked[user]["tags"].pop(0)
+        elif choice < 0.75 and tracked[user]["tags"]:
+            tracked[user]["tags"][-1] = step
+        elif choice < 0.78:
+            tracked[user]["tags"].sort()
+        elif choice < 0.85:
+            tracked[user].update({"score": step, "level": step % 3})
+        elif choice < 0.9:
+            tracked[user].setdefault("score", step)
+        elif choice < 0.96:
+            tracked[user]["score"] = step
+        else:
+            del tracked[user]
+    return tracked
+
+
+def test_compaction_keeps_latest_change_per_location(tmp_path):
+    log = tmp_path / "changes.jsonl"
+    tracked = TrackedDict(tracking_capture_snapshots=False)
+    tracked.tracking_add_observer(JsonLinesExporter(log))
+    for value in range(5):
+        tracked["counter"] = value
+    tracked["other"] = "x"
+
+    result = compact_log(log, tmp_path / "compacted.jsonl")
+
+    records = _records(tmp_path / "compacted.jsonl")
+    values = [(r["extra"]["location"], r["extra"]["value"]) for r in records]
+    assert values == [("counter", "4"), ("other", "x")]
+    assert result.records_in == 6
+    assert result.records_out == 2
+
+
+def test_changes_without_a_replaced_location_are_kept(tmp_path):
+    log = tmp_path / "changes.jsonl"
+    tracked = TrackedDict({"cfg": {"host": "x"}}, tracking_auto_convert=True)
+    tracked.tracking_add_observer(JsonLinesExporter(log))
+    tracked["a"] = 1
+    tracked["cfg"]["host"] = "h"
+    tracked.update({"b": 2, "c": 3})
+    tracked.lock()
+    tracked.unlock()
+    tracked["b"] = 4
+    original = _records(log)
+
+    result = compact_log(log, tmp_path / "out.jsonl")
+
+    compacted = _records(tmp_path / "out.jsonl")
+    assert result.records_in == result.records_out == 6
+    assert compacted == original
+    _assert_same_state(original, compacted)
+
+    tracked["c"] = 5
+    compact_log(log, log)
+    methods = [r["extra"].get("method") or r["extra"]["action"] for r in _records(log)]
+    assert methods == ["__setitem__", "__setitem__", "lock", "unlock", "__setitem__", "__setitem__"]
+
+
+def test_ancestor_change_drops_older_descendants(tmp_path):
+    log = tmp_path / "changes.jsonl"
+    tracked = TrackedDict(tracking_auto_convert=True, tracking_capture_snapshots=False)
+    tracked.tracking_add_observer(JsonLinesExporter(log))
+    tracked["user"] = {"name": "a"}
+    tracked["user"]["name"] = "b"
+    tracked["user"] = {"name": "c"}
+    tracked.clear()
+    tracked["later"] = 1
+    original = _records(log)
+
+    compact_log(log, log)
+
+    records = _records(log)
+    assert [r["extra"]["method"] for r in records] == ["clear", "__setitem__"]
+    _assert_same_state(original, records, tracked)
+
+
+def test_moved_list_items_keep_earlier_index_changes(tmp_path):
+    log = tmp_path / "changes.jsonl"
+    tracked = TrackedDict({"tags": ["a", "b", "c"]}, tracking_auto_convert=True)
+    tracked.tracking_add_observer(JsonLinesExporter(log))
+    tags = tracked["tags"]
+    tags[1] = "x"
+    tags[1] = "y"
+    tags.insert(0, "first")
+    tags[1] = "z"
+    tags.append("last")
+    tags[4] = "end"
+    original = _records(log)
+
+    compact_log(log, tmp_path / "out.jsonl")
+
+    compacted = _records(tmp_path / "out.jsonl")
+    assert [r["extra"]["value"] for r in compacted] == ["y", "first", "z", "last", "end"]
+    state = {"tags": ["a", "b", "c"]}
+    assert _rebuild([{"extra": {"action": "init", "init_data": repr(state)}}, *compacted]) == (
+        tracked
+    )
+    _assert_same_state(original, compacted)
+
+
+def test_negative_indexes_name_the_item_they_changed(tmp_path):
+    log = tmp_path / "changes.jsonl"
+    tracked = TrackedDict({"tags": ["a"]}, tracking_auto_convert=True)
+    tracked.tracking_add_observer(JsonLinesExporter(log))
+    tags = tracked["tags"]
+    tags[-1] = "x"
+    tags.append("b")
+    tags[-1] = "y"
+    original = _records(log)
+
+    compact_log(log, tmp_path / "out.jsonl")
+
+    compacted = _records(tmp_path / "out.jsonl")
+    assert [r["path"][-1] for r in compacted] == [["index", 0], ["index", 1], ["index", 1]]
+    state = {"tags": ["a"]}
+    assert _rebuild([{"extra": {"action": "init", "init_data": repr(state)}}, *compacted]) == (
+        tracked
+    )
+    _assert_same_state(original, compacted)
+
+    # logs of earlier releases kept negative indexes, they never replace anything
+    record = {
+        "tracked_item_uuid": "root",
+        "path": [["key", "tags"], ["index", -1]],
+        "extra": {"type": "TrackedList", "method": "__setitem__", "action": "update"},
+    }
+    assert change_keys(record) == [ChangeKey(("root", ('["key", "tags"]', '["index", -1]')), False)]
+
+
+@pytest.mark.parametrize("seed", [0, 7, 11, 32])
+@pytest.mark.parametrize("run_size", [1, 7, 100_000])
+def test_compacted_log_rebuilds_the_same_state(tmp_path, run_size, seed):
+    log = tmp_path / "changes.jsonl"
+    tracked = _build_log(log, steps=1000, seed=seed)
+    original = _records(log)
+
+    result = compact_log(log, tmp_path / "out.jsonl", run_size=run_size, temp_dir=tmp_path)
+
+    compacted = _records(tmp_path / "out.jsonl")
+    _assert_same_state(original, compacted, tracked)
+    assert len(compacted) == result.records_out < result.records_in
+    times = [r["created_time"] for r in compacted]
+    assert times == sorted(times)
+    # the run files are removed
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["changes.jsonl", "out.jsonl"]
+
+
+def test_checkpoint_lists_live_locations(tmp_path):
+    log = tmp_path / "changes.jsonl"
+    tracked = TrackedDict(tracking_capture_snapshots=False)
+    tracked.tracking_add_observer(JsonLinesExporter(log))
+    tracked["keep"] = 1
+    tracked["gone"] = 2
+    del tracked["gone"]
+    tracked.update({"more": 3})
+
+    compact_log(log, tmp_path / "out.jsonl", checkpoint=tmp_path / "state.jsonl")
+
+    state = _records(tmp_path / "state.jsonl")
+    assert [(entry["location"], entry["value"]) for entry in state] == [
+        ("keep", "1"),
+        ("more", "3"),
+    ]
+    assert [entry["path"] for entry in state] == [[["key", "keep"]], [["key", "more"]]]
+
+
+def test_change_keys():
+    record = {
+        "tracked_item_uuid": "root",
+        "path": [["key", "tags"], ["index", 0]],
+        "extra": {"type": "TrackedList", "method": "insert", "action": "add"},
+    }
+    assert change_keys(record) == [ChangeKey(("root", ('["key", "tags"]',)), False)]
+    record["extra"]["method"] = "__setitem__"
+    assert change_keys(record) == [ChangeKey(("root", ('["key", "tags"]', '["index", 0]')), True)]
+    record["extra"] = {"type": "TrackedDict", "method": "update", "value": "{'a': 1, 2: [3]}"}
+    assert [key for (_, (*_, key)), _ in change_keys(record)] == ['["key", "a"]', '["key", 2]']
+    record["extra"]["value"] = "{'a': <object>}"
+    assert change_keys(record) == [ChangeKey(("root", ('["key", "tags"]', '["index", 0]')), False)]
+    assert change_keys({"tracked_item_uuid": "root", "extra": {"action": "lock"}}) == []
+
+
+def test_cli_compact(tmp_path, capsys):
+    log = tmp_path / "changes.jsonl"
+    _build_log(log, steps=50)
+
+    assert main(["compact", str(log), str(tmp_path / "out.jsonl")]) == 0
+    result = json.loads(capsys.readouterr().out)
+    assert result["records_out"] == len(_records(tmp_path / "out.jsonl"))
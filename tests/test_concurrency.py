@@ -0,0 +1,160 @@
+import sys
+import threading
+import time
+from collections import Counter
+
+import pytest
+
+from pydatatracker import TrackedAttr, TrackedDict, TrackedList
+
+THREADS = 16
+ROUNDS = 200
+
+
+@pytest.fixture(autouse=True)
+def _frequent_thread_switches():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def _run(target) -> None:
+    barrier = threading.Barrier(THREADS)
+    errors = []
+
+    def run(worker: int) -> None:
+        barrier.wait()
+        try:
+            target(worker)
+        except Exception as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=run, args=(worker,)) for worker in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+
+def test_concurrent_mutations_record_their_own_changes():
+    # snapshots widen the window between entering a tracked call and recording it
+    root = TrackedDict({"seed": 0}, tracking_auto_convert=True, tracking_capture_snapshots=True)
+    for worker in range(THREADS):
+        root[f"w{worker}"] = {"items": [], "value": None}
+    changes = []
+    root.tracking_add_observer(changes.append)
+
+    def work(worker: int) -> None:
+        node = root[f"w{worker}"]
+        for index in range(ROUNDS):
+            node["value"] = index
+            node["items"].append(index)
+            root[f"shared{index % 4}"] = f"{worker}-{index}"
+
+    _run(work)
+
+    by_location = Counter(str(change.extra.get("location")) for change in changes)
+    for worker in range(THREADS):
+        values = [
+            change.extra["value"]
+            for change in changes
+            if str(change.extra.get("location")) == f"w{worker}:value"
+        ]
+        assert values == [str(index) for index in range(ROUNDS)]
+        assert sorted(
+            int(change.extra["value"])
+            for change in changes
+            if str(change.extra.get("location")).startswith(f"w{worker}:items|")
+        ) == list(range(ROUNDS))
+    shared = [
+        change for change in changes if str(change.extra.get("location")).startswith("shared")
+    ]
+    assert len(shared) == THREADS * ROUNDS
+    assert len({change.extra["value"] for change in shared}) == THREADS * ROUNDS
+    assert sum(by_location.values()) == len(changes) == 3 * THREADS * ROUNDS
+    for change in shared:
+        _, index = change.extra["value"].split("-")
+        assert str(change.extra.get("location")) == f"shared{int(index) % 4}"
+
+
+def test_thread_safe_list_records_consistent_indexes():
+    root = TrackedDict({"log": []}, tracking_auto_convert=True, tracking_thread_safe=True)
+    shared = root["log"]
+
+    def work(worker: int) -> None:
+        for index in range(ROUNDS):
+            shared.append((worker, index))
+
+    _run(work)
+
+    appends = [change for change in shared.tracking_changes() if change.extra["action"] == "add"]
+    assert len(shared) == len(appends) == THREADS * ROUNDS
+    for change in appends:
+        assert repr(shared[change.extra["location"].keys[-1]]) == change.extra["value"]
+
+
+def test_thread_safe_option_gives_each_container_its_own_lock():
+    root = TrackedDict(
+        {"child": {"leaf": []}}, tracking_auto_convert=True, tracking_thread_safe=True
+    )
+    child = root["child"]
+    assert root._tracking_mutex is not None
+    assert child._tracking_mutex is not None
+    assert child["leaf"]._tracking_mutex not in (None, root._tracking_mutex, child._tracking_mutex)
+    assert TrackedList()._tracking_mutex is None
+
+
+def test_thread_safe_attributes():
+    class Counter_(TrackedAttr):
+        def __init__(self) -> None:
+            super().__init__(tracking_thread_safe=True)
+            self.value = 0
+            self.tracking_add_attribute_to_monitor("value")
+
+    counter = Counter_()
+
+    def work(worker: int) -> None:
+        for index in range(ROUNDS):
+            counter.value = (worker, index)
+
+    _run(work)
+
+    updates = [
+        change for change in counter.tracking_changes() if change.extra["action"] == "update"
+    ]
+    assert len(updates) == THREADS * ROUNDS
+
+
+def test_tracking_context_is_empty_outside_tracked_calls():
+    tracked = TrackedDict()
+    tracked._tracking_context["action"] = "stray"
+    tracked["key"] = 1
+    assert tracked.last_change().extra["action"] == "add"
+
+
+def test_thread_safe_parent_records_propagated_changes_consistently():
+    root = TrackedDict(
+        {f"w{worker}": {"value": None} for worker in range(THREADS)},
+        tracking_auto_convert=True,
+        tracking_thread_safe=True,
+    )
+    seen = []
+    # give other threads a chance to run between recording and notifying
+    root.tracking_add_observer(lambda change: time.sleep(0), priority=0)
+    root.tracking_add_observer(seen.append)
+
+    def work(worker: int) -> None:
+        node = root[f"w{worker}"]
+        for index in range(ROUNDS):
+            node["value"] = index
+            root[f"own{worker}"] = index
+
+    _run(work)
+
+    # every change reaches the parent's history, undo stack and observers in one order
+    history = root.tracking_changes()[-len(seen) :]
+    assert [change.uuid for change in seen] == [change.uuid for change in history]
+    assert list(root._tracking_undo_stack)[-len(seen) :] == history
+    assert len(seen) == 2 * THREADS * ROUNDS
@@ -3,10 +3,23 @@
 from __future__ import annotations
 
 import json
+import multiprocessing
+import os
 from pathlib import Path
 
+import pytest
+
 from pydatatracker import TrackedDict
-from pydatatracker.exporters import HttpExporter, JsonLinesExporter, KafkaExporter, S3Exporter
+from pydatatracker.exporters import (
+    HttpExporter,
+    JsonLinesExporter,
+    KafkaExporter,
+    S3Exporter,
+    SegmentedJsonLinesExporter,
+    SharedJsonLinesExporter,
+    merge_jsonl,
+    merge_jsonl_lines,
+)
 
 
 def _make_change():
@@ -64,3 +77,77 @@ def test_kafka_exporter() -> None:
     exporter = KafkaExporter(producer, topic="changes")
     exporter(_make_change())
     assert producer.messages
+
+
+def _write_records(exporter, worker: int, count: int) -> None:
+    # records far larger than PIPE_BUF, which could interleave without the lock
+    for index in range(count):
+        exporter.export({"worker": worker, "index": index, "payload": "x" * 100_000})
+    exporter.close()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_shared_exporter_keeps_records_whole_across_processes(tmp_path: Path) -> None:
+    exporter = SharedJsonLinesExporter(tmp_path / "shared.jsonl")
+    exporter.export({"worker": -1, "index": 0, "payload": ""})
+    context = multiprocessing.get_context("fork")
+    workers = [
+        context.Process(target=_write_records, args=(exporter, worker, 20)) for worker in range(4)
+    ]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join()
+        assert process.exitcode == 0
+
+    records = [json.loads(line) for line in (tmp_path / "shared.jsonl").read_text().splitlines()]
+    assert len(records) == 81
+    for worker in range(4):
+        indexes = [r["index"] for r in records if r["worker"] == worker]
+        assert indexes == list(range(20))
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_segmented_exporter_writes_a_segment_per_process(tmp_path: Path) -> None:
+    exporter = SegmentedJsonLinesExporter(tmp_path / "segments")
+    tracked = TrackedDict(tracking_capture_snapshots=False)
+    tracked.tracking_add_observer(exporter)
+    tracked["parent"] = 1
+    context = multiprocessing.get_context("fork")
+    child = context.Process(target=tracked.__setitem__, args=("child", 2))
+    child.start()
+    child.join()
+    tracked["parent"] = 3
+    exporter.close()
+
+    segments = sorted((tmp_path / "segments").glob("changes-*.jsonl"))
+    assert len(segments) == 2
+    merged = [change["extra"]["value"] for change in merge_jsonl([tmp_path / "segments"])]
+    assert merged == ["1", "2", "3"]
+
+
+def test_merge_jsonl_orders_logs_by_creation_time(tmp_path: Path) -> None:
+    first, second = tmp_path / "a.jsonl", tmp_path / "b.jsonl"
+    tracked = TrackedDict(tracking_capture_snapshots=False)
+    for index in range(6):
+        tracked["key"] = index
+        exporter = JsonLinesExporter(first if index % 2 else second)
+        exporter(tracked.last_change())
+
+    values = [change["extra"]["value"] for change in merge_jsonl([first, second])]
+    assert values == [str(index) for index in range(6)]
+
+
+def test_merge_jsonl_lines_reads_the_time_of_unparsed_lines(tmp_path: Path) -> None:
+    first, second = tmp_path / "a.jsonl", tmp_path / "b.jsonl"
+    tracked = TrackedDict(tracking_capture_snapshots=False)
+    for index in range(6):
+        # a value that looks like an older creation time must not be used
+        tracked["key"] = f'{index} "created_time": "2000-01-01T00:00:00+00:00"'
+        exporter = JsonLinesExporter(first if index % 2 else second)
+        exporter(tracked.last_change())
+
+    lines = list(merge_jsonl_lines([first, second]))
+    values = [json.loads(line)["extra"]["value"][0] for line in lines]
+    assert values == [str(index) for index in range(6)]
+    assert [json.loads(line) for line in lines] == list(merge_jsonl([second, first]))
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import pytest
+
+import pydatatracker
+from pydatatracker import TrackedDict, TrackedList
+from pydatatracker.instrumentation import STATS, observer_name
+
+
+@pytest.fixture
+def enabled():
+    pydatatracker.reset_stats()
+    pydatatracker.enable_stats()
+    yield
+    pydatatracker.disable_stats()
+    pydatatracker.reset_stats()
+
+
+def test_disabled_by_default_records_nothing() -> None:
+    pydatatracker.reset_stats()
+    data = TrackedDict()
+    data["a"] = 1
+    assert pydatatracker.stats()["entries_created"] == 0
+
+
+def test_counts_entries_hops_and_observers(enabled) -> None:
+    data = TrackedDict({"users": {"alice": {"age": 1}}}, tracking_auto_convert=True)
+    seen = []
+    data.tracking_add_observer(seen.append)
+    pydatatracker.reset_stats()
+
+    data["users"]["alice"]["age"] = 2
+
+    current = pydatatracker.stats()
+    assert current["entries_created"] == 1
+    assert current["propagation_hops"] == 2
+    # the two parents' notifications and the user observer
+    assert current["observer_calls"] == 3
+    name = observer_name(seen.append)
+    assert current["observers"][name]["calls"] == 1
+    leaf = data["users"]["alice"]
+    assert current["hot_containers"] == {f"TrackedDict:{leaf._tracking_uuid}": 1}
+
+
+def test_counts_snapshot_bytes_and_stack_captures(enabled) -> None:
+    data = TrackedList([1, 2], tracking_capture_snapshots=True, tracking_capture_stack=True)
+    pydatatracker.reset_stats()
+    data.append(3)
+    change = data.tracking_changes()[-1]
+    current = pydatatracker.stats(reset=True)
+    expected = len(change.extra["data_pre_change"]) + len(change.extra["data_post_change"])
+    assert current["snapshot_bytes"] == expected
+    assert current["stack_captures"] == 1
+    assert STATS.entries_created == 0
+
+
+def test_observer_errors_are_still_counted(enabled) -> None:
+    data = TrackedDict()
+
+    def broken(change):
+        raise ValueError("boom")
+
+    data.tracking_add_observer(broken)
+    with pytest.raises(ValueError):
+        data["a"] = 1
+    assert pydatatracker.stats()["observers"][observer_name(broken)]["calls"] == 1
+
+
+def test_observers_of_one_class_are_counted_apart(enabled) -> None:
+    class Recorder:
+        def __call__(self, change):
+            pass
+
+    first, second = TrackedDict(), TrackedDict()
+    first.tracking_add_observer(Recorder())
+    second.tracking_add_observer(Recorder())
+    pydatatracker.reset_stats()
+
+    first["a"] = 1
+    first["a"] = 2
+    second["a"] = 1
+
+    observers = pydatatracker.stats()["observers"]
+    name = observer_name(Recorder())
+    assert observers[name]["calls"] == 2
+    assert observers[f"{name}#2"]["calls"] == 1
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import logging
+import time
+
+import pytest
+
+from pydatatracker import ObserverPolicy, TrackedDict
+from pydatatracker.instrumentation import observer_name
+
+
+def _broken(change):
+    raise ValueError("boom")
+
+
+def test_raise_is_the_default() -> None:
+    data = TrackedDict(tracking_observer_policy=ObserverPolicy())
+    data.tracking_add_observer(_broken)
+    with pytest.raises(ValueError):
+        data["a"] = 1
+    assert data["a"] == 1
+
+
+def test_log_and_continue(caplog) -> None:
+    policy = ObserverPolicy(on_error="log")
+    data = TrackedDict(tracking_observer_policy=policy)
+    seen = []
+    data.tracking_add_observer(_broken, priority=10)
+    data.tracking_add_observer(seen.append, priority=20)
+    with caplog.at_level(logging.ERROR, logger="pydatatracker"):
+        data["a"] = 1
+    assert len(seen) == 1
+    assert "failed" in caplog.text
+    assert policy.latencies()[observer_name(_broken)]["failures"] == 1
+
+
+def test_disable_after_failures(caplog) -> None:
+    policy = ObserverPolicy(on_error="disable", max_failures=2)
+    data = TrackedDict(tracking_observer_policy=policy)
+    data.tracking_add_observer(_broken)
+    with caplog.at_level(logging.WARNING, logger="pydatatracker"):
+        for value in range(4):
+            data["a"] = value
+    latency = policy.latencies()[observer_name(_broken)]
+    assert latency["failures"] == 2
+    assert latency["disabled"]
+    assert not any(data._tracking_observers.values())
+
+
+def test_failures_are_counted_per_observer_instance() -> None:
+    class Flaky:
+        def __init__(self) -> None:
+            self.calls = 0
+
+        def __call__(self, change) -> None:
+            self.calls += 1
+            if self.calls % 2:
+                raise ValueError("boom")
+
+    policy = ObserverPolicy(on_error="disable", max_failures=2)
+    first = TrackedDict(tracking_observer_policy=policy)
+    second = TrackedDict(tracking_observer_policy=policy)
+    first.tracking_add_observer(Flaky())
+    healthy = Flaky()
+    second.tracking_add_observer(healthy)
+
+    first["a"] = 1
+    second["a"] = 1
+    second["a"] = 2
+    assert healthy.calls == 2
+    assert any(second._tracking_observers.values())
+
+    for value in range(3):
+        first["a"] = value
+    assert not any(first._tracking_observers.values())
+    assert any(second._tracking_observers.values())
+    latency = policy.latencies()[observer_name(healthy)]
+    assert latency["failures"] == 3
+    assert latency["disabled"] == 1
+
+
+def test_slow_observer_and_histogram() -> None:
+    slow_calls = []
+    observed = []
+
+    class Histogram:
+        def labels(self, **labels):
+            return self
+
+        def observe(self, value):
+            observed.append(value)
+
+    policy = ObserverPolicy(
+        slow_threshold=0.001,
+        on_slow=lambda name, seconds, change: slow_calls.append((name, seconds)),
+        histogram=Histogram(),
+    )
+    child = TrackedDict(tracking_observer_policy=policy)
+    child.tracking_add_observer(lambda change: time.sleep(0.005))
+    child["x"] = 1
+    assert len(slow_calls) == 1
+    assert slow_calls[0][1] > 0.001
+    assert len(observed) == 1
+    (latency,) = policy.latencies().values()
+    assert latency["count"] == 1
+    assert latency["buckets"]["0.01"] == 1
+
+
+def test_policy_is_inherited_but_propagation_is_not_wrapped() -> None:
+    policy = ObserverPolicy(on_error="log")
+    data = TrackedDict(
+        {"child": {"x": 1}}, tracking_auto_convert=True, tracking_observer_policy=policy
+    )
+    assert data["child"]._tracking_observer_policy is policy
+    seen = []
+    data.tracking_add_observer(seen.append)
+    data["child"]["x"] = 2
+    assert len(seen) == 1
+    assert list(policy.latencies()) == [observer_name(seen.append)]
+
+
+def test_invalid_policy_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        ObserverPolicy(on_error="ignore")  # type: ignore[arg-type]
@@ -1,5 +1,10 @@
-from pydatatracker import TrackedDict
-from pydatatracker.observers import telemetry_observer
+import datetime
+import threading
+import time
+
+import pydatatracker
+from pydatatracker import ChangeCollector, TrackedDict, tracking_actor
+from pydatatracker.observers import MetricsObserver, _flush_buffered, telemetry_observer
 
 
 class DummyCounter:
@@ -28,3 +33,224 @@ def test_telemetry_observer_counts():
     tracked.tracking_add_observer(telemetry_observer(counter))
     tracked["foo"] = "bar"
     assert counter.counts
+
+
+def test_collector_query_combines_indexes():
+    users = {"alice": {"age": 1}, "bob": {"age": 2}}
+    tracked = TrackedDict({"users": users}, tracking_auto_convert=True)
+    collector = ChangeCollector()
+    tracked.tracking_add_observer(collector)
+    with tracking_actor("admin"):
+        tracked["users"]["alice"]["age"] = 3
+        tracked["users"]["bob"]["age"] = 4
+    tracked["users"]["alice"]["email"] = "a@example.com"
+
+    alice = collector.query(location_prefix=("users", "alice"))
+    locations = [str(entry.extra["location"]) for entry in alice]
+    assert locations == ["users:alice:age", "users:alice:email"]
+    by_admin = collector.query(actor="admin", location_prefix=["users"])
+    assert [entry.extra["value"] for entry in by_admin] == ["3", "4"]
+    assert collector.query(action="add", actor="admin") == []
+    assert collector.filtered("add") == collector.query(action="add")
+    other = TrackedDict()
+    other.tracking_add_observer(collector)
+    other["flag"] = True
+    assert collector.query(tracked_item_uuid=other._tracking_uuid) == [collector.last()]
+    assert len(collector.query(tracked_item_uuid=tracked._tracking_uuid)) == 3
+
+
+def test_collector_query_time_range():
+    tracked = TrackedDict()
+    collector = ChangeCollector()
+    tracked.tracking_add_observer(collector)
+    for value in range(5):
+        tracked["key"] = value
+    entries = collector.as_list()
+    middle = entries[2].created_time
+    assert collector.query(since=middle) == [
+        entry for entry in entries if entry.created_time >= middle
+    ]
+    assert collector.query(until=middle) == [
+        entry for entry in entries if entry.created_time < middle
+    ]
+    later = middle + datetime.timedelta(hours=1)
+    assert collector.query(action="update", since=later) == []
+
+
+def test_collector_time_range_with_out_of_order_arrivals():
+    tracked = TrackedDict()
+    entries = []
+    tracked.tracking_add_observer(entries.append)
+    for value in range(6):
+        tracked["key"] = value
+    start = entries[0].created_time
+    # as recorded by threads that notified observers in a different order
+    for entry, minutes in zip(entries, [0, 3, 1, 4, 2, 5], strict=True):
+        entry.created_time = start + datetime.timedelta(minutes=minutes)
+    collector = ChangeCollector(capacity=4)
+    for entry in entries[:4]:
+        collector(entry)
+
+    since = start + datetime.timedelta(minutes=2)
+    assert collector.query(since=since) == [entries[1], entries[3]]
+    for entry in entries[4:]:
+        collector(entry)
+    assert collector.query(until=since) == [entries[2]]
+    # the last out of order arrival is evicted with its predecessor
+    collector(entries[5])
+    collector(entries[5])
+    assert not collector._out_of_order
+    assert collector.query(since=since) == [entries[4]] + [entries[5]] * 3
+
+
+def test_collector_indexes_follow_capacity():
+    tracked = TrackedDict()
+    collector = ChangeCollector(capacity=3)
+    tracked.tracking_add_observer(collector)
+    for key in range(200):
+        tracked[key] = key
+    assert len(collector) == 3
+    assert [entry.extra["value"] for entry in collector.filtered("add")] == ["197", "198", "199"]
+    assert collector.query(location_prefix=5) == []
+    assert [entry.extra["location"] for entry in collector.query(location_prefix=199)] == ["199"]
+    assert collector.as_list() == collector.query(since=collector.as_list()[0].created_time)
+    collector.clear()
+    assert collector.query(action="add") == []
+
+
+class DummyGauge:
+    def __init__(self):
+        self.values = {}
+
+    def labels(self, **labels):
+        gauge = self
+
+        class Setter:
+            def set(self, value):
+                gauge.values[labels["stat"]] = value
+
+        return Setter()
+
+
+def test_metrics_observer_publishes_stats():
+    pydatatracker.reset_stats()
+    pydatatracker.enable_stats()
+    try:
+        tracked = TrackedDict()
+        gauge = DummyGauge()
+        observer = telemetry_observer(DummyCounter(), stats_gauge=gauge)
+        tracked.tracking_add_observer(observer)
+        tracked["foo"] = "bar"
+        observer.publish_stats()
+    finally:
+        pydatatracker.disable_stats()
+        pydatatracker.reset_stats()
+    # the init change and the add
+    assert gauge.values["entries_created"] == 2
+    assert any(name.startswith("observer_seconds:") for name in gauge.values)
+
+
+class RecordingCounter:
+    def __init__(self):
+        self.lookups = 0
+        self.counts = {}
+
+    def labels(self, **labels):
+        self.lookups += 1
+        key = tuple(sorted(labels.items()))
+        counts = self.counts
+
+        class Child:
+            def inc(self, amount=1):
+                counts[key] = counts.get(key, 0) + amount
+
+        return Child()
+
+
+class RecordingHistogram:
+    def __init__(self):
+        self.values = []
+
+    def observe(self, value):
+        self.values.append(value)
+
+
+def test_metrics_observer_caches_label_children():
+    counter = RecordingCounter()
+    tracked = TrackedDict()
+    tracked.tracking_add_observer(MetricsObserver(counter))
+    for value in range(5):
+        tracked["key"] = value
+    assert counter.lookups == 2
+    assert counter.counts == {(("action", "add"),): 1, (("action", "update"),): 4}
+
+
+def test_metrics_observer_location_labels_with_cap():
+    counter = RecordingCounter()
+    tracked = TrackedDict({"users": {"alice": 1}, "config": {"x": 1}}, tracking_auto_convert=True)
+    observer = MetricsObserver(counter, labels=("type", "location"), max_label_sets=2)
+    tracked.tracking_add_observer(observer)
+    tracked["users"]["alice"] = 2
+    tracked["users"]["bob"] = 1
+    tracked["config"]["x"] = 2
+    tracked["other"] = 1
+    assert counter.counts == {
+        (("location", "users"), ("type", "TrackedDict")): 2,
+        (("location", "config"), ("type", "TrackedDict")): 1,
+        (("location", "other"), ("type", "other")): 1,
+    }
+
+
+def test_metrics_observer_buffers_until_flush():
+    counter = RecordingCounter()
+    depths, sizes = RecordingHistogram(), RecordingHistogram()
+    tracked = TrackedDict({"child": {"x": 1}}, tracking_auto_convert=True)
+    observer = MetricsObserver(
+        counter, flush_interval=3600, depth_histogram=depths, size_histogram=sizes
+    )
+    tracked.tracking_add_observer(observer)
+    tracked["child"]["x"] = 2
+    tracked["top"] = "value"
+    assert counter.counts == {}
+    observer.flush()
+    assert counter.counts == {(("action", "update"),): 1, (("action", "add"),): 1}
+    assert depths.values == [1, 0]
+    assert all(size > 0 for size in sizes.values)
+
+
+def test_metrics_observer_flushes_when_idle_and_at_exit():
+    counter = RecordingCounter()
+    observer = MetricsObserver(counter, flush_interval=0.05)
+    tracked = TrackedDict()
+    tracked.tracking_add_observer(observer)
+    tracked["a"] = 1
+    tracked["a"] = 2
+    deadline = time.monotonic() + 5
+    while not counter.counts and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert counter.counts == {(("action", "add"),): 1, (("action", "update"),): 1}
+
+    buffered = MetricsObserver(counter, flush_interval=3600)
+    tracked.tracking_add_observer(buffered)
+    tracked["b"] = 1
+    _flush_buffered()
+    assert counter.counts[(("action", "add"),)] == 3
+
+
+def test_metrics_observer_buffers_changes_from_threads():
+    counter = RecordingCounter()
+    observer = MetricsObserver(counter, flush_interval=0.001)
+    tracked = TrackedDict(tracking_thread_safe=True)
+    tracked.tracking_add_observer(observer)
+
+    def work(worker: int) -> None:
+        for value in range(200):
+            tracked[f"w{worker}"] = value
+
+    threads = [threading.Thread(target=work, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    observer.flush()
+    assert sum(counter.counts.values()) == 8 * 200
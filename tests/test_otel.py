@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from pydatatracker import TrackedDict
+from pydatatracker.otel import EVENT_NAME, InMemoryTracer, OpenTelemetryObserver
+
+
+def _tracked(observer: OpenTelemetryObserver) -> TrackedDict:
+    data = TrackedDict({"users": {"alice": 1}}, tracking_auto_convert=True)
+    data.tracking_add_observer(observer)
+    return data
+
+
+def test_events_are_added_to_the_current_span() -> None:
+    tracer = InMemoryTracer()
+    observer = OpenTelemetryObserver(tracer)
+    data = _tracked(observer)
+    data["outside"] = 0
+    with tracer.start_as_current_span("request"):
+        data["users"]["alice"] = 2
+    (span,) = tracer.finished_spans
+    (event,) = span.events
+    assert event[0] == EVENT_NAME
+    assert event[1]["pydatatracker.action"] == "update"
+    assert event[1]["pydatatracker.location"] == "users:alice"
+    assert event[1]["pydatatracker.container_type"] == "TrackedDict"
+
+
+def test_batch_span_counts_entries() -> None:
+    tracer = InMemoryTracer()
+    observer = OpenTelemetryObserver(tracer, record_events=False)
+    data = _tracked(observer)
+    with observer.batch("import users", source="test"):
+        data["users"]["bob"] = 1
+        data["users"]["alice"] = 3
+        data["users"]["alice"] = 4
+    (span,) = tracer.finished_spans
+    assert span.name == "import users"
+    assert span.events == []
+    assert span.attributes["source"] == "test"
+    assert span.attributes["pydatatracker.entry_count"] == 3
+    assert span.attributes["pydatatracker.actions.update"] == 2
+    assert span.attributes["pydatatracker.actions.add"] == 1
+
+
+def test_unsampled_spans_record_nothing() -> None:
+    tracer = InMemoryTracer(sampler=lambda name: name != "noisy")
+    observer = OpenTelemetryObserver(tracer)
+    data = _tracked(observer)
+    with observer.batch("noisy") as span:
+        data["users"]["alice"] = 5
+    assert not span.is_recording()
+    assert span.events == []
+    assert tracer.finished_spans == []
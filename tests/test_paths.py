@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import json
+
+from pydatatracker import TrackedDict, TrackedList, TrackingPath
+from pydatatracker.observers import FilteredObserver
+from pydatatracker.utils.paths import ATTRIBUTE, INDEX, KEY, PathSegment
+
+
+def test_nested_changes_record_typed_segments() -> None:
+    tree = TrackedDict({"users": {"a:b": [{"email": "x"}]}}, tracking_auto_convert=True)
+
+    tree["users"]["a:b"][0]["email"] = "y"
+
+    location = tree.last_change().extra["location"]
+    assert isinstance(location, TrackingPath)
+    assert tuple(location) == (
+        PathSegment(KEY, "users"),
+        PathSegment(KEY, "a:b"),
+        PathSegment(INDEX, 0),
+        PathSegment(KEY, "email"),
+    )
+    assert location.keys == ("users", "a:b", 0, "email")
+    assert str(location) == "users:a:b|0:email"
+    assert location == "users:a:b|0:email"
+
+
+def test_paths_compare_by_segments_and_with_rendered_strings() -> None:
+    path = TrackingPath.of(INDEX, 2)
+
+    assert path == "2"
+    assert hash(path) == hash("2")
+    assert path in {"2"}
+    assert repr(path) == "'2'"
+    assert path != 2
+    assert path != TrackingPath.of(KEY, 2)
+    assert path == TrackingPath.of(INDEX, 2)
+
+    # a key containing a delimiter renders like a longer path, but is not equal to it
+    one = TrackingPath.of(KEY, "a:b")
+    two = TrackingPath.of(KEY, "a").child(KEY, "b")
+    assert one == "a:b" == two
+    assert one != two
+    assert len({one, two}) == 2
+
+    # equal keys that render differently make different paths
+    assert TrackingPath.of(KEY, 1) != TrackingPath.of(KEY, True)
+
+
+def test_prefix_matching() -> None:
+    path = TrackingPath.of(KEY, "users").child(KEY, "alice").child(ATTRIBUTE, "email")
+
+    assert path.startswith(["users"])
+    assert path.startswith(("users", "alice"))
+    assert not path.startswith(("users", "bob"))
+    assert not path.startswith(("users", "alice", "email", "extra"))
+    assert path.startswith(TrackingPath.of(KEY, "users"))
+    assert not path.startswith(TrackingPath.of(INDEX, "users"))
+
+
+def test_to_dict_renders_location_and_keeps_segments() -> None:
+    tree = TrackedDict({"users": {"alice": 1}}, tracking_auto_convert=True)
+    tree["users"]["alice"] = 2
+
+    data = json.loads(json.dumps(tree.last_change().to_dict()))
+
+    assert data["extra"]["location"] == "users:alice"
+    assert data["path"] == [["key", "users"], ["key", "alice"]]
+
+
+def test_filtered_observer_prefixes_match_subtrees() -> None:
+    seen: list = []
+    tree = TrackedDict({"users": {"alice": 1}, "groups": {"admin": 1}}, tracking_auto_convert=True)
+    tree.tracking_add_observer(FilteredObserver(seen.append, prefixes=[("users",)]))
+
+    tree["users"]["alice"] = 2
+    tree["groups"]["admin"] = 2
+    tree["users"]["bob"] = 1
+
+    assert [change.extra["location"].keys for change in seen] == [
+        ("users", "alice"),
+        ("users", "bob"),
+    ]
+
+
+def test_filtered_observer_locations_accept_strings_and_raw_keys() -> None:
+    seen: list = []
+    tree = TrackedList([0, 0, {"name": "a"}], tracking_auto_convert=True)
+    tree.tracking_add_observer(FilteredObserver(seen.append, locations={1, "2:name"}))
+
+    tree[1] = 1
+    tree[0] = 1
+    tree[2]["name"] = "b"
+
+    assert [change.extra["location"].keys for change in seen] == [(1,), (2, "name")]
+
+
+def test_rendering_is_cached() -> None:
+    class Key(str):
+        renders = 0
+
+        def __str__(self) -> str:
+            Key.renders += 1
+            return str.__str__(self)
+
+    path = TrackingPath.of(KEY, "users").child(KEY, Key("alice"))
+    lookup = {path: 1}
+    for _ in range(3):
+        assert lookup[path] == 1
+        assert path == "users:alice"
+    assert str(path) == "users:alice"
+    assert Key.renders == 1
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from pydatatracker.utils.persistent import PersistentMap
+
+
+class Colliding:
+    """Key type whose instances all share one hash."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __hash__(self) -> int:
+        return 42
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Colliding) and other.name == self.name
+
+
+def test_persistent_map_matches_dict() -> None:
+    rng = random.Random(3)
+    expected: dict = {}
+    current = PersistentMap()
+    versions = []
+    for _ in range(3000):
+        key = rng.randrange(400)
+        if key in expected and rng.random() < 0.3:
+            del expected[key]
+            current = current.delete(key)
+        else:
+            expected[key] = rng.random()
+            current = current.set(key, expected[key])
+        versions.append((dict(expected), current))
+
+    for snapshot, version in versions[::100]:
+        assert dict(version) == snapshot
+        assert len(version) == len(snapshot)
+
+
+def test_persistent_map_handles_hash_collisions() -> None:
+    keys = [Colliding(str(index)) for index in range(4)]
+    data = PersistentMap((key, index) for index, key in enumerate(keys))
+    data = data.set(1, "int").delete(keys[1])
+
+    assert data[keys[0]] == 0
+    assert keys[1] not in data
+    assert data[1] == "int"
+    assert len(data) == 4
+    with pytest.raises(KeyError):
+        data.delete(keys[1])
+
+
+def test_persistent_map_diff_reports_changed_keys() -> None:
+    base = PersistentMap({index: index for index in range(1000)})
+    changed = base.set(5, "five").delete(6).set("new", 1)
+
+    assert set(base.diff(changed)) == {5, 6, "new"}
+    assert list(base.diff(base)) == []
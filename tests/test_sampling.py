@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+
+import pytest
+
+from pydatatracker import SamplingPolicy, TrackedDict, TrackedList
+from pydatatracker.types._trackbase import _flush_sampling_summaries
+
+
+def _actions(tracked) -> list[str]:
+    return [change.extra["action"] for change in tracked._tracking_changes]
+
+
+def test_every_nth_change_is_recorded() -> None:
+    data = TrackedDict(tracking_sampling=SamplingPolicy(every=3))
+    for i in range(7):
+        data["key"] = i
+    assert [c.extra["value"] for c in data._tracking_changes[1:]] == ["0", "3", "6"]
+
+
+def test_sampler_decides_before_the_change_is_known() -> None:
+    sampler = SamplingPolicy(every=3).new_sampler()
+    assert [sampler.sample() for _ in range(6)] == [True, False, False, True, False, False]
+    sampler.suppress("update", "a")
+    sampler.suppress("update", "a")
+    assert sampler.suppressed == 2
+    assert sampler.take_summary() == [{"action": "update", "location": "a", "count": 2}]
+
+
+def test_fraction_uses_seeded_generator() -> None:
+    first = TrackedDict(tracking_sampling=SamplingPolicy(fraction=0.5, seed=7))
+    second = TrackedDict(tracking_sampling=SamplingPolicy(fraction=0.5, seed=7))
+    for i in range(50):
+        first[i] = i
+        second[i] = i
+    recorded = [c.extra["location"] for c in first._tracking_changes[1:]]
+    assert recorded == [c.extra["location"] for c in second._tracking_changes[1:]]
+    assert 0 < len(recorded) < 50
+
+
+def test_rate_limit_and_summary() -> None:
+    policy = SamplingPolicy(max_per_second=2, summary_interval=3600)
+    data = TrackedList(tracking_sampling=policy)
+    for i in range(5):
+        data.append(i)
+    assert _actions(data).count("add") == 2
+    data.tracking_flush_sampling_summary()
+    summary = data._tracking_changes[-1]
+    assert summary.extra["action"] == "sampling summary"
+    assert summary.extra["suppressed_total"] == "3"
+    assert data._tracking_sampler.suppressed == 0
+
+
+def test_summary_is_emitted_periodically() -> None:
+    data = TrackedDict(tracking_sampling=SamplingPolicy(every=2, summary_interval=0))
+    data["a"] = 1
+    data["a"] = 2
+    data["a"] = 3
+    actions = _actions(data)
+    assert actions == ["init", "add", "sampling summary", "update"]
+    assert data._tracking_changes[2].extra["suppressed_total"] == "1"
+
+
+def test_suppressed_changes_capture_no_snapshots(monkeypatch) -> None:
+    data = TrackedDict(tracking_sampling=SamplingPolicy(every=4), tracking_capture_snapshots=True)
+    reprs = []
+    original = TrackedDict.__repr__
+    monkeypatch.setattr(TrackedDict, "__repr__", lambda self: reprs.append(1) or original(self))
+    for i in range(8):
+        data["key"] = i
+    # a pre- and post-change snapshot for each of the two recorded changes
+    assert len(reprs) == 4
+    assert _actions(data) == ["init", "add", "update"]
+
+
+def test_reading_the_history_flushes_the_summary() -> None:
+    data = TrackedDict(tracking_sampling=SamplingPolicy(every=2, summary_interval=3600))
+    for i in range(4):
+        data["key"] = i
+    assert [c.extra["action"] for c in data.tracking_changes()] == [
+        "init",
+        "add",
+        "update",
+        "sampling summary",
+    ]
+    assert data.last_change().extra["suppressed_total"] == "2"
+    assert data._tracking_sampler.suppressed == 0
+
+
+def test_pending_summaries_are_flushed_at_exit() -> None:
+    data = TrackedList(tracking_sampling=SamplingPolicy(max_per_second=1, summary_interval=3600))
+    seen = []
+    data.tracking_add_observer(seen.append)
+    for i in range(3):
+        data.append(i)
+    _flush_sampling_summaries()
+    assert [c.extra["action"] for c in seen] == ["add", "sampling summary"]
+    assert seen[-1].extra["suppressed_total"] == "2"
+    _flush_sampling_summaries()
+    assert len(seen) == 2
+
+
+def test_lock_unlock_and_init_are_always_recorded() -> None:
+    data = TrackedDict({"a": 1}, tracking_sampling=SamplingPolicy(fraction=0.0))
+    data["a"] = 2
+    data.lock()
+    data.unlock()
+    assert _actions(data) == ["init", "lock", "unlock"]
+
+
+def test_children_share_policy_with_own_counters() -> None:
+    policy = SamplingPolicy(every=2)
+    data = TrackedDict({"child": {"x": 0}}, tracking_auto_convert=True, tracking_sampling=policy)
+    child = data["child"]
+    assert child._tracking_sampling is policy
+    assert child._tracking_sampler is not data._tracking_sampler
+
+
+def test_invalid_policy_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        SamplingPolicy(every=0)
+    with pytest.raises(ValueError):
+        SamplingPolicy(fraction=1.5)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_unseeded_sampler_is_reseeded_in_forked_children() -> None:
+    sampler = SamplingPolicy(fraction=0.5).new_sampler()
+    receiver, sender = multiprocessing.get_context("fork").Pipe(duplex=False)
+
+    def draw() -> None:
+        sender.send([sampler._random.random() for _ in range(5)])
+
+    child = multiprocessing.get_context("fork").Process(target=draw)
+    child.start()
+    child_draws = receiver.recv()
+    child.join()
+    assert child_draws != [sampler._random.random() for _ in range(5)]
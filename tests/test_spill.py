@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import datetime
+import multiprocessing
+import os
+
+import pytest
+
+from pydatatracker import ChangeLogEntry, SpillCollector, TrackedDict
+
+
+def _fill(collector: SpillCollector, count: int) -> TrackedDict:
+    tracked = TrackedDict({"users": {"alice": {}}}, tracking_auto_convert=True)
+    tracked.tracking_add_observer(collector)
+    for value in range(count):
+        tracked["users"]["alice"]["age"] = value
+    return tracked
+
+
+def test_entries_spill_to_segments(tmp_path) -> None:
+    collector = SpillCollector(tmp_path, memory_capacity=5, segment_bytes=2048)
+    _fill(collector, 40)
+    assert len(collector) == 40
+    assert collector.spilled == 35
+    assert len(list(tmp_path.glob("segment-*.jsonl"))) > 1
+    values = [entry.extra["value"] for entry in collector]
+    assert values == [str(value) for value in range(40)]
+    assert collector[3].extra["value"] == "3"
+    assert collector[-1].extra["value"] == "39"
+    assert str(collector[10].extra["location"]) == "users:alice:age"
+    assert collector[10].extra["location"].keys == ("users", "alice", "age")
+    collector.close()
+
+
+def test_time_range_reads(tmp_path) -> None:
+    collector = SpillCollector(tmp_path, memory_capacity=3, segment_bytes=1024)
+    _fill(collector, 20)
+    entries = list(collector)
+    since = entries[6].created_time
+    until = entries[15].created_time
+    expected = [e.uuid for e in entries if since <= e.created_time < until]
+    assert [e.uuid for e in collector.between(since, until)] == expected
+    later = entries[-1].created_time + datetime.timedelta(seconds=1)
+    assert list(collector.between(since=later)) == []
+    collector.close()
+
+
+def test_history_survives_reopen(tmp_path) -> None:
+    with SpillCollector(tmp_path, memory_capacity=2) as collector:
+        _fill(collector, 10)
+        first = collector[0]
+    reopened = SpillCollector(tmp_path, memory_capacity=2)
+    assert len(reopened) == 10
+    assert reopened[0] == first
+    assert reopened[0].created_time == first.created_time
+    reopened.clear()
+    assert len(reopened) == 0
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_reopen_after_unclean_exit(tmp_path) -> None:
+    def write() -> None:
+        collector = SpillCollector(tmp_path, memory_capacity=1)
+        _fill(collector, 300)
+        os._exit(0)
+
+    writer = multiprocessing.get_context("fork").Process(target=write)
+    writer.start()
+    writer.join()
+    (data,) = tmp_path.glob("segment-*.jsonl")
+    lines = data.read_bytes().count(b"\n")
+
+    reopened = SpillCollector(tmp_path, memory_capacity=1)
+    count = len(reopened)
+    assert 0 < count <= lines < 300
+    values = [entry.extra["value"] for entry in reopened]
+    assert values == [str(value) for value in range(count)]
+    assert reopened[count - 1].extra["value"] == str(count - 1)
+    # new entries follow the recovered ones
+    _fill(reopened, 3)
+    reopened.close()
+    assert [entry.extra["value"] for entry in SpillCollector(tmp_path)][count:] == [
+        "0",
+        "1",
+        "2",
+    ]
+
+
+def test_from_dict_round_trip() -> None:
+    tracked = TrackedDict()
+    tracked["key"] = 1
+    entry = tracked.tracking_changes()[-1]
+    rebuilt = ChangeLogEntry.from_dict(entry.to_dict())
+    assert rebuilt == entry
+    assert rebuilt.extra == entry.extra
+    assert rebuilt.actor == entry.actor
+    assert rebuilt.tree == entry.tree
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import datetime
+import multiprocessing
+import os
+import sqlite3
+import threading
+
+import pytest
+
+from pydatatracker import SQLiteChangeStore, TrackedDict, tracking_actor
+
+
+def _tree(store: SQLiteChangeStore) -> TrackedDict:
+    tracked = TrackedDict(
+        {"users": {"alice": {"age": 1}}, "config": {"mode": "x"}}, tracking_auto_convert=True
+    )
+    tracked.tracking_add_observer(store)
+    return tracked
+
+
+def test_query_by_location_actor_and_time(tmp_path) -> None:
+    store = SQLiteChangeStore(tmp_path / "changes.db")
+    tracked = _tree(store)
+    with tracking_actor("admin"):
+        tracked["users"]["alice"]["age"] = 2
+        tracked["config"]["mode"] = "y"
+    tracked["users"]["alice"]["age"] = 3
+    hour_ago = datetime.datetime.now(datetime.UTC) - datetime.timedelta(hours=1)
+
+    changes = store.query(location="users:*", actor="admin", since=hour_ago)
+    assert [c.extra["value"] for c in changes] == ["2"]
+    assert changes[0].extra["location"].keys == ("users", "alice", "age")
+    assert [c.extra["value"] for c in store.query(location="users:*")] == ["2", "3"]
+    assert store.query(since=datetime.datetime.now(datetime.UTC)) == []
+    assert len(store.query(action="update", limit=2)) == 2
+    assert len(store.query(tracked_item_uuid=tracked._tracking_uuid)) == 3
+    store.close()
+
+
+def test_batches_and_wal(tmp_path) -> None:
+    path = tmp_path / "changes.db"
+    store = SQLiteChangeStore(path, batch_size=3, flush_interval=3600)
+    tracked = TrackedDict()
+    tracked.tracking_add_observer(store)
+    for value in range(4):
+        tracked[value] = value
+    reader = sqlite3.connect(path)
+    assert reader.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert reader.execute("SELECT COUNT(*) FROM changes").fetchone()[0] == 3
+    reader.close()
+    assert len(store) == 4
+    store.close()
+    with SQLiteChangeStore(path) as reopened:
+        assert [c.extra["location"] for c in reopened.query(action="add")] == ["0", "1", "2", "3"]
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_forked_child_uses_its_own_connection(tmp_path) -> None:
+    store = SQLiteChangeStore(tmp_path / "changes.db", batch_size=100, flush_interval=60)
+    tracked = _tree(store)
+    tracked["parent"] = 1
+
+    def child_work() -> None:
+        tracked["child"] = 2
+        store.close()
+
+    child = multiprocessing.get_context("fork").Process(target=child_work)
+    child.start()
+    child.join()
+    assert child.exitcode == 0
+    store.flush()
+
+    # the change pending in the parent when forking is written once, by the parent
+    assert sorted(str(entry.extra["location"]) for entry in store.query()) == ["child", "parent"]
+    store.close()
+
+
+def test_changes_from_other_threads(tmp_path) -> None:
+    store = SQLiteChangeStore(tmp_path / "changes.db", batch_size=1)
+    tracked = TrackedDict(tracking_thread_safe=True)
+    tracked.tracking_add_observer(store)
+
+    def work(worker: int) -> None:
+        for value in range(50):
+            tracked[f"w{worker}"] = value
+
+    threads = [threading.Thread(target=work, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(store) == 200
+    assert len(store.query(location="w3")) == 50
+    store.close()
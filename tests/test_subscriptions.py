@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import pytest
+
+from pydatatracker import PathSubscriptions, TrackedDict
+from pydatatracker.subscriptions import parse_pattern
+from pydatatracker.utils.paths import INDEX, KEY, TrackingPath
+
+
+def _path(*keys) -> TrackingPath:
+    path = TrackingPath.of(KEY, keys[0])
+    for key in keys[1:]:
+        path = path.child(INDEX if isinstance(key, int) else KEY, key)
+    return path
+
+
+def test_parse_pattern() -> None:
+    assert parse_pattern("users:*:email") == ["users", "*", "email"]
+    assert parse_pattern("items|[2:5]") == ["items", range(2, 5)]
+    assert parse_pattern("") == []
+
+
+def test_glob_prefix_and_range_patterns() -> None:
+    subscriptions = PathSubscriptions()
+    email = subscriptions.subscribe("users:*:email", print)
+    users = subscriptions.subscribe("users:**", print)
+    items = subscriptions.subscribe(["items", range(0, 3)], print, prefix=True)
+
+    assert subscriptions.match(_path("users", "alice", "email")) == [users, email]
+    assert subscriptions.match(_path("users", "alice", "name")) == [users]
+    assert subscriptions.match(_path("users")) == [users]
+    assert subscriptions.match(_path("items", 2, "price")) == [items]
+    assert subscriptions.match(_path("items", 3)) == []
+    assert subscriptions.match(_path("groups", "admin")) == []
+
+    subscriptions.unsubscribe(users)
+    assert subscriptions.match(_path("users", "alice", "email")) == [email]
+    assert len(subscriptions) == 2
+
+
+def test_overlapping_ranges_and_bool_keys() -> None:
+    subscriptions = PathSubscriptions()
+    low = subscriptions.subscribe(["items", range(0, 10)], print)
+    high = subscriptions.subscribe(["items", range(5, 20)], print)
+    even = subscriptions.subscribe(["items", range(0, 20, 2)], print)
+
+    assert subscriptions.match(_path("items", 3)) == [low]
+    assert subscriptions.match(_path("items", 6)) == [low, high, even]
+    assert subscriptions.match(_path("items", 15)) == [high]
+    assert subscriptions.match(_path("items", 20)) == []
+    assert subscriptions.match(_path("items", -1)) == []
+    assert subscriptions.match(_path("items", True)) == []
+
+
+def test_unsubscribe_prunes_unused_nodes() -> None:
+    subscriptions = PathSubscriptions()
+    kept = subscriptions.subscribe("users:*:email", print)
+    handles = [
+        subscriptions.subscribe("users:*:name", print),
+        subscriptions.subscribe(["items", range(0, 3), "price"], print),
+        subscriptions.subscribe("groups:**", print),
+    ]
+    for handle in handles:
+        subscriptions.unsubscribe(handle)
+
+    root = subscriptions._root
+    assert list(root.children) == ["users"]
+    assert list(root.children["users"].wildcard.children) == ["email"]
+    subscriptions.unsubscribe(kept)
+    assert not root.children and not root.ranges
+
+
+def test_rest_must_be_last() -> None:
+    with pytest.raises(ValueError):
+        PathSubscriptions().subscribe("users:**:email", print)
+
+
+def test_tracking_subscribe_dispatches_matching_changes() -> None:
+    tree = TrackedDict(
+        {"users": {"alice": {"email": "a@x", "name": "Alice"}}, "items": [{"price": 1}]},
+        tracking_auto_convert=True,
+    )
+    emails: list = []
+    prices: list = []
+    tree.tracking_subscribe("users:*:email", emails.append)
+    handle = tree.tracking_subscribe("items|[0:1]:price", prices.append)
+
+    tree["users"]["alice"]["email"] = "b@x"
+    tree["users"]["alice"]["name"] = "Al"
+    tree["items"][0]["price"] = 2
+    tree.tracking_unsubscribe(handle)
+    tree["items"][0]["price"] = 3
+
+    assert [str(change.extra["location"]) for change in emails] == ["users:alice:email"]
+    assert [change.extra["value"] for change in prices] == ["2"]
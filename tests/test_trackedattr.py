@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import time
+
 import pytest
 
-from pydatatracker import TrackedAttr, TrackedDict
+from pydatatracker import TrackedAttr, TrackedDict, TrackedField, tracked_fields
 
 
 class SampleTrackedAttr(TrackedAttr):
@@ -18,6 +20,27 @@ class SampleTrackedAttr(TrackedAttr):
         self.tracking_add_attribute_to_monitor("profile")
 
 
+class FieldTrackedAttr(TrackedAttr):
+    """Helper object declaring monitored attributes at class level."""
+
+    name = TrackedField()
+    profile = TrackedField()
+
+    def __init__(self) -> None:
+        super().__init__(tracking_auto_convert=True)
+        self.name = "alpha"
+        self.profile = {"score": 1}
+
+
+@tracked_fields("name")
+class DecoratedTrackedAttr(TrackedAttr):
+    """Helper object declaring monitored attributes with the decorator."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.name = "alpha"
+
+
 def _latest_change(tracked: TrackedAttr):
     return tracked.tracking_changes()[-1]
 
@@ -80,3 +103,124 @@ def test_tracked_attr_unlock_all_clears_global_lock() -> None:
     change = _latest_change(sample)
     assert change.extra["action"] == "unlock"
     assert sample._tracking_locked is False
+
+
+def test_tracked_attr_registry_maps_child_uuid_to_attribute() -> None:
+    sample = SampleTrackedAttr()
+    profile_uuid = sample.profile._tracking_uuid
+
+    assert list(sample._tracking_attributes_to_monitor) == ["name", "profile"]
+    assert sample._tracking_attributes_to_monitor["name"] is None
+    assert sample._tracking_attribute_child_uuids == {profile_uuid: "profile"}
+
+
+def test_tracked_attr_replaced_child_is_detached() -> None:
+    sample = SampleTrackedAttr()
+    old_profile = sample.profile
+
+    sample.profile = {"score": 2}
+    old_profile["score"] = 10
+
+    assert old_profile._tracking_uuid not in sample._tracking_attribute_child_uuids
+    assert sample.profile._tracking_uuid in sample._tracking_attribute_child_uuids
+    change = _latest_change(sample)
+    assert change.extra["location"] == "profile"
+    assert "10" not in change.extra["value"]
+
+    sample.profile["score"] = 3
+    assert _latest_change(sample).extra["location"] == "profile:score"
+
+
+def test_tracked_attr_unmonitored_attribute_is_not_logged() -> None:
+    sample = SampleTrackedAttr()
+    before = len(sample.tracking_changes())
+
+    sample.scratch = 1
+
+    assert sample.scratch == 1
+    assert len(sample.tracking_changes()) == before
+
+
+def test_tracked_field_records_start_and_update() -> None:
+    sample = FieldTrackedAttr()
+
+    sample.name = "beta"
+
+    actions = [change.extra["action"] for change in sample.tracking_changes()]
+    assert actions.count("start monitoring") == 2
+    change = _latest_change(sample)
+    assert change.extra["action"] == "update"
+    assert change.extra["location"] == "name"
+    assert change.extra["data_pre_change"] == "alpha"
+    assert change.extra["data_post_change"] == "beta"
+
+
+def test_tracked_field_child_updates_include_parent_location() -> None:
+    sample = FieldTrackedAttr()
+    assert isinstance(sample.profile, TrackedDict)
+
+    sample.profile["score"] = 5
+
+    assert _latest_change(sample).extra["location"] == "profile:score"
+
+
+def test_tracked_field_class_skips_setattr_interception() -> None:
+    sample = FieldTrackedAttr()
+    before = len(sample.tracking_changes())
+
+    sample.scratch = 1
+
+    assert FieldTrackedAttr.__setattr__ is object.__setattr__
+    assert sample.scratch == 1
+    assert len(sample.tracking_changes()) == before
+    with pytest.raises(TypeError):
+        sample.tracking_add_attribute_to_monitor("scratch")
+
+
+def test_tracked_field_lock_blocks_mutation() -> None:
+    sample = FieldTrackedAttr()
+
+    sample.lock("name")
+
+    with pytest.raises(RuntimeError):
+        sample.name = "gamma"
+    assert sample.name == "alpha"
+
+
+def test_tracked_fields_decorator_declares_fields() -> None:
+    sample = DecoratedTrackedAttr()
+
+    sample.name = "beta"
+
+    assert DecoratedTrackedAttr._tracking_fields == frozenset({"name"})
+    assert _latest_change(sample).extra["location"] == "name"
+
+
+def test_tracked_attr_lock_all_locks_children_with_one_change() -> None:
+    sample = SampleTrackedAttr()
+    before = len(sample.tracking_changes())
+
+    sample.lock()
+
+    assert len(sample.tracking_changes()) == before + 1
+    assert _latest_change(sample).extra["subtree_size"] == "2"
+    with pytest.raises(RuntimeError):
+        sample.name = "gamma"
+    with pytest.raises(RuntimeError):
+        sample.profile["score"] = 2
+
+
+def test_tracked_attr_undo_and_rollback_to_time() -> None:
+    """Attribute updates can be undone and rolled back to a point in time."""
+    tracked = SampleTrackedAttr()
+    tracked.name = "beta"
+    checkpoint = tracked.last_change().created_time
+    time.sleep(0.001)
+    tracked.name = "gamma"
+    tracked.name = "delta"
+
+    tracked.tracking_undo()
+    assert tracked.name == "gamma"
+
+    tracked.tracking_rollback_to(checkpoint)
+    assert tracked.name == "beta"
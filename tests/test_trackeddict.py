@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import pytest
+
 from pydatatracker import TrackedDict
 
 
@@ -115,3 +117,171 @@ def test_tracked_dict_snapshot_opt_in_records_repr() -> None:
     tracked2["a"] = 1
     change2 = tracked2.tracking_changes()[-1]
     assert "data_pre_change" not in change2.extra
+
+
+def test_tracked_dict_fast_path_skips_tracking_when_unobserved() -> None:
+    """Without history or observers, mutations call straight through to dict."""
+    tracked = TrackedDict({"a": 1}, tracking_record_history=False)
+
+    tracked["b"] = 2
+    assert tracked.pop("missing") is None
+    del tracked["a"]
+
+    assert tracked._tracking_fast_path is True
+    assert tracked == {"b": 2}
+    assert tracked.tracking_changes() == []
+
+
+def test_tracked_dict_fast_path_ends_when_observed() -> None:
+    """Registering an observer turns change tracking back on."""
+    tracked = TrackedDict(tracking_record_history=False)
+    collected = []
+
+    tracked.tracking_add_observer(collected.append)
+    tracked["a"] = 1
+    tracked.tracking_remove_observer(collected.append)
+    tracked["b"] = 2
+
+    assert [change.extra["location"] for change in collected] == ["a"]
+    assert tracked._tracking_fast_path is True
+
+
+def test_tracked_dict_fast_path_still_honours_lock() -> None:
+    """Locked dictionaries reject writes on the fast path too."""
+    tracked = TrackedDict(tracking_record_history=False)
+
+    tracked.lock()
+
+    with pytest.raises(RuntimeError):
+        tracked["a"] = 1
+
+
+def test_tracked_dict_nested_change_recorded_once() -> None:
+    """Propagated child changes land in the parent history exactly once."""
+    parent = TrackedDict({"child": {"state": "draft"}}, tracking_auto_convert=True)
+    before = len(parent.tracking_changes())
+
+    parent["child"]["state"] = "final"
+
+    history = parent.tracking_changes()
+    assert len(history) == before + 1
+    assert history[-1].extra["location"] == "child:state"
+
+
+def test_tracked_dict_versions_and_as_of() -> None:
+    """Versioned dictionaries keep a persistent version per change."""
+    tracked = TrackedDict({"a": 1}, tracking_versioned=True)
+
+    tracked["b"] = 2
+    tracked["a"] = 3
+    del tracked["b"]
+
+    assert [version.number for version in tracked.tracking_versions] == [0, 1, 2, 3]
+    assert dict(tracked.tracking_as_of(0)) == {"a": 1}
+    assert dict(tracked.tracking_as_of(2)) == {"a": 3, "b": 2}
+    assert dict(tracked.tracking_as_of(tracked.tracking_versions[1].created_time)) == {
+        "a": 1,
+        "b": 2,
+    }
+    assert tracked._tracking_fast_path is False
+
+
+def test_tracked_dict_restore_version_touches_only_changed_keys() -> None:
+    """Restoring a version applies tracked changes for the differing keys only."""
+    tracked = TrackedDict({str(index): index for index in range(500)}, tracking_versioned=True)
+    tracked["7"] = "seven"
+    tracked.pop("8")
+    tracked["new"] = True
+    before = len(tracked.tracking_changes())
+
+    tracked.tracking_restore_version(0)
+
+    assert dict(tracked) == {str(index): index for index in range(500)}
+    assert len(tracked.tracking_changes()) - before == 3
+
+
+def test_tracked_dict_max_versions() -> None:
+    """Only the newest versions are retained."""
+    tracked = TrackedDict(tracking_versioned=True, tracking_max_versions=2)
+    for index in range(5):
+        tracked["key"] = index
+
+    assert [version.number for version in tracked.tracking_versions] == [4, 5]
+    with pytest.raises(KeyError):
+        tracked.tracking_as_of(0)
+
+
+def test_tracked_dict_undo_reverts_changes() -> None:
+    """Undo applies inverse operations newest first."""
+    tracked = TrackedDict({"a": 1, "b": 2})
+
+    tracked["a"] = 10
+    tracked["c"] = 3
+    del tracked["b"]
+    tracked.update({"a": 20, "d": 4})
+
+    reverted = tracked.tracking_undo(2)
+
+    assert len(reverted) == 2
+    assert dict(tracked) == {"a": 10, "c": 3, "b": 2}
+    assert tracked.last_change().extra["reverts"] == reverted[-1].uuid
+
+    tracked.tracking_undo(10)
+
+    assert dict(tracked) == {"a": 1, "b": 2}
+    assert tracked.tracking_undo() == []
+
+
+def test_tracked_dict_undo_nested_change_from_parent() -> None:
+    """Changes made below a container can be undone from the container."""
+    parent = TrackedDict({"child": {"state": "draft"}}, tracking_auto_convert=True)
+
+    parent["child"]["state"] = "final"
+    parent.tracking_undo()
+
+    assert parent["child"]["state"] == "draft"
+    assert parent["child"].tracking_undo() == []
+
+
+@pytest.mark.parametrize("remove", [lambda d: d.__delitem__("child"), lambda d: d.clear()])
+def test_tracked_dict_undo_reattaches_removed_child(remove) -> None:
+    """A tracked child put back by undo reports its changes to the parent again."""
+    parent = TrackedDict({"child": {"state": "draft"}, "other": 1}, tracking_auto_convert=True)
+    child = parent["child"]
+
+    remove(parent)
+    parent.tracking_undo()
+    seen = []
+    parent.tracking_add_observer(seen.append)
+    parent["child"]["state"] = "final"
+
+    assert parent["child"] is child
+    assert child._tracking_parent_item is parent
+    assert child._tracking_uuid in parent._tracking_child_tracked_items
+    assert [change.extra["value"] for change in seen] == ["final"]
+
+
+def test_tracked_dict_transaction_rolls_back_on_error() -> None:
+    """A failing transaction reverts every change made inside it."""
+    tracked = TrackedDict({"balance": 10})
+    tracked["owner"] = "alice"
+
+    with pytest.raises(ValueError), tracked.tracking_transaction():
+        tracked["balance"] = 0
+        tracked.pop("owner")
+        raise ValueError("abort")
+
+    assert dict(tracked) == {"balance": 10, "owner": "alice"}
+
+
+def test_tracked_dict_rollback_to_change() -> None:
+    """Rolling back to a change restores the state right after it."""
+    tracked = TrackedDict()
+    tracked["a"] = 1
+    marker = tracked.last_change()
+    tracked["b"] = 2
+    tracked.clear()
+
+    tracked.tracking_rollback_to(marker)
+
+    assert dict(tracked) == {"a": 1}
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import pytest
+
 from pydatatracker import TrackedList
 
 
@@ -17,7 +19,7 @@ def test_tracked_list_append_records_index() -> None:
 
     change = _latest_change(tracked)
     assert change.extra["action"] == "add"
-    assert change.extra["location"] == 2
+    assert change.extra["location"].keys == (2,)
     assert "3" in change.extra["value"]
 
 
@@ -30,7 +32,7 @@ def test_tracked_list_pop_stores_passed_and_actual_index() -> None:
     change = _latest_change(tracked)
     assert removed == "b"
     assert change.extra["action"] == "remove"
-    assert change.extra["location"] == 1  # actual index after normalization
+    assert change.extra["location"].keys == (1,)  # actual index after normalization
     assert change.extra["passed_index"] == "-1"
     assert "b" in change.extra["removed_items"]
 
@@ -55,7 +57,7 @@ def test_tracked_list_remove_reports_removed_items() -> None:
 
     change = _latest_change(tracked)
     assert change.extra["action"] == "remove"
-    assert change.extra["location"] == 1
+    assert change.extra["location"].keys == (1,)
     assert "['b']" in change.extra["removed_items"]
 
 
@@ -68,3 +70,56 @@ def test_tracked_list_clear_records_all_removed_items() -> None:
     change = _latest_change(tracked)
     assert change.extra["action"] == "remove"
     assert "[1, 2]" in change.extra["removed_items"]
+
+
+def test_tracked_list_fast_path_matches_tracked_behaviour() -> None:
+    """The untracked fast path keeps the int-only index rule."""
+    tracked = TrackedList([1, 2], tracking_record_history=False)
+
+    tracked.append(3)
+    tracked[0] = 0
+
+    assert tracked == [0, 2, 3]
+    assert tracked.tracking_changes() == []
+    with pytest.raises(TypeError):
+        tracked[0:1] = [5]
+
+
+def test_tracked_list_undo_reverts_mutations() -> None:
+    """Every list mutator records an inverse operation."""
+    tracked = TrackedList([3, 1, 2])
+    savepoint = tracked.tracking_savepoint()
+
+    tracked.append(4)
+    tracked.insert(0, 0)
+    tracked[1] = 30
+    del tracked[-1]
+    tracked.extend([5, 6])
+    tracked.pop(1)
+    tracked.remove(5)
+    tracked.sort()
+    tracked.reverse()
+
+    assert tracked.tracking_undo() and list(tracked) == [0, 1, 2, 6]
+    tracked.tracking_rollback_to(savepoint)
+
+    assert list(tracked) == [3, 1, 2]
+
+
+@pytest.mark.parametrize(
+    "remove", [lambda t: t.pop(0), lambda t: t.remove(t[0]), lambda t: t.clear()]
+)
+def test_tracked_list_undo_reattaches_removed_child(remove) -> None:
+    """A tracked child put back by undo reports its changes to the list again."""
+    tracked = TrackedList([{"state": "draft"}, 1], tracking_auto_convert=True)
+    child = tracked[0]
+
+    remove(tracked)
+    tracked.tracking_undo()
+    seen = []
+    tracked.tracking_add_observer(seen.append)
+    tracked[0]["state"] = "final"
+
+    assert tracked[0] is child
+    assert child._tracking_parent_item is tracked
+    assert [change.extra["value"] for change in seen] == ["final"]
@@ -8,7 +8,7 @@ import time
 
 import pytest
 
-from pydatatracker import ChangeCollector, TrackedDict
+from pydatatracker import ChangeCollector, TrackedDict, add_to_ignore_in_stack
 from pydatatracker.observers import (
     FilteredObserver,
     async_queue_observer,
@@ -219,3 +219,139 @@ def test_async_queue_observer_synchronous_queue():
     tracked.tracking_add_observer(observer)
     tracked["foo"] = "bar"
     assert queue.items
+
+
+def test_lock_records_single_summarized_change() -> None:
+    tracked = TrackedDict({"db": {"host": "localhost"}, "tags": ["a"]}, tracking_auto_convert=True)
+    child = tracked["db"]
+    collector = ChangeCollector()
+    tracked.tracking_add_observer(collector)
+    child_changes = len(child.tracking_changes())
+
+    tracked.lock()
+
+    assert [entry.extra["action"] for entry in collector.as_list()] == ["lock"]
+    assert collector.last().extra["subtree_size"] == "3"
+    assert len(child.tracking_changes()) == child_changes
+    assert child._tracking_locked is True
+    with pytest.raises(RuntimeError):
+        child["host"] = "remote"
+
+    tracked.unlock()
+
+    assert [entry.extra["action"] for entry in collector.as_list()] == ["lock", "unlock"]
+    child["host"] = "remote"
+
+
+def test_freeze_snapshot_is_read_only() -> None:
+    tracked = TrackedDict({"db": {"host": "localhost"}, "tags": ["a"]}, tracking_auto_convert=True)
+
+    frozen = tracked.tracking_freeze(snapshot=True)
+
+    assert tracked._tracking_locked is True
+    assert frozen["db"]["host"] == "localhost"
+    assert frozen["tags"] == ("a",)
+    with pytest.raises(TypeError):
+        frozen["db"]["host"] = "remote"
+    assert tracked.tracking_freeze() is None
+
+
+def test_stack_is_formatted_lazily_and_shared_by_copies() -> None:
+    tracked = TrackedDict({"child": {}}, tracking_auto_convert=True, tracking_capture_stack=True)
+
+    tracked["child"]["x"] = 1
+
+    child_change = tracked["child"].last_change()
+    parent_change = tracked.last_change()
+    assert child_change._stack is None
+    assert parent_change._raw_stack is child_change._raw_stack
+    assert child_change.stack[0].startswith('File "')
+    assert "test_tracking.py" in child_change.actor
+
+
+def test_add_to_ignore_in_stack_skips_matching_frames() -> None:
+    from pydatatracker.utils import changelog
+
+    tracked = TrackedDict(tracking_capture_stack=True)
+    try:
+        add_to_ignore_in_stack(["test_tracking.py"])
+        tracked["x"] = 1
+    finally:
+        changelog._IGNORE_IN_STACK.remove("test_tracking.py")
+        add_to_ignore_in_stack([])
+
+    assert "test_tracking.py" not in tracked.last_change().actor
+
+
+def test_stack_sample_rate_captures_one_in_n() -> None:
+    tracked = TrackedDict(tracking_capture_stack=True, tracking_stack_sample_rate=3)
+
+    for index in range(6):
+        tracked[str(index)] = index
+
+    captured = [bool(change.stack) for change in tracked.tracking_changes()]
+    assert captured == [True, False, False, True, False, False, True]
+
+
+def test_coalescing_merges_updates_per_location(monkeypatch) -> None:
+    from pydatatracker.types import _trackbase
+
+    now = [100.0]
+    monkeypatch.setattr(_trackbase.time, "monotonic", lambda: now[0])
+    tracked = TrackedDict({"hits": 0, "other": 0}, tracking_coalesce_window=1.0)
+    collector = ChangeCollector()
+    tracked.tracking_add_observer(collector)
+
+    for count in range(1, 6):
+        tracked["hits"] = count
+    tracked["other"] = 1
+    assert collector.as_list() == []
+
+    now[0] += 1.5
+    tracked["new"] = True
+
+    events = collector.as_list()
+    merged = {change.extra["location"]: change for change in events[:2]}
+    assert merged["hits"].extra["old_value"] == "0"
+    assert merged["hits"].extra["value"] == "5"
+    # the conversion pass in the constructor counts as the first update
+    assert merged["hits"].extra["update_count"] == "6"
+    assert merged["other"].extra["update_count"] == "2"
+    assert events[2].extra["action"] == "add"
+
+
+def test_coalescing_flushes_idle_windows_on_read_and_on_other_changes(monkeypatch) -> None:
+    from pydatatracker.types import _trackbase
+
+    now = [100.0]
+    monkeypatch.setattr(_trackbase.time, "monotonic", lambda: now[0])
+    tracked = TrackedDict({"hits": 0}, tracking_coalesce_window=1.0)
+    other = TrackedDict()
+    collector = ChangeCollector()
+    tracked.tracking_add_observer(collector)
+
+    tracked["hits"] = 1
+    now[0] += 0.5
+    assert len(tracked.tracking_changes()) == 1
+
+    now[0] += 1.0
+    other["unrelated"] = True
+    assert [change.extra["value"] for change in collector.as_list()] == ["1"]
+
+    tracked["hits"] = 2
+    now[0] += 1.5
+    assert tracked.last_change().extra["value"] == "2"
+    assert tracked.tracking_changes()[-1].extra["update_count"] == "1"
+
+
+def test_coalescing_flushes_before_other_changes_to_the_location() -> None:
+    tracked = TrackedDict({"a": 1}, tracking_coalesce_window=60)
+    tracked["a"] = 2
+    tracked["a"] = 3
+    del tracked["a"]
+    tracked["b"] = 1
+    tracked.tracking_flush_coalesced()
+
+    actions = [change.extra.get("method") for change in tracked.tracking_changes()[1:]]
+    assert actions == ["__setitem__", "__delitem__", "__setitem__"]
+    assert tracked.tracking_changes()[1].extra["update_count"] == "3"
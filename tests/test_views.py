@@ -0,0 +1,75 @@
+"""Tests for copy-on-write tracked container views."""
+
+from __future__ import annotations
+
+import pytest
+
+from pydatatracker import TrackedDict, TrackedList
+
+
+def _state() -> TrackedDict:
+    return TrackedDict(
+        {"users": {"alice": {"email": "a@example.com"}, "bob": {}}, "tags": ["x", "y"]},
+        tracking_auto_convert=True,
+    )
+
+
+def test_view_reads_live_data_without_copying() -> None:
+    state = _state()
+    before = len(state.tracking_changes())
+
+    view = state.tracking_view()
+
+    assert view["users"]["alice"]["email"] == "a@example.com"
+    assert list(view["tags"]) == ["x", "y"]
+    assert view == {"users": {"alice": {"email": "a@example.com"}, "bob": {}}, "tags": ["x", "y"]}
+    assert not view.tracking_materialized
+    assert len(state.tracking_changes()) == before
+
+
+def test_view_keeps_old_data_after_source_changes() -> None:
+    state = _state()
+    view = state.tracking_view()
+
+    state["mode"] = "debug"
+
+    assert view.tracking_materialized
+    assert "mode" not in view
+    assert state["mode"] == "debug"
+
+
+def test_view_copies_only_the_path_to_a_nested_change() -> None:
+    state = _state()
+    view = state.tracking_view()
+    bob_view = view["users"]["bob"]
+
+    state["users"]["alice"]["email"] = "new@example.com"
+
+    assert view["users"]["alice"]["email"] == "a@example.com"
+    assert state["users"]["alice"]["email"] == "new@example.com"
+    assert view.tracking_materialized
+    assert view["users"].tracking_materialized
+    assert not bob_view.tracking_materialized
+
+
+def test_sequence_view_is_read_only() -> None:
+    tracked = TrackedList([1, 2, 3])
+    view = tracked.tracking_view()
+
+    tracked.append(4)
+
+    assert view == [1, 2, 3]
+    assert view[1:] == (2, 3)
+    with pytest.raises(TypeError):
+        view[0] = 5  # type: ignore[index]
+
+
+def test_view_disables_fast_path_until_released() -> None:
+    tracked = TrackedDict(tracking_record_history=False)
+    assert tracked._tracking_fast_path
+
+    view = tracked.tracking_view()
+    tracked["a"] = 1
+
+    assert dict(view) == {}
+    assert tracked._tracking_fast_path